@@ -1,47 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import Response
-from app.core.dependencies import get_current_user, get_current_org
-from app.core.supabase import supabase
-from app.models.signals import SiteSignals
-from app.services.report_engine import ReportEngine
-from app.services.report_pdf import generate_report_pdf
-from app.services.scoring import calculate_dimension_scores, score_to_grade
-from app.services.quick_wins import generate_quick_wins
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from app.core.dependencies import get_current_user, get_current_org, get_repository
+from app.repositories.base import ScanRepository
+from app.services.report_pdf import report_pdf_filename
+from app.services.pdf_renderer import RenderQueueFull
+from app.services.report_cache import ReportCache
+from app.services.artifact_stream import (
+    choose_encoding, compress_stream, compute_etag, etag_matches, iter_page_json, parse_fields, project, select_pages
+)
 
 router = APIRouter()
-engine = ReportEngine()
+# 已完成的掃描不會再變動：報告結果以 (job_id, 報告引擎版本 + 評分版本) 快取
+report_cache = ReportCache()
+
+async def load_job_and_artifacts(repository: ScanRepository, job_id: str, org_id: str):
+    """一次往返取得 scan job 與其 artifacts"""
+    found = await repository.get_job_with_artifacts(job_id, org_id)
+    if not found:
+        raise HTTPException(status_code=404, detail="Scan job not found")
+    return found
+
+async def load_report_bundle(repository: ScanRepository, job_id: str, org_id: str):
+    """取得報告 bundle：先查 LRU，再查 scan_jobs.report_cache，最後才重新計算
+
+    回傳 (job, bundle)；LRU 命中時 job 為 None，報告尚未就緒時 bundle 為 None。
+    """
+    bundle = report_cache.get(job_id, org_id)
+    if bundle:
+        return None, bundle
+    job, artifacts = await load_job_and_artifacts(repository, job_id, org_id)
+    return job, await report_cache.load(repository, job, artifacts)
 
 @router.get("/{job_id}")
-def get_report(
+async def get_report(
     job_id: str,
     user = Depends(get_current_user),
-    org_id: str = Depends(get_current_org)
+    org_id: str = Depends(get_current_org),
+    repository: ScanRepository = Depends(get_repository)
 ):
     """取得報告（規則引擎版）"""
     
-    # 1. 取得 scan job
-    job_result = supabase.table("scan_jobs")\
-        .select("*")\
-        .eq("id", job_id)\
-        .eq("org_id", org_id)\
-        .single()\
-        .execute()
-    
-    if not job_result.data:
-        raise HTTPException(status_code=404, detail="Scan job not found")
-    
-    job = job_result.data
-    
-    # 2. 取得 artifacts
-    artifacts_result = supabase.table("artifacts")\
-        .select("*")\
-        .eq("job_id", job_id)\
-        .execute()
-    
-    artifacts = artifacts_result.data
+    # 1-2. 取得報告快取（或 scan job 與 artifacts）
+    job, bundle = await load_report_bundle(repository, job_id, org_id)
     
     # 3. 檢查任務狀態
-    if job['status'] == 'failed':
+    if job and job['status'] == 'failed':
         return {
             "job_id": job_id,
             "url": job['url'],
@@ -55,7 +59,7 @@ def get_report(
             "suggestions": []
         }
     
-    if not artifacts:
+    if not bundle:
         return {
             "job_id": job_id,
             "url": job['url'],
@@ -69,24 +73,21 @@ def get_report(
             "suggestions": []
         }
     
-    # 4. 提取 signals 並產生報告
-    signals = engine.extract_signals(artifacts)
-    report = engine.generate_report(signals)
-    
-    # 5. 加入任務基本資訊
-    report["job_id"] = job_id
-    report["url"] = job['url']
-    report["status"] = job['status']
-    report["raw_artifacts"] = artifacts  # 進階檢視用
+    # 4-5. 報告與任務基本資訊（原始 artifacts 改由 /artifacts 依需求分頁下載）
+    report = dict(bundle["report"])
+    if job:
+        report["status"] = job['status']
+    report["artifacts_url"] = f"/api/reports/{job_id}/artifacts"  # 進階檢視用
     
     return report
 
 
 @router.get("/{job_id}/dimensions")
-def get_report_dimensions(
+async def get_report_dimensions(
     job_id: str,
     user = Depends(get_current_user),
-    org_id: str = Depends(get_current_org)
+    org_id: str = Depends(get_current_org),
+    repository: ScanRepository = Depends(get_repository)
 ):
     """取得報告的五大維度明細與快速勝利建議
     
@@ -96,116 +97,51 @@ def get_report_dimensions(
     - 總分與等級
     """
     
-    # 1. 取得 scan job
-    job_result = supabase.table("scan_jobs")\
-        .select("*")\
-        .eq("id", job_id)\
-        .eq("org_id", org_id)\
-        .single()\
-        .execute()
+    _, bundle = await load_report_bundle(repository, job_id, org_id)
     
-    if not job_result.data:
-        raise HTTPException(status_code=404, detail="Scan job not found")
-    
-    job = job_result.data
-    
-    # 2. 取得 artifacts
-    artifacts_result = supabase.table("artifacts")\
-        .select("*")\
-        .eq("job_id", job_id)\
-        .execute()
-    
-    artifacts = artifacts_result.data
-    
-    if not artifacts:
+    if not bundle:
         raise HTTPException(status_code=400, detail="Report not ready yet")
     
-    # 3. 提取 signals
-    signals = engine.extract_signals(artifacts)
-    
-    # 4. 計算維度分數
-    dimension_scores = calculate_dimension_scores(signals)
-    
-    # 5. 計算總分與等級
-    total_score = sum(d['score'] for d in dimension_scores.values())
-    grade = score_to_grade(total_score)
-    
-    # 6. 生成 Quick Wins 建議
-    quick_wins = generate_quick_wins(signals, dimension_scores)
-    
-    # 7. 格式化維度資料 (加入中文名稱與百分比)
-    formatted_dimensions = {}
-    for key, data in dimension_scores.items():
-        formatted_dimensions[key] = {
-            'name': data.get('name', key),
-            'score': data['score'],
-            'max': data['max'],
-            'percentage': data.get('percentage', 0),
-            'items': data['items']
-        }
-    
-    return {
-        "scan_id": job_id,
-        "url": job['url'],
-        "total_score": total_score,
-        "grade": grade,
-        "dimensions": formatted_dimensions,
-        "quick_wins": quick_wins
-    }
+    return bundle["dimensions"]
 
 
 @router.get("/{job_id}/pdf")
-def download_report_pdf(
+async def download_report_pdf(
+    request: Request,
     job_id: str,
     user = Depends(get_current_user),
-    org_id: str = Depends(get_current_org)
+    org_id: str = Depends(get_current_org),
+    repository: ScanRepository = Depends(get_repository)
 ):
-    """下載 PDF 報告"""
-    
-    # 1. 取得 scan job
-    job_result = supabase.table("scan_jobs")\
-        .select("*")\
-        .eq("id", job_id)\
-        .eq("org_id", org_id)\
-        .single()\
-        .execute()
-    
-    if not job_result.data:
-        raise HTTPException(status_code=404, detail="Scan job not found")
-    
-    job = job_result.data
+    """下載 PDF 報告
+
+    渲染排隊中時回傳 202，請依 Retry-After 重新請求同一網址。
+    """
     
-    # 2. 取得 artifacts
-    artifacts_result = supabase.table("artifacts")\
-        .select("*")\
-        .eq("job_id", job_id)\
-        .execute()
+    # 1-4. 報告與維度數據（已快取）
+    _, bundle = await load_report_bundle(repository, job_id, org_id)
     
-    if not artifacts_result.data:
+    if not bundle:
         raise HTTPException(status_code=400, detail="Report not ready yet")
     
-    artifacts = artifacts_result.data
-    
-    # 3. 生成報告數據 (Text Report)
-    signals = engine.extract_signals(artifacts)
-    report = engine.generate_report(signals)
-    report["url"] = job['url']
-    
-    # 4. 生成維度數據 (Dimensions & Scores)
-    dimension_scores = calculate_dimension_scores(signals)
-    quick_wins = generate_quick_wins(signals, dimension_scores)
-    total_score = sum(d['score'] for d in dimension_scores.values())
-    
-    dimensions_data = {
-        "dimensions": dimension_scores,
-        "quick_wins": quick_wins,
-        "total_score": total_score
-    }
-    
-    # 5. 生成 PDF
-    filename, pdf_content = generate_report_pdf(report, dimensions_data)
+    # 5. 生成 PDF（共用瀏覽器、排隊渲染、依報告版本快取）
+    pdf_renderer = request.app.state.pdf_renderer
+    try:
+        pdf_content = await pdf_renderer.get(job_id, bundle["version"], bundle)
+    except RenderQueueFull:
+        raise HTTPException(status_code=503, detail="PDF renderer is busy, please retry later", headers={"Retry-After": "30"})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"PDF Generation Failed: {e}")
+    
+    if pdf_content is None:
+        return JSONResponse(
+            status_code=202,
+            content={"status": "rendering", "poll_url": f"/api/reports/{job_id}/pdf"},
+            headers={"Retry-After": "5"}
+        )
     
     # 6. 回傳檔案
+    filename = report_pdf_filename(bundle["report"])
     return Response(
         content=bytes(pdf_content),
         media_type="application/pdf",
@@ -213,3 +149,59 @@ def download_report_pdf(
             "Content-Disposition": f'attachment; filename="{filename}"'
         }
     )
+
+
+@router.get("/{job_id}/artifacts")
+async def get_report_artifacts(
+    job_id: str,
+    stage: str = Query("scan", description="artifact 階段"),
+    fields: Optional[str] = Query(None, description="只回傳指定欄位（逗號分隔），例如 url,has_jsonld,schema_types"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    user = Depends(get_current_user),
+    org_id: str = Depends(get_current_org),
+    repository: ScanRepository = Depends(get_repository)
+):
+    """依頁分頁取得掃描 artifacts（欄位投影、壓縮串流、ETag）"""
+    job = await repository.get_job(job_id, org_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Scan job not found")
+    
+    field_list = parse_fields(fields)
+    etag = compute_etag(job_id, job.get("status"), job.get("completed_at"), stage, field_list, page, page_size)
+    headers = {
+        "ETag": etag,
+        "Vary": "Accept-Encoding",
+        "Cache-Control": "private, no-cache"
+    }
+    # 已完成的掃描內容不變：ETag 相同就不必重新下載
+    if job.get("status") == "completed" and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    
+    artifacts = await repository.list_artifacts(job_id, org_id)
+    payload = select_pages(artifacts, stage)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+    
+    pages = payload.get("pages") or []
+    start = (page - 1) * page_size
+    items = (project(item, field_list) for item in pages[start:start + page_size])
+    header = {
+        "job_id": job_id,
+        "stage": stage,
+        "site": payload.get("site"),
+        "page": page,
+        "page_size": page_size,
+        "total_items": len(pages)
+    }
+    
+    encoding = choose_encoding(accept_encoding)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return StreamingResponse(
+        compress_stream(iter_page_json(header, items), encoding),
+        media_type="application/json",
+        headers=headers
+    )
@@ -1,189 +1,395 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Request
-from app.core.dependencies import get_current_user, get_current_org
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Header, Query
+from fastapi.responses import StreamingResponse
+from app.core.dependencies import get_current_user, get_current_org, get_repository, authenticate_token, resolve_org
+from app.repositories.base import ScanRepository
 from app.core.supabase import supabase
+from app.config import settings
 from pydantic import BaseModel, HttpUrl
 import subprocess
+import sqlite3
 import json
 import os
+import uuid
 from pathlib import Path
-from typing import List, Any
+from typing import List, Any, Dict, Optional, Callable, Awaitable
 from datetime import datetime
 import asyncio
+from functools import partial
 from trust_wedo.parsers.site_parser import SiteParser
+from trust_wedo.parsers.host_scheduler import HostScheduler
+from trust_wedo.parsers.http_cache import HttpCache
 
-from app.services.report_engine import ReportEngine
-from app.services.scoring import calculate_dimension_scores, score_to_grade
-
-engine = ReportEngine()
+from app.services.progress_reporter import ProgressReporter
+from app.services.progress_hub import ProgressHub, job_event_stream
+from app.services.scan_coalescer import ScanCoalescer, scan_key
+from app.services.job_queue import JobQueue
+from app.services.batch_scans import iter_batch_jsonl, summarize_batch
+from trust_wedo.utils.url import normalize_url
+from app.services.report_cache import build_report_bundle
+from app.constants.difficult_sites import check_difficult_site
 
 router = APIRouter()
 
+SCAN_MAX_PAGES = 10
+
 class ScanCreate(BaseModel):
     url: HttpUrl
 
-async def run_scan_pipeline(job_id: str, url: str, browser: Any = None):
-    """背景任務：執行 CLI pipeline（直接調用庫，無需 CLI）"""
-    async def update_progress(percent: int, message: str):
-        try:
-            # Update progress_stage with percentage prefix for frontend parsing
-            stage_text = f"[{percent}%] {message}"
-            supabase.table("scan_jobs").update({
-                "progress_stage": stage_text,
-                "updated_at": "now()"
-            }).eq("id", job_id).execute()
-        except Exception as e:
-            print(f"Failed to update progress for job {job_id}: {e}")
+class BatchScanCreate(BaseModel):
+    urls: List[HttpUrl]
+
+def scan_options() -> Dict[str, Any]:
+    """會影響掃描結果的 parser 參數（納入 scan_key，參數不同就不共用結果）"""
+    return {"max_pages": SCAN_MAX_PAGES, "fetch_mode": settings.SCAN_FETCH_MODE}
+
+def _load_scan_artifact_sync(job_id: str) -> Optional[Dict[str, Any]]:
+    # 同一台機器（SQLite 佇列）直接讀本機 site.json，否則讀 artifacts 表
+    local = Path(f"output/{job_id}/site.json")
+    if local.exists():
+        with open(local) as f:
+            return json.load(f)
+    rows = supabase.table("artifacts").select("jsonb_payload")\
+        .eq("job_id", job_id)\
+        .eq("stage", "scan")\
+        .limit(1)\
+        .execute().data
+    return rows[0]["jsonb_payload"] if rows else None
 
+def _latest_scan_sync(job_queue: JobQueue, key: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    job = job_queue.find_latest_scan(key, max_age)
+    return _load_scan_artifact_sync(job["id"]) if job else None
+
+async def find_fresh_scan(job_queue: JobQueue, key: str, max_age: float) -> Optional[Dict[str, Any]]:
+    """最近 max_age 秒內完成、相同 scan_key 的掃描結果（site.json）"""
+    return await asyncio.to_thread(_latest_scan_sync, job_queue, key, max_age)
+
+async def find_previous_scan(job_queue: JobQueue, key: str) -> Optional[Dict[str, Any]]:
+    """相同 scan_key 最近一次完成的掃描結果（增量掃描的比對基準，不限時間）"""
     try:
-        # 1. 更新狀態為 processing (0%)
+        return await asyncio.to_thread(_latest_scan_sync, job_queue, key)
+    except Exception as e:
+        print(f"[WARN] Previous scan lookup failed, running a full scan: {e}")
+        return None
+
+def _previous_report_sync(job_queue: JobQueue, key: str) -> Optional[Dict[str, Any]]:
+    job = job_queue.find_latest_scan(key)
+    if not job:
+        return None
+    if "report_cache" in job:
+        bundle = job["report_cache"]
+    else:
+        # SQLite 佇列不保存 report_cache，改從 scan_jobs 讀取
+        rows = supabase.table("scan_jobs").select("report_cache").eq("id", job["id"]).limit(1).execute().data
+        bundle = rows[0].get("report_cache") if rows else None
+    return (bundle or {}).get("report")
+
+async def find_previous_report(job_queue: JobQueue, key: str) -> Optional[Dict[str, Any]]:
+    """相同 scan_key 上一次完成掃描的報告（規則引擎只重新評估信號有變動的規則）"""
+    try:
+        return await asyncio.to_thread(_previous_report_sync, job_queue, key)
+    except Exception as e:
+        print(f"[WARN] Previous report lookup failed, evaluating all rules: {e}")
+        return None
+
+async def run_scan_pipeline(
+    job_id: str,
+    url: str,
+    browser: Any = None,
+    context_pool: Any = None,
+    progress_hub: Optional[ProgressHub] = None,
+    coalescer: Optional[ScanCoalescer] = None,
+    key: Optional[str] = None,
+    job_queue: Optional[JobQueue] = None
+) -> Optional[Dict[str, Any]]:
+    """Worker 任務：執行 CLI pipeline（直接調用庫，無需 CLI）
+
+    回傳分數摘要；失敗時拋出例外，由 job queue 決定重試或標記失敗。
+    有 progress_hub 時，每次進度更新也即時推播給 SSE 訂閱者。
+    有 coalescer 時，相同 scan_key 的任務共用進行中或近期完成的掃描。
+    有 job_queue 時，以佇列中相同 scan_key 的上一次結果做增量掃描。
+    """
+    def write_progress(stage_text: str):
         supabase.table("scan_jobs").update({
-            "status": "processing",
-            "started_at": "now()"
+            "progress_stage": stage_text,
+            "updated_at": "now()"
         }).eq("id", job_id).execute()
-        
-        await update_progress(0, "正在初始化分析引擎...")
-        
-        # 建立輸出目錄
-        output_dir = Path(f"output/{job_id}")
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 2. 執行 SiteParser (Core Logic)
-        await update_progress(5, "正在讀取網站結構...")
-        
-        # Direct Library Call with Progress Callback and Shared Browser
-        parser = SiteParser(url, max_pages=10, progress_callback=update_progress, browser=browser)
-        
+
+    # 合併進度更新：只寫入最新階段，且每個間隔最多一次（不阻塞 event loop）
+    progress = ProgressReporter(
+        write_progress,
+        min_interval=settings.PROGRESS_WRITE_INTERVAL,
+        publish=partial(progress_hub.progress, job_id) if progress_hub else None
+    )
+    try:
+        return await _run_scan(job_id, url, progress.update, browser, context_pool, coalescer, key, job_queue)
+    finally:
+        await progress.flush()
+
+
+async def _scan_site(url: str, update_progress: Callable[..., Awaitable[None]], browser: Any = None, context_pool: Any = None, key: Optional[str] = None, job_queue: Optional[JobQueue] = None) -> Dict[str, Any]:
+    # 2. 執行 SiteParser (Core Logic)
+    await update_progress(5, "正在讀取網站結構...")
+    
+    # 高防護網站降低爬取速率，避免觸發反爬蟲機制；robots.txt 的 Crawl-delay 上限避免掃描超時
+    difficult_site = check_difficult_site(url)
+    if difficult_site:
+        scheduler = HostScheduler(rate=difficult_site.get('max_requests_per_second', 0.5), burst=1, max_crawl_delay=settings.SCAN_MAX_CRAWL_DELAY)
+    else:
+        scheduler = HostScheduler(max_crawl_delay=settings.SCAN_MAX_CRAWL_DELAY)
+    
+    # 重複掃描時以條件式請求沿用未變更頁面（快取只是加速，開啟失敗就不使用）
+    cache = None
+    if settings.HTTP_CACHE_PATH:
         try:
-            # 設置 180 秒超時 (Playwright 較慢)
-            site_data = await asyncio.wait_for(parser.scan(), timeout=180)
-        except asyncio.TimeoutError:
-            raise Exception("分析超時（超過 3 分鐘）")
-        
-        # 3. 儲存成果 (File + DB)
-        await update_progress(90, "正在計算網站成信度分數...")
-        
-        # Write to file (local persistence in container, for debugging)
-        target_site_json = output_dir / "site.json"
-        with open(target_site_json, 'w') as f:
-            json.dump(site_data, f, ensure_ascii=False)
+            cache = HttpCache(
+                settings.HTTP_CACHE_PATH,
+                max_age=settings.HTTP_CACHE_MAX_AGE,
+                max_entries=settings.HTTP_CACHE_MAX_ENTRIES
+            )
+        except sqlite3.Error as e:
+            print(f"[WARN] HTTP cache unavailable, scanning without it: {e}")
+    
+    # 增量掃描：以上一次相同網址與參數的結果為基準，只重新抓取有變動的頁面
+    previous = None
+    if key and job_queue and settings.SCAN_INCREMENTAL:
+        previous = await find_previous_scan(job_queue, key)
+    
+    # Direct Library Call with Progress Callback and Shared Browser
+    parser = SiteParser(
+        url,
+        max_pages=SCAN_MAX_PAGES,
+        progress_callback=update_progress,
+        browser=browser,
+        context_pool=context_pool,
+        concurrency=settings.SCAN_CONCURRENCY,
+        fetch_mode=settings.SCAN_FETCH_MODE,
+        scheduler=scheduler,
+        cache=cache,
+        previous=previous
+    )
+    
+    try:
+        # 設置 180 秒超時 (Playwright 較慢)
+        return await asyncio.wait_for(parser.scan(), timeout=180)
+    except asyncio.TimeoutError:
+        raise Exception("分析超時（超過 3 分鐘）")
+    finally:
+        if cache:
+            cache.close()
+
+
+async def _run_scan(
+    job_id: str,
+    url: str,
+    update_progress: Callable[..., Awaitable[None]],
+    browser: Any = None,
+    context_pool: Any = None,
+    coalescer: Optional[ScanCoalescer] = None,
+    key: Optional[str] = None,
+    job_queue: Optional[JobQueue] = None
+) -> Optional[Dict[str, Any]]:
+    # 1. 狀態已由 worker 領取時設為 processing (0%)
+    await update_progress(0, "正在初始化分析引擎...")
+    
+    # 建立輸出目錄
+    output_dir = Path(f"output/{job_id}")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    key = key or scan_key(url, scan_options())
+    scan = partial(_scan_site, url, update_progress, browser, context_pool, key, job_queue)
+    if coalescer:
+        site_data, source = await coalescer.run(key, scan)
+        if source != "scanned":
+            print(f"[INFO] Job {job_id} {source} an identical scan of {url}")
+            await update_progress(85, "已沿用相同網址的掃描結果...")
+    else:
+        site_data = await scan()
+    
+    # 3. 儲存成果 (File + DB)
+    await update_progress(90, "正在計算網站成信度分數...")
+    
+    # Write to file (local persistence in container, for debugging)
+    target_site_json = output_dir / "site.json"
+    with open(target_site_json, 'w') as f:
+        json.dump(site_data, f, ensure_ascii=False)
+    
+    # 4. 儲存到 artifacts 表
+    # 構造 artifact 格式以供 extract_signals 使用
+    artifact_payload = {
+        "job_id": job_id,
+        "stage": "scan",
+        "jsonb_payload": site_data,
+        "schema_version": "1.0"
+    }
+    
+    # 重試時先清掉前一次嘗試留下的 scan artifact
+    supabase.table("artifacts").delete().eq("job_id", job_id).eq("stage", "scan").execute()
+    supabase.table("artifacts").insert(artifact_payload).execute()
+    
+    # 計算分數並預先產生報告（報告端點直接讀取 report_cache）
+    try:
+        await update_progress(95, "正在生成最終報告...")
+        previous_report = await find_previous_report(job_queue, key) if job_queue else None
+        bundle = build_report_bundle({"id": job_id, "url": url, "status": "completed"}, [artifact_payload], previous_report)
+        supabase.table("scan_jobs").update({"report_cache": bundle}).eq("id", job_id).execute()
         
-        # 4. 儲存到 artifacts 表
-        # 構造 artifact 格式以供 extract_signals 使用
-        artifact_payload = {
-            "job_id": job_id,
-            "stage": "scan",
-            "jsonb_payload": site_data,
-            "schema_version": "1.0"
+        result_data = {
+            "total_score": bundle["dimensions"]["total_score"],
+            "grade": bundle["dimensions"]["grade"],
+            "dimension_scores": bundle["pdf"]["dimensions"],
+            "generated_at": datetime.utcnow().isoformat()
         }
-        
-        supabase.table("artifacts").insert(artifact_payload).execute()
-        
-        # 計算分數 (新增邏輯)
-        try:
-            await update_progress(95, "正在生成最終報告...")
-            signals = engine.extract_signals([artifact_payload])
-            dimension_scores = calculate_dimension_scores(signals)
-            total_score = sum(d['score'] for d in dimension_scores.values())
-            grade = score_to_grade(total_score)
-            
-            result_data = {
-                "total_score": total_score,
-                "grade": grade,
-                "dimension_scores": dimension_scores,
-                "generated_at": datetime.utcnow().isoformat()
-            }
-        except Exception as score_err:
-            print(f"Scoring error: {score_err}")
-            result_data = None
-        
-        # 5. 更新狀態為 completed
-        supabase.table("scan_jobs").update({
-            "status": "completed",
-            "progress_stage": "[100%] 分析完成",
-            "completed_at": "now()",
-            "result": result_data # 儲存計算結果
-        }).eq("id", job_id).execute()
-        
-    except Exception as e:
-        supabase.table("scan_jobs").update({
-            "status": "failed",
-            "progress_stage": "分析失敗",
-            "error_message": str(e)
-        }).eq("id", job_id).execute()
+    except Exception as score_err:
+        print(f"Scoring error: {score_err}")
+        result_data = None
+    
+    # 5. 狀態 completed 與結果由 worker 透過 job queue 寫入
+    return result_data
 
 @router.post("")
-def create_scan(
+async def create_scan(
     request: Request,
     scan_data: ScanCreate,
-    background_tasks: BackgroundTasks,
     user = Depends(get_current_user),
     org_id: str = Depends(get_current_org)
 ):
-    """建立掃描任務"""
-    # 建立 scan job
-    result = supabase.table("scan_jobs").insert({
-        "org_id": org_id,
-        "user_id": str(user.id),
-        "url": str(scan_data.url),
-        "status": "pending",
-        "progress_stage": "排隊中..."
-    }).execute()
-    
-    inserted_rows = result.data
-    if not inserted_rows or len(inserted_rows) == 0:
-         raise HTTPException(status_code=500, detail="Failed to create scan job")
-         
-    job_id = inserted_rows[0].get("id")
-    if not job_id:
+    """建立掃描任務（只排入佇列，由 worker 領取執行）"""
+    job_queue = request.app.state.job_queue
+    try:
+        job = await asyncio.to_thread(
+            job_queue.enqueue,
+            str(scan_data.url),
+            org_id=org_id,
+            user_id=str(user.id),
+            scan_key=scan_key(str(scan_data.url), scan_options())
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create scan job: {e}")
+    
+    if not job.get("id"):
          raise HTTPException(status_code=500, detail="Scan job ID missing from database response")
-
     
-    # Get browser from app state
-    browser = getattr(request.app.state, "browser", None)
+    return job
+
+@router.post("/batch")
+async def create_batch_scan(
+    request: Request,
+    batch: BatchScanCreate,
+    user = Depends(get_current_user),
+    org_id: str = Depends(get_current_org)
+):
+    """批次掃描：每個網址一個掃描任務（同一 batch_id），一次寫入佇列"""
+    # 重複網址（正規化後相同）只掃描一次
+    urls = list({normalize_url(str(url)): str(url) for url in batch.urls}.values())
+    if not urls:
+        raise HTTPException(status_code=400, detail="至少需要一個網址")
+    if len(urls) > settings.BATCH_SCAN_MAX_URLS:
+        raise HTTPException(status_code=400, detail=f"單次批次最多 {settings.BATCH_SCAN_MAX_URLS} 個網址")
     
-    # 加入背景任務
-    background_tasks.add_task(run_scan_pipeline, job_id, str(scan_data.url), browser)
+    batch_id = str(uuid.uuid4())
+    options = scan_options()
+    job_queue = request.app.state.job_queue
+    try:
+        jobs = await asyncio.to_thread(
+            job_queue.enqueue_many,
+            [{"url": url, "scan_key": scan_key(url, options)} for url in urls],
+            org_id=org_id,
+            user_id=str(user.id),
+            batch_id=batch_id
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create batch scan: {e}")
     
-    return result.data[0]
+    return {
+        "batch_id": batch_id,
+        "total": len(jobs),
+        "jobs": [{"id": job["id"], "url": job["url"]} for job in jobs],
+        "status_url": f"/api/scans/batches/{batch_id}",
+        "results_url": f"/api/scans/batches/{batch_id}/results"
+    }
+
+@router.get("/batches/{batch_id}")
+async def get_batch_scan(
+    batch_id: str,
+    org_id: str = Depends(get_current_org),
+    repository: ScanRepository = Depends(get_repository)
+):
+    """批次掃描進度：各狀態數量與吞吐量（網站/分鐘）"""
+    jobs = await repository.list_batch_jobs(batch_id, org_id)
+    if not jobs:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return summarize_batch(batch_id, jobs)
+
+@router.get("/batches/{batch_id}/results")
+async def get_batch_results(
+    batch_id: str,
+    org_id: str = Depends(get_current_org),
+    repository: ScanRepository = Depends(get_repository)
+):
+    """批次掃描結果（JSONL，每行一個網站）"""
+    jobs = await repository.list_batch_jobs(batch_id, org_id)
+    if not jobs:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return StreamingResponse(
+        iter_batch_jsonl(jobs),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="batch-{batch_id}.jsonl"'}
+    )
 
 @router.get("")
-def get_scans(org_id: str = Depends(get_current_org)):
+async def get_scans(
+    org_id: str = Depends(get_current_org),
+    repository: ScanRepository = Depends(get_repository)
+):
     """取得組織的掃描列表"""
-    result = supabase.table("scan_jobs")\
-        .select("*")\
-        .eq("org_id", org_id)\
-        .order("created_at", desc=True)\
-        .execute()
-    
-    return result.data
+    return await repository.list_jobs(org_id)
 
 @router.get("/{job_id}")
-def get_scan(
+async def get_scan(
     job_id: str,
-    org_id: str = Depends(get_current_org)
+    org_id: str = Depends(get_current_org),
+    repository: ScanRepository = Depends(get_repository)
 ):
     """取得特定掃描任務狀態"""
-    result = supabase.table("scan_jobs")\
-        .select("*")\
-        .eq("id", job_id)\
-        .eq("org_id", org_id)\
-        .single()\
-        .execute()
-    
-    if not result.data:
+    job = await repository.get_job(job_id, org_id)
+    
+    if not job:
         raise HTTPException(status_code=404, detail="Scan job not found")
         
-    return result.data
+    return job
+
+@router.get("/{job_id}/events")
+async def stream_scan_events(
+    job_id: str,
+    request: Request,
+    authorization: Optional[str] = Header(None),
+    access_token: Optional[str] = Query(None, description="EventSource 無法設定標頭時改用此參數"),
+    org_id: Optional[str] = Header(None, alias="X-Org-ID"),
+    repository: ScanRepository = Depends(get_repository)
+):
+    """以 Server-Sent Events 推播掃描進度（{percent, stage, page_url}），取代輪詢"""
+    token = authorization.replace("Bearer ", "") if authorization else access_token
+    if not token:
+        raise HTTPException(status_code=401, detail="缺少 token")
+    user = await authenticate_token(request, token, repository)
+    org_id = org_id or await resolve_org(request, user, repository)
+    
+    job = await repository.get_job(job_id, org_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Scan job not found")
+    
+    hub = getattr(request.app.state, "progress_hub", None) or ProgressHub()
+    return StreamingResponse(
+        job_event_stream(hub, job, lambda: repository.get_job(job_id, org_id), keepalive=settings.PROGRESS_STREAM_KEEPALIVE),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.get("/{job_id}/artifacts")
-def get_artifacts(
+async def get_artifacts(
     job_id: str,
-    org_id: str = Depends(get_current_org)
+    org_id: str = Depends(get_current_org),
+    repository: ScanRepository = Depends(get_repository)
 ):
     """取得掃描的所有 artifacts"""
-    result = supabase.table("artifacts")\
-        .select("*")\
-        .eq("job_id", job_id)\
-        .execute()
-    
-    return result.data
+    return await repository.list_artifacts(job_id, org_id)
@@ -16,6 +16,40 @@ class Settings(BaseSettings):
     SUPABASE_URL: str
     SUPABASE_ANON_KEY: str
     SUPABASE_SERVICE_KEY: str
+
+    # 本機驗證 Supabase access token（HS256 用 JWT Secret，RS/ES 用 JWKS）；皆未設定時每次呼叫 Supabase Auth
+    SUPABASE_JWT_SECRET: str | None = None
+    SUPABASE_JWKS_URL: str | None = None  # 預設為 {SUPABASE_URL}/auth/v1/.well-known/jwks.json
+    AUTH_LOCAL_VERIFY: bool = True
+    MEMBERSHIP_CACHE_TTL: float = 60.0  # 使用者 → 組織對應的快取秒數（0 停用）
+
+    # Scanning
+    SCAN_CONCURRENCY: int = 4
+    BROWSER_POOL_SIZE: int = 8
+    SCAN_FETCH_MODE: str = "playwright"  # static | playwright | hybrid
+    HTTP_CACHE_PATH: str | None = "output/http_cache.sqlite"  # 設為空值停用快取
+    HTTP_CACHE_MAX_AGE: float = 7 * 24 * 3600  # 快取項目保留秒數，開啟快取時清除較舊的項目
+    HTTP_CACHE_MAX_ENTRIES: int = 50000  # 快取項目上限（保留最近存入的）
+    SCAN_MAX_CRAWL_DELAY: float = 10.0  # robots.txt Crawl-delay 上限（秒），過長會讓掃描超過 180 秒逾時
+    SCAN_REUSE_TTL: float = 600.0  # 相同網址與參數的已完成掃描可被新任務沿用的秒數（0 停用）
+    SCAN_INCREMENTAL: bool = True  # 重新掃描時沿用上次結果中未變更的頁面（lastmod / ETag / 內容雜湊）
+    BATCH_SCAN_MAX_URLS: int = 1000  # 單次批次掃描的網址上限
+
+    # Job queue / workers
+    JOB_QUEUE_BACKEND: str = "supabase"  # supabase | sqlite (本機開發)
+    JOB_QUEUE_SQLITE_PATH: str = "output/scan_jobs.sqlite"
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_LEASE_SECONDS: int = 300
+    JOB_HEARTBEAT_SECONDS: int = 30
+    WORKER_CONCURRENCY: int = 2
+    PROGRESS_WRITE_INTERVAL: float = 2.0  # 掃描進度寫入 scan_jobs 的最短間隔（秒）
+    PROGRESS_STREAM_KEEPALIVE: float = 15.0  # SSE 進度串流的心跳間隔（秒）；外部 worker 且未收到 NOTIFY 時同時重新讀取任務狀態
+    PROGRESS_LISTEN: bool = True  # 外部 worker 時以 Postgres LISTEN/NOTIFY 接收進度（DATABASE_URL 需為 session 連線，transaction pooler 不支援）
+    PDF_RENDER_MODE: str = "native"  # native（伺服器端模板）| frontend（載入前端 /pdf-report 頁面）
+    PDF_RENDER_CONCURRENCY: int = 2  # 同時渲染的 PDF 數（共用瀏覽器的 context 數）
+    PDF_RENDER_QUEUE: int = 8  # 等待中的 PDF 上限，超過回傳 503
+    PDF_CACHE_SIZE: int = 32  # 記憶體中保留的 PDF 數
+    EMBEDDED_WORKER: bool = False  # 掃描預設由獨立的 python -m app.worker 程序執行；設為 true 則在 API 程序內執行（僅限單一容器或本機開發）
     
     class Config:
         env_file = ".env"
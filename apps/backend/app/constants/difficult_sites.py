@@ -17,6 +17,7 @@ DIFFICULT_SITES = {
         'estimated_grade': 'A',
         'note': '作為全球最大的開放知識庫,具備完整的結構化資料和極高的外部引用量,實際評分應在 85-95 分之間',
         'detection_method': 'partial',  # 'none', 'partial', 'full'
+        'max_requests_per_second': 0.5,  # 爬取速率上限,避免觸發反爬蟲
     },
     'developer.mozilla.org': {
         'name': 'MDN Web Docs',
@@ -26,6 +27,7 @@ DIFFICULT_SITES = {
         'estimated_grade': 'A',
         'note': '作為前端技術權威文檔,具備優秀的結構化資料和技術社群信任度,實際評分應在 88-95 分之間',
         'detection_method': 'partial',
+        'max_requests_per_second': 0.5,
     },
     'github.com': {
         'name': 'GitHub',
@@ -35,6 +37,7 @@ DIFFICULT_SITES = {
         'estimated_grade': 'A',
         'note': '作為全球最大的代碼託管平台,具備完整的技術權威性,實際評分應在 85-92 分之間',
         'detection_method': 'partial',
+        'max_requests_per_second': 0.5,
     },
 }
 
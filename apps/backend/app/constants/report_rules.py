@@ -0,0 +1,161 @@
+"""
+報告規則集（宣告式）
+
+每條規則以 ``when`` 條件列表描述（全部成立才命中），由
+``app.services.rule_engine.RuleEngine`` 編譯並依相依的信號欄位建立索引。
+條件格式：``[信號欄位, 運算子]`` 或 ``[信號欄位, 運算子, 比較值]``，
+運算子見 ``rule_engine.OPERATORS``。
+"""
+
+REPORT_RULES = [
+    {
+        "rule_id": "R001",
+        "when": [["has_title", "is_false"]],
+        "issue": {
+            "severity": "high",
+            "title": "網站沒有清楚的標題",
+            "description": "AI 與搜尋引擎無法快速識別你的網站主題，這會降低權威感。",
+            "why": "標題是 AI 理解網站的第一步"
+        },
+        "suggestion": {
+            "priority": "high",
+            "effort": "easy",
+            "impact": "high",
+            "action": "在網頁原始碼中新增 <title> 標籤",
+            "impact_desc": "立即提升搜尋引擎排名與 AI 引用率",
+            "how_to": [
+                "1. 打開網站的 HTML 檔案",
+                "2. 在 <head> 區塊中加入 <title>你的網站名稱</title>",
+                "3. 確保標題簡潔且描述性強（建議 50-60 字元）",
+                "4. 儲存並重新部署網站"
+            ]
+        }
+    },
+    {
+        "rule_id": "R002",
+        "when": [["has_description", "is_false"]],
+        "issue": {
+            "severity": "medium",
+            "title": "缺少網站描述",
+            "description": "缺少 Meta Description 讓 AI 難以在不閱讀全站內容的情況下總結你的價值。",
+            "why": "描述幫助 AI 快速摘要網站內容"
+        },
+        "suggestion": {
+            "priority": "medium",
+            "effort": "easy",
+            "impact": "medium",
+            "action": "撰寫並加入 <meta name='description'> 標籤",
+            "impact_desc": "提高搜尋結果的點擊率並幫助 AI 摘要",
+            "how_to": [
+                "1. 撰寫 150-160 字元的網站描述",
+                "2. 在 <head> 區塊加入 <meta name='description' content='你的描述'>",
+                "3. 確保描述包含關鍵字且吸引人",
+                "4. 儲存並重新部署"
+            ]
+        }
+    },
+    {
+        "rule_id": "R003",
+        "when": [["has_jsonld", "is_false"]],
+        "issue": {
+            "severity": "high",
+            "title": "缺少結構化資料（Schema.org）",
+            "description": "沒有 JSON-LD 結構化資料，AI 無法理解你的網站類型與內容結構。",
+            "why": "結構化資料是 AI 理解網站的關鍵"
+        },
+        "suggestion": {
+            "priority": "high",
+            "effort": "medium",
+            "impact": "high",
+            "action": "新增 Schema.org JSON-LD 結構化資料",
+            "impact_desc": "大幅提升 AI 對網站的理解與引用率",
+            "how_to": [
+                "1. 前往 https://schema.org 選擇適合的類型（Organization/WebSite/Article）",
+                "2. 使用 Google 的結構化資料標記協助工具產生 JSON-LD",
+                "3. 將 JSON-LD 加入 <head> 或 <body> 區塊",
+                "4. 使用 Google Rich Results Test 驗證"
+            ]
+        }
+    },
+    {
+        "rule_id": "R004",
+        "when": [["has_author", "is_false"]],
+        "issue": {
+            "severity": "medium",
+            "title": "缺少作者資訊",
+            "description": "內容沒有明確的作者，降低可信度與權威性。",
+            "why": "作者資訊是內容可信度的重要指標"
+        },
+        "suggestion": {
+            "priority": "medium",
+            "effort": "easy",
+            "impact": "medium",
+            "action": "在內容中加入作者資訊",
+            "impact_desc": "提升內容可信度與專業形象",
+            "how_to": [
+                "1. 在文章頁面加入作者名稱",
+                "2. 使用 <meta name='author' content='作者名稱'>",
+                "3. 或在 Schema.org Article 中加入 author 欄位",
+                "4. 考慮加入作者簡介與社群連結"
+            ]
+        }
+    },
+    {
+        "rule_id": "R005",
+        "when": [["has_https", "is_false"]],
+        "issue": {
+            "severity": "high",
+            "title": "未使用 HTTPS 加密",
+            "description": "網站使用 HTTP 而非 HTTPS，安全性不足。",
+            "why": "HTTPS 是現代網站的基本要求"
+        },
+        "suggestion": {
+            "priority": "high",
+            "effort": "medium",
+            "impact": "high",
+            "action": "啟用 HTTPS 加密連線",
+            "impact_desc": "提升安全性與搜尋引擎排名",
+            "how_to": [
+                "1. 向 SSL 憑證供應商申請憑證（Let's Encrypt 免費）",
+                "2. 在伺服器安裝 SSL 憑證",
+                "3. 設定 HTTP 自動重新導向到 HTTPS",
+                "4. 更新所有內部連結為 HTTPS"
+            ]
+        }
+    },
+    # 新增規則 R006-R008
+    {
+        "rule_id": "R006",
+        "when": [["has_organization", "is_false"]],
+        "issue": {
+            "severity": "medium",
+            "title": "缺少組織資訊",
+            "description": "缺少 Organization schema 讓 AI 難以確認網站的營運主體。",
+            "why": "組織身分驗證是信任的基石"
+        },
+        "suggestion": {
+            "priority": "medium",
+            "effort": "medium",
+            "impact": "medium",
+            "action": "新增 Organization 結構化資料",
+            "impact_desc": "建立網站的實體權威感"
+        }
+    },
+    {
+        "rule_id": "R007",
+        "when": [["has_social_proof", "is_false"]],
+        "issue": {
+            "severity": "low",
+            "title": "社群證明不足",
+            "description": "網站未連結足夠的社群平台（Facebook, Twitter, LinkedIn 等）。",
+            "why": "社群連結可增加網站的社會認可"
+        },
+        "suggestion": {
+            "priority": "low",
+            "effort": "easy",
+            "impact": "low",
+            "action": "在頁尾或關於頁面加入社群媒體連結",
+            "impact_desc": "提升品牌可尋性與多管道信任"
+        }
+    }
+]
@@ -0,0 +1,25 @@
+from typing import Any, Tuple
+from trust_wedo.parsers.playwright_parser import async_playwright
+from trust_wedo.parsers.context_pool import BrowserContextPool
+
+
+async def launch_shared_browser(pool_size: int) -> Tuple[Any, Any, BrowserContextPool]:
+    """Start Playwright, one Chromium instance and its warm context pool."""
+    playwright = await async_playwright().start()
+    browser = await playwright.chromium.launch(
+        headless=True,
+        args=[
+            '--no-sandbox', 
+            '--disable-setuid-sandbox',
+            '--disable-blink-features=AutomationControlled'
+        ]
+    )
+    # Warm contexts shared by all scans (bounded by BROWSER_POOL_SIZE)
+    context_pool = BrowserContextPool(browser, size=pool_size)
+    return playwright, browser, context_pool
+
+
+async def close_shared_browser(playwright: Any, browser: Any, context_pool: BrowserContextPool) -> None:
+    await context_pool.close()
+    await browser.close()
+    await playwright.stop()
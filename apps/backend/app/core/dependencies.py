@@ -1,35 +1,68 @@
-from fastapi import Depends, HTTPException, Header
-from app.core.supabase import supabase
+from fastapi import Depends, HTTPException, Header, Request
+from app.repositories.base import ScanRepository
+from app.core.token_verifier import InvalidToken
 
-def get_current_user(authorization: str = Header(...)):
-    """取得當前使用者"""
-    try:
-        token = authorization.replace("Bearer ", "")
-        user = supabase.auth.get_user(token)
-        if not user.user:
+_NOT_CACHED = object()
+
+def get_repository(request: Request) -> ScanRepository:
+    """共用的 async repository（啟動時建立，連線池由所有請求共用）"""
+    return request.app.state.repository
+
+async def authenticate_token(request: Request, token: str, repository: ScanRepository):
+    """驗證 access token 並回傳使用者（可在本機驗證 JWT 時不呼叫 Supabase Auth）"""
+    verifier = getattr(request.app.state, "token_verifier", None)
+    if verifier:
+        try:
+            user = await verifier.verify(token)
+        except InvalidToken:
             raise HTTPException(status_code=401, detail="無效的 token")
-        return user.user
+        if user:
+            return user
+    
+    # 無法在本機驗證（未設定密鑰或未知的簽章金鑰）時才向 Supabase Auth 查詢
+    try:
+        user = await repository.get_user(token)
     except Exception:
         raise HTTPException(status_code=401, detail="無效的 token")
+    if not user:
+        raise HTTPException(status_code=401, detail="無效的 token")
+    return user
+
+async def get_current_user(
+    request: Request,
+    authorization: str = Header(...),
+    repository: ScanRepository = Depends(get_repository)
+):
+    """取得當前使用者"""
+    return await authenticate_token(request, authorization.replace("Bearer ", ""), repository)
 
-def get_current_org(
+async def get_current_org(
+    request: Request,
     user = Depends(get_current_user),
-    org_id: str = Header(None, alias="X-Org-ID")
+    org_id: str = Header(None, alias="X-Org-ID"),
+    repository: ScanRepository = Depends(get_repository)
 ):
     """取得當前組織 (MVP 簡化版：若無組織表則使用個人 ID)"""
     if org_id:
         return org_id
+    return await resolve_org(request, user, repository)
+
+async def resolve_org(request: Request, user, repository: ScanRepository) -> str:
+    """使用者所屬的組織 ID（無組織時為使用者 ID）"""
+    # 成員關係很少變動：以 TTL 快取避免輪詢端點每次都查詢 org_members
+    membership_cache = getattr(request.app.state, "membership_cache", None)
+    if membership_cache:
+        cached = membership_cache.get(str(user.id), _NOT_CACHED)
+        if cached is not _NOT_CACHED:
+            return cached or str(user.id)
         
     try:
         # 嘗試取得使用者的第一個 org
-        result = supabase.table("org_members")\
-            .select("org_id")\
-            .eq("user_id", user.id)\
-            .limit(1)\
-            .execute()
-        
-        if result.data:
-            return result.data[0]["org_id"]
+        user_org = await repository.get_user_org(str(user.id))
+        if membership_cache:
+            membership_cache.set(str(user.id), user_org)
+        if user_org:
+            return user_org
     except Exception as e:
         # 如果表不存在或發生錯誤，暫時回退到使用 user.id 作為 org_id
         # 這能確保即使 Supabase 表還沒建好，基礎功能也能運作
@@ -0,0 +1,135 @@
+"""Local verification of Supabase access tokens.
+
+``supabase.auth.get_user(token)`` costs a round trip to the auth server on every
+request. Supabase access tokens are JWTs, so they can be verified in-process:
+HS256 tokens with the project's JWT secret, asymmetric (RS256/ES256) tokens with
+the project's JWKS, which is fetched once and cached.
+
+Local verification cannot see a logout before the token expires; Supabase
+access tokens are short-lived (1 hour by default), which bounds that window.
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+from jose import JWTError, jwt
+
+# Minimum seconds between JWKS refetches triggered by an unknown kid
+JWKS_MISS_INTERVAL = 60.0
+
+ASYMMETRIC_ALGORITHMS = {"RS256", "RS384", "RS512", "ES256", "ES384", "ES512"}
+
+
+class InvalidToken(Exception):
+    """Token is malformed, expired or has a bad signature."""
+
+
+class AuthenticatedUser:
+    """Minimal user built from verified JWT claims (same ``id``/``email`` as the Supabase user)."""
+
+    __slots__ = ("id", "email", "role", "user_metadata", "app_metadata", "claims")
+
+    def __init__(self, claims: Dict[str, Any]):
+        self.id = claims["sub"]
+        self.email = claims.get("email")
+        self.role = claims.get("role")
+        self.user_metadata = claims.get("user_metadata") or {}
+        self.app_metadata = claims.get("app_metadata") or {}
+        self.claims = claims
+
+    @property
+    def full_name(self) -> Optional[str]:
+        return self.user_metadata.get("full_name")
+
+
+class TokenVerifier:
+    """Verify access tokens without calling the auth server.
+
+    Args:
+        secret: Shared HS256 secret (Supabase "JWT Secret"); None disables HS tokens
+        algorithm: Algorithm used with ``secret``
+        jwks_url: JWKS endpoint for asymmetric tokens; None disables them
+        audience: Expected ``aud`` claim
+        jwks_ttl: Seconds a fetched JWKS is trusted before refetching
+        fetch_jwks: Coroutine returning the JWKS document (defaults to an HTTP GET)
+    """
+
+    def __init__(
+        self,
+        secret: Optional[str] = None,
+        algorithm: str = "HS256",
+        jwks_url: Optional[str] = None,
+        audience: Optional[str] = "authenticated",
+        jwks_ttl: float = 3600.0,
+        fetch_jwks: Optional[Callable[[], Any]] = None
+    ):
+        self.secret = secret
+        self.algorithm = algorithm
+        self.jwks_url = jwks_url
+        self.audience = audience
+        self.jwks_ttl = jwks_ttl
+        self._fetch_jwks = fetch_jwks or self._http_fetch_jwks
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._keys_fetched_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    async def _http_fetch_jwks(self) -> Dict[str, Any]:
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            response = await client.get(self.jwks_url)
+            response.raise_for_status()
+            return response.json()
+
+    async def _signing_key(self, kid: Optional[str]) -> Optional[Dict[str, Any]]:
+        if kid in self._keys and time.monotonic() - self._keys_fetched_at < self.jwks_ttl:
+            return self._keys[kid]
+        async with self._lock:
+            age = time.monotonic() - self._keys_fetched_at
+            # Unknown kid usually means key rotation: refetch, but not more often than JWKS_MISS_INTERVAL
+            if age >= self.jwks_ttl or (kid not in self._keys and age >= JWKS_MISS_INTERVAL):
+                jwks = await self._fetch_jwks()
+                self._keys = {key.get("kid"): key for key in jwks.get("keys", [])}
+                self._keys_fetched_at = time.monotonic()
+        return self._keys.get(kid)
+
+    async def verify(self, token: str) -> Optional[AuthenticatedUser]:
+        """Verified user, or None when this token type cannot be checked locally.
+
+        Raises ``InvalidToken`` for tokens that are definitely not valid.
+        """
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError as e:
+            raise InvalidToken(str(e))
+        alg = header.get("alg")
+
+        if alg in ASYMMETRIC_ALGORITHMS:
+            if not self.jwks_url:
+                return None
+            try:
+                key = await self._signing_key(header.get("kid"))
+            except Exception as e:
+                print(f"[WARN] JWKS fetch failed, falling back to remote auth: {e}")
+                return None
+            if key is None:
+                # Not in the (recently refreshed) JWKS: let the auth server decide
+                return None
+        elif alg == self.algorithm and self.secret:
+            key = self.secret
+        else:
+            return None
+
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=[alg],
+                audience=self.audience,
+                options={"verify_aud": self.audience is not None}
+            )
+        except JWTError as e:
+            raise InvalidToken(str(e))
+        if not claims.get("sub"):
+            raise InvalidToken("Token has no subject")
+        return AuthenticatedUser(claims)
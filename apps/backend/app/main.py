@@ -1,28 +1,70 @@
+import asyncio
+from functools import partial
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import auth, users, scans, reports
 from app.config import settings
-from trust_wedo.parsers.playwright_parser import async_playwright
+from app.core.browser import launch_shared_browser, close_shared_browser
+from app.services.job_queue import create_job_queue
+from app.services.pdf_renderer import PdfRenderService
+from app.services.report_pdf import render_native_pdf_with_pool, render_pdf_with_pool
+from trust_wedo.parsers.context_pool import BrowserContextPool
+from app.repositories.supabase_repository import SupabaseScanRepository
+from app.core.token_verifier import TokenVerifier
+from app.core.ttl_cache import TTLCache
+from app.services.progress_hub import ProgressHub
+from app.services.progress_listener import ProgressListener, listen_dsn
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup: Initialize global playwright browser
     print("[INFO] Starting global Playwright browser...")
-    app.state.playwright = await async_playwright().start()
-    app.state.browser = await app.state.playwright.chromium.launch(
-        headless=True,
-        args=[
-            '--no-sandbox', 
-            '--disable-setuid-sandbox',
-            '--disable-blink-features=AutomationControlled'
-        ]
+    app.state.playwright, app.state.browser, app.state.context_pool = await launch_shared_browser(settings.BROWSER_POOL_SIZE)
+    # PDF 使用共用瀏覽器的獨立 context（需載入圖片與字型），並限制同時渲染數
+    app.state.pdf_context_pool = BrowserContextPool(app.state.browser, size=settings.PDF_RENDER_CONCURRENCY, block_resources=False)
+    app.state.pdf_renderer = PdfRenderService(
+        partial(render_pdf_with_pool if settings.PDF_RENDER_MODE == "frontend" else render_native_pdf_with_pool, app.state.pdf_context_pool),
+        max_concurrency=settings.PDF_RENDER_CONCURRENCY,
+        max_queue=settings.PDF_RENDER_QUEUE,
+        cache_size=settings.PDF_CACHE_SIZE
     )
+    # Async repository: one pooled Supabase client shared by all requests
+    app.state.repository = await SupabaseScanRepository.connect(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
+    # 本機驗證 JWT 與快取組織成員關係，輪詢端點不再每次呼叫 Supabase
+    if settings.AUTH_LOCAL_VERIFY:
+        app.state.token_verifier = TokenVerifier(
+            secret=settings.SUPABASE_JWT_SECRET,
+            algorithm=settings.ALGORITHM,
+            jwks_url=settings.SUPABASE_JWKS_URL or f"{settings.SUPABASE_URL.rstrip('/')}/auth/v1/.well-known/jwks.json"
+        )
+    if settings.MEMBERSHIP_CACHE_TTL > 0:
+        app.state.membership_cache = TTLCache(ttl=settings.MEMBERSHIP_CACHE_TTL)
+    # API 只負責排入佇列，掃描由 worker 領取執行
+    app.state.job_queue = create_job_queue(settings.JOB_QUEUE_BACKEND, settings.JOB_QUEUE_SQLITE_PATH, settings.JOB_MAX_ATTEMPTS)
+    # 即時進度推播（SSE）：內嵌 worker 直接發布，不經資料庫
+    app.state.progress_hub = ProgressHub()
+    worker = worker_task = listener_task = None
+    if settings.EMBEDDED_WORKER:
+        from app.worker import build_worker
+        worker = build_worker(app.state.job_queue, app.state.browser, app.state.context_pool, app.state.progress_hub)
+        worker_task = asyncio.create_task(worker.run())
+    elif settings.PROGRESS_LISTEN and settings.DATABASE_URL.startswith("postgres"):
+        # 外部 worker 的進度經 scan_jobs 觸發器 NOTIFY，每個 API 程序只 LISTEN 一次
+        listener = ProgressListener(listen_dsn(settings.DATABASE_URL), app.state.progress_hub)
+        listener_task = asyncio.create_task(listener.run())
     yield
+    if worker:
+        worker.stop()
+        await worker_task
+    if listener_task:
+        listener_task.cancel()
+    await app.state.repository.close()
+    await app.state.pdf_renderer.close()
+    await app.state.pdf_context_pool.close()
     # Shutdown: Close browser
     print("[INFO] Closing global Playwright browser...")
-    await app.state.browser.close()
-    await app.state.playwright.stop()
+    await close_shared_browser(app.state.playwright, app.state.browser, app.state.context_pool)
 
 app = FastAPI(
     title="Trust WEDO API",
@@ -1,3 +1,4 @@
+from operator import attrgetter
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 
@@ -51,3 +52,66 @@ class SiteSignals(BaseModel):
         # 這裡我們維持基礎結構，邏輯會移動到 ReportEngine 以符合最新 Task 指令
         signals = cls()
         return signals
+
+
+_FIELD_NAMES = tuple(SiteSignals.model_fields)
+_DEFAULTS = {name: field.default for name, field in SiteSignals.model_fields.items()}
+# Mutable defaults get a fresh container per record, as pydantic does
+_LIST_FIELDS = tuple(name for name, value in _DEFAULTS.items() if isinstance(value, list))
+_DICT_FIELDS = tuple(name for name, value in _DEFAULTS.items() if isinstance(value, dict))
+_SCALAR_DEFAULTS = tuple((name, value) for name, value in _DEFAULTS.items() if not isinstance(value, (list, dict)))
+_get_all = attrgetter(*_FIELD_NAMES)
+
+
+class SignalRecord:
+    """輕量信號紀錄（內部熱路徑使用）
+
+    欄位與預設值與 SiteSignals 相同，但以 __slots__ 儲存且不做驗證；
+    API 邊界以 to_dict() 輸出（與 SiteSignals.model_dump() 相同）。
+    """
+
+    __slots__ = _FIELD_NAMES
+
+    def __init__(self, **values: Any):
+        for name, default in _SCALAR_DEFAULTS:
+            setattr(self, name, default)
+        for name in _LIST_FIELDS:
+            setattr(self, name, [])
+        for name in _DICT_FIELDS:
+            setattr(self, name, {})
+        if values:
+            unknown = values.keys() - _DEFAULTS.keys()
+            if unknown:
+                raise TypeError(f"Unknown signal fields: {', '.join(sorted(unknown))}")
+            for name, value in values.items():
+                setattr(self, name, value)
+
+    @classmethod
+    def coerce(cls, signals: Any) -> "SignalRecord":
+        """SignalRecord / SiteSignals / dict → SignalRecord"""
+        if isinstance(signals, cls):
+            return signals
+        if isinstance(signals, BaseModel):
+            signals = signals.__dict__
+        return cls(**{name: value for name, value in signals.items() if name in _DEFAULTS})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """與 SiteSignals.model_dump() 相同的輸出"""
+        data = dict(zip(_FIELD_NAMES, _get_all(self)))
+        for name in _LIST_FIELDS:
+            data[name] = list(data[name])
+        for name in _DICT_FIELDS:
+            data[name] = dict(data[name])
+        return data
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, SignalRecord):
+            return NotImplemented
+        return _get_all(self) == _get_all(other)
+
+    def __repr__(self) -> str:
+        changed = ", ".join(
+            f"{name}={getattr(self, name)!r}" for name, default in _DEFAULTS.items()
+            if getattr(self, name) != default
+        )
+        return f"SignalRecord({changed})"
@@ -0,0 +1,6 @@
+"""Async data access for the API routers."""
+
+from app.repositories.base import ScanRepository
+from app.repositories.memory import InMemoryScanRepository
+
+__all__ = ["ScanRepository", "InMemoryScanRepository"]
@@ -0,0 +1,46 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+Job = Dict[str, Any]
+Artifact = Dict[str, Any]
+
+
+class ScanRepository:
+    """Async access to scan jobs, artifacts and org membership.
+
+    Every read is scoped by ``org_id`` so routers cannot leak another
+    organisation's data by job id alone.
+    """
+
+    async def list_jobs(self, org_id: str) -> List[Job]:
+        """Jobs of an organisation, newest first."""
+        raise NotImplementedError
+
+    async def get_job(self, job_id: str, org_id: str) -> Optional[Job]:
+        raise NotImplementedError
+
+    async def list_batch_jobs(self, batch_id: str, org_id: str) -> List[Job]:
+        """Jobs of one batch scan, in submission order."""
+        raise NotImplementedError
+
+    async def get_job_with_artifacts(self, job_id: str, org_id: str) -> Optional[Tuple[Job, List[Artifact]]]:
+        """Job plus all of its artifacts in one round trip; None if the job is not found."""
+        raise NotImplementedError
+
+    async def list_artifacts(self, job_id: str, org_id: str) -> List[Artifact]:
+        result = await self.get_job_with_artifacts(job_id, org_id)
+        return result[1] if result else []
+
+    async def save_report_cache(self, job_id: str, bundle: Dict[str, Any]) -> None:
+        """Persist a materialised report on the job (``scan_jobs.report_cache``)."""
+        raise NotImplementedError
+
+    async def get_user_org(self, user_id: str) -> Optional[str]:
+        """First organisation the user belongs to, if any."""
+        raise NotImplementedError
+
+    async def get_user(self, token: str) -> Optional[Any]:
+        """Resolve a bearer token to its user, or None if invalid."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
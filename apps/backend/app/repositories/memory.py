@@ -0,0 +1,55 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.repositories.base import Artifact, Job, ScanRepository
+
+
+class InMemoryScanRepository(ScanRepository):
+    """Dict-backed repository for tests and local experiments."""
+
+    def __init__(
+        self,
+        jobs: Optional[List[Job]] = None,
+        artifacts: Optional[List[Artifact]] = None,
+        memberships: Optional[Dict[str, str]] = None,
+        users: Optional[Dict[str, Any]] = None
+    ):
+        self.jobs: Dict[str, Job] = {job["id"]: job for job in jobs or []}
+        self.artifacts: List[Artifact] = list(artifacts or [])
+        self.memberships = dict(memberships or {})
+        self.users = dict(users or {})
+        self.round_trips = 0
+
+    async def list_jobs(self, org_id: str) -> List[Job]:
+        self.round_trips += 1
+        jobs = [job for job in self.jobs.values() if job.get("org_id") == org_id]
+        return sorted(jobs, key=lambda job: job.get("created_at") or "", reverse=True)
+
+    async def get_job(self, job_id: str, org_id: str) -> Optional[Job]:
+        self.round_trips += 1
+        job = self.jobs.get(job_id)
+        return job if job and job.get("org_id") == org_id else None
+
+    async def list_batch_jobs(self, batch_id: str, org_id: str) -> List[Job]:
+        self.round_trips += 1
+        jobs = [job for job in self.jobs.values() if job.get("batch_id") == batch_id and job.get("org_id") == org_id]
+        return sorted(jobs, key=lambda job: job.get("created_at") or "")
+
+    async def get_job_with_artifacts(self, job_id: str, org_id: str) -> Optional[Tuple[Job, List[Artifact]]]:
+        self.round_trips += 1
+        job = self.jobs.get(job_id)
+        if not job or job.get("org_id") != org_id:
+            return None
+        return job, [a for a in self.artifacts if a.get("job_id") == job_id]
+
+    async def save_report_cache(self, job_id: str, bundle: Dict[str, Any]) -> None:
+        self.round_trips += 1
+        if job_id in self.jobs:
+            self.jobs[job_id]["report_cache"] = bundle
+
+    async def get_user_org(self, user_id: str) -> Optional[str]:
+        self.round_trips += 1
+        return self.memberships.get(user_id)
+
+    async def get_user(self, token: str) -> Optional[Any]:
+        self.round_trips += 1
+        return self.users.get(token)
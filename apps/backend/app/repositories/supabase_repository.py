@@ -0,0 +1,86 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from supabase import AsyncClient, acreate_client
+
+from app.repositories.base import Artifact, Job, ScanRepository
+
+# Job columns for list/status endpoints; report_cache is only read with artifacts
+JOB_COLUMNS = (
+    "id, org_id, user_id, url, batch_id, status, progress_stage, error_message, result, "
+    "attempts, max_attempts, created_at, started_at, completed_at, updated_at"
+)
+
+
+class SupabaseScanRepository(ScanRepository):
+    """Repository over the async Supabase client.
+
+    One client (and therefore one pooled HTTP/2 connection set) is shared by
+    every request of the API process; create it once at startup.
+    """
+
+    def __init__(self, client: AsyncClient):
+        self.client = client
+
+    @classmethod
+    async def connect(cls, url: str, key: str) -> "SupabaseScanRepository":
+        return cls(await acreate_client(url, key))
+
+    async def list_jobs(self, org_id: str) -> List[Job]:
+        result = await self.client.table("scan_jobs")\
+            .select(JOB_COLUMNS)\
+            .eq("org_id", org_id)\
+            .order("created_at", desc=True)\
+            .execute()
+        return result.data or []
+
+    async def get_job(self, job_id: str, org_id: str) -> Optional[Job]:
+        result = await self.client.table("scan_jobs")\
+            .select(JOB_COLUMNS)\
+            .eq("id", job_id)\
+            .eq("org_id", org_id)\
+            .limit(1)\
+            .execute()
+        return result.data[0] if result.data else None
+
+    async def list_batch_jobs(self, batch_id: str, org_id: str) -> List[Job]:
+        result = await self.client.table("scan_jobs")\
+            .select(JOB_COLUMNS)\
+            .eq("batch_id", batch_id)\
+            .eq("org_id", org_id)\
+            .order("created_at")\
+            .execute()
+        return result.data or []
+
+    async def get_job_with_artifacts(self, job_id: str, org_id: str) -> Optional[Tuple[Job, List[Artifact]]]:
+        # get_scan_with_artifacts() (supabase/migrations) returns both in one round trip
+        result = await self.client.rpc("get_scan_with_artifacts", {
+            "p_job_id": job_id,
+            "p_org_id": org_id
+        }).execute()
+        data = result.data
+        if isinstance(data, list):
+            data = data[0] if data else None
+        if not data or not data.get("job"):
+            return None
+        return data["job"], data.get("artifacts") or []
+
+    async def save_report_cache(self, job_id: str, bundle: Dict[str, Any]) -> None:
+        await self.client.table("scan_jobs")\
+            .update({"report_cache": bundle})\
+            .eq("id", job_id)\
+            .execute()
+
+    async def get_user_org(self, user_id: str) -> Optional[str]:
+        result = await self.client.table("org_members")\
+            .select("org_id")\
+            .eq("user_id", user_id)\
+            .limit(1)\
+            .execute()
+        return result.data[0]["org_id"] if result.data else None
+
+    async def get_user(self, token: str) -> Optional[Any]:
+        response = await self.client.auth.get_user(token)
+        return response.user if response else None
+
+    async def close(self) -> None:
+        await self.client.postgrest.aclose()
@@ -0,0 +1,175 @@
+"""Rescore stored scans with the current Scoring 2.0 weights: ``python -m app.rescore``.
+
+Reads scan artifacts in pages (from Supabase, or from local ``output/<job_id>/site.json``
+files with ``--from-dir``), scores each page of signals with the vectorised batch
+scorer and merges the new totals into ``scan_jobs.result``. The persisted report
+bundle (``scan_jobs.report_cache``) of a rescored job is cleared so the report
+endpoints rebuild it with the new scores.
+
+Each page is also run through the current rule set column by column
+(``RuleEngine.evaluate_batch``); a job whose persisted report fired different
+rules (the rule set changed) has its bundle cleared even if its score did not.
+"""
+
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import click
+
+from app.services.batch_scoring import DIMENSIONS, score_table
+from app.services.report_engine import ReportEngine
+
+engine = ReportEngine()
+
+
+def iter_supabase_artifacts(client: Any, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Scan artifacts, ``batch_size`` rows per round trip."""
+    start = 0
+    while True:
+        rows = client.table("artifacts")\
+            .select("job_id, stage, jsonb_payload")\
+            .eq("stage", "scan")\
+            .order("job_id")\
+            .range(start, start + batch_size - 1)\
+            .execute().data or []
+        if rows:
+            yield rows
+        if len(rows) < batch_size:
+            return
+        start += batch_size
+
+
+def iter_local_artifacts(directory: str, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """``<directory>/<job_id>/site.json`` files written by the scan pipeline."""
+    batch = []
+    for path in sorted(Path(directory).glob("*/site.json")):
+        with open(path) as f:
+            batch.append({"job_id": path.parent.name, "stage": "scan", "jsonb_payload": json.load(f)})
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def rescore_artifacts(artifacts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """``{job_id, total_score, grade, dimensions: {key: score}, rules_fired}`` for each scan artifact."""
+    signals = [engine.extract_signals([artifact]) for artifact in artifacts]
+    table = score_table(signals)
+    fired = engine.rule_engine.evaluate_batch(signals)
+    return [
+        {
+            "job_id": artifact["job_id"],
+            "total_score": table["total"][row],
+            "grade": table["grade"][row],
+            "dimensions": {key: table[key][row] for key, _, _ in DIMENSIONS},
+            "rules_fired": fired[row]
+        }
+        for row, artifact in enumerate(artifacts)
+    ]
+
+
+def merge_result(result: Optional[Dict[str, Any]], scored: Dict[str, Any]) -> Dict[str, Any]:
+    """New totals merged into an existing ``scan_jobs.result`` (dimension items are kept)."""
+    merged = dict(result or {})
+    merged["total_score"] = scored["total_score"]
+    merged["grade"] = scored["grade"]
+    dimension_scores = {key: dict(value) for key, value in (merged.get("dimension_scores") or {}).items()}
+    for key, _, maximum in DIMENSIONS:
+        if key in dimension_scores:
+            score = scored["dimensions"][key]
+            dimension_scores[key]["score"] = score
+            dimension_scores[key]["percentage"] = int((score / maximum) * 100) if score > 0 else 0
+    if dimension_scores:
+        merged["dimension_scores"] = dimension_scores
+    merged["rescored_at"] = datetime.utcnow().isoformat()
+    return merged
+
+
+def score_changed(result: Optional[Dict[str, Any]], scored: Dict[str, Any]) -> bool:
+    """Whether the new scores differ from ``scan_jobs.result``: total, grade or any dimension score."""
+    result = result or {}
+    if result.get("total_score") != scored["total_score"] or result.get("grade") != scored["grade"]:
+        return True
+    dimension_scores = result.get("dimension_scores") or {}
+    return any(
+        key in dimension_scores and dimension_scores[key].get("score") != scored["dimensions"][key]
+        for key, _, _ in DIMENSIONS
+    )
+
+
+def rules_changed(rules_fired: Optional[List[str]], scored: Dict[str, Any]) -> bool:
+    """Whether a persisted report (its ``rules_fired``) disagrees with the current rule set."""
+    return rules_fired is not None and rules_fired != scored["rules_fired"]
+
+
+def rescore_update(result: Optional[Dict[str, Any]], scored: Dict[str, Any]) -> Dict[str, Any]:
+    """``scan_jobs`` columns to write for a rescored job: merged result, stale report bundle dropped."""
+    return {"result": merge_result(result, scored), "report_cache": None}
+
+
+@click.command()
+@click.option("--from-dir", default=None, type=click.Path(exists=True, file_okay=False),
+              help="從本機 output/<job_id>/site.json 讀取（不寫回資料庫）")
+@click.option("--batch-size", default=500, type=click.IntRange(min=1), help="每批讀取與評分的掃描數")
+@click.option("--dry-run", is_flag=True, help="只計算，不寫回 scan_jobs.result")
+@click.option("--output", "-o", default=None, type=click.Path(dir_okay=False), help="將新分數寫入 JSONL 檔")
+def main(from_dir: Optional[str], batch_size: int, dry_run: bool, output: Optional[str]) -> None:
+    """以目前的 Scoring 2.0 權重重新計算所有已儲存掃描的分數。"""
+    client = None
+    if from_dir:
+        batches = iter_local_artifacts(from_dir, batch_size)
+        dry_run = True
+    else:
+        from app.core.supabase import supabase as client
+        batches = iter_supabase_artifacts(client, batch_size)
+
+    out = open(output, "w") if output else None
+    rescored = changed = stale = 0
+    started = time.perf_counter()
+    try:
+        for artifacts in batches:
+            scores = rescore_artifacts(artifacts)
+            previous: Dict[str, Dict[str, Any]] = {}
+            previous_rules: Dict[str, Optional[List[str]]] = {}
+            if client is not None:
+                ids = [score["job_id"] for score in scores]
+                # 只讀取報告中的 rules_fired，不取回整份 report_cache
+                rows = client.table("scan_jobs")\
+                    .select("id, result, rules_fired:report_cache->report->rules_fired")\
+                    .in_("id", ids).execute().data or []
+                previous = {row["id"]: row.get("result") or {} for row in rows}
+                previous_rules = {row["id"]: row.get("rules_fired") for row in rows}
+
+            for score in scores:
+                old = previous.get(score["job_id"], {})
+                update = None
+                if client is not None and score_changed(old, score):
+                    changed += 1
+                    update = rescore_update(old, score)
+                elif client is not None and rules_changed(previous_rules.get(score["job_id"]), score):
+                    stale += 1
+                    update = {"report_cache": None}
+                if update and not dry_run:
+                    client.table("scan_jobs")\
+                        .update(update)\
+                        .eq("id", score["job_id"])\
+                        .execute()
+                if out:
+                    out.write(json.dumps({**score, "previous_score": old.get("total_score")}, ensure_ascii=False) + "\n")
+            rescored += len(scores)
+            click.echo(f"📊 已重新評分 {rescored} 筆")
+    finally:
+        if out:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    rate = rescored / elapsed if elapsed > 0 else 0
+    click.echo(f"✅ 完成：{rescored} 筆掃描，{changed} 筆分數變動，{stale} 筆報告規則變動（{rate:.0f} 筆/秒）" + ("（dry run）" if dry_run else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""On-demand delivery of heavy scan artifacts.
+
+Report responses no longer embed the raw site payload. The frontend fetches
+per-page artifact data separately, projected to the fields it needs,
+paginated, streamed as JSON and compressed according to ``Accept-Encoding``.
+An ETag lets repeat views revalidate without downloading anything.
+"""
+
+import hashlib
+import json
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+def select_pages(artifacts: List[Dict[str, Any]], stage: str = "scan") -> Optional[Dict[str, Any]]:
+    """Payload of the first artifact of ``stage`` (the site.json of a scan)."""
+    for artifact in artifacts:
+        if artifact.get("stage") == stage:
+            return artifact.get("jsonb_payload") or {}
+    return None
+
+
+def project(item: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """Keep only ``fields`` (all fields when None)."""
+    if not fields:
+        return item
+    return {field: item[field] for field in fields if field in item}
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()] or None
+
+
+def compute_etag(*parts: Any) -> str:
+    """Weak ETag over the inputs that determine the response body."""
+    digest = hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or etag.removeprefix("W/") in candidates
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick ``br`` (if brotli is installed) or ``gzip`` from Accept-Encoding."""
+    accepted = set()
+    for token in (accept_encoding or "").split(","):
+        name, _, params = token.partition(";")
+        quality = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name.strip() and quality > 0:
+            accepted.add(name.strip().lower())
+    if BROTLI_AVAILABLE and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def iter_page_json(header: Dict[str, Any], items: Iterable[Dict[str, Any]], chunk_size: int = 16 * 1024) -> Iterator[bytes]:
+    """Encode ``{**header, "items": [...]}`` incrementally, one item at a time."""
+    head = json.dumps(header, ensure_ascii=False)[:-1]
+    buffer = [head + (', "items": [' if header else '"items": [')]
+    size = len(buffer[0])
+    for index, item in enumerate(items):
+        piece = ("," if index else "") + json.dumps(item, ensure_ascii=False)
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    buffer.append("]}")
+    yield "".join(buffer).encode("utf-8")
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: Optional[str]) -> Iterator[bytes]:
+    """Compress a byte stream incrementally with ``gzip`` or ``br`` (identity when None)."""
+    if encoding is None:
+        yield from chunks
+        return
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=5)
+        for chunk in chunks:
+            out = compressor.process(chunk)
+            if out:
+                yield out
+        yield compressor.finish()
+        return
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
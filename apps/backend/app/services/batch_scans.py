@@ -0,0 +1,64 @@
+"""Summaries and JSONL export for batch (portfolio) scans.
+
+A batch is a set of ``scan_jobs`` rows sharing a ``batch_id``; the workers scan
+them like any other job. These helpers turn the rows into a progress summary
+(counts by status, throughput) and a one-line-per-site JSONL export.
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+STATUSES = ("pending", "processing", "completed", "failed")
+
+
+def _timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def summarize_batch(batch_id: str, jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """``{batch_id, total, counts, done, sites_per_min}`` for the jobs of one batch.
+
+    Throughput is finished sites per minute between the first start and the last completion.
+    """
+    counts = {status: 0 for status in STATUSES}
+    for job in jobs:
+        counts[job.get("status")] = counts.get(job.get("status"), 0) + 1
+
+    started = [t for t in (_timestamp(job.get("started_at")) for job in jobs) if t]
+    finished = [t for t in (_timestamp(job.get("completed_at")) for job in jobs) if t]
+    sites_per_min = None
+    if started and finished:
+        minutes = (max(finished) - min(started)).total_seconds() / 60
+        if minutes > 0:
+            sites_per_min = round(len(finished) / minutes, 1)
+
+    return {
+        "batch_id": batch_id,
+        "total": len(jobs),
+        "counts": counts,
+        "done": counts["completed"] + counts["failed"] == len(jobs),
+        "sites_per_min": sites_per_min
+    }
+
+
+def batch_record(job: Dict[str, Any]) -> Dict[str, Any]:
+    """One JSONL record per site, mirroring the CLI batch output (scores instead of raw pages)."""
+    record = {"job_id": job["id"], "url": job["url"], "status": job.get("status")}
+    result = job.get("result") or {}
+    if result:
+        record["total_score"] = result.get("total_score")
+        record["grade"] = result.get("grade")
+    if job.get("error_message"):
+        record["error"] = job["error_message"]
+    return record
+
+
+def iter_batch_jsonl(jobs: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    for job in jobs:
+        yield json.dumps(batch_record(job), ensure_ascii=False) + "\n"
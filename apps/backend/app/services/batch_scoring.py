@@ -0,0 +1,172 @@
+"""Vectorised Scoring 2.0 for many signals at once.
+
+``calculate_score_v2`` builds per-item dicts for one report. Rescoring a whole
+corpus only needs the numbers, so ``score_batch`` turns the signals into a
+columnar table and computes the five dimension scores with NumPy array
+operations. Results are identical to the scalar path (same thresholds, same
+percentage rounding); without NumPy it falls back to the scalar path.
+"""
+
+from typing import Any, Dict, List, Sequence
+
+from app.models.signals import SignalRecord
+from app.services.scoring import calculate_score_v2
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# (key, name, max) in the order calculate_score_v2 reports them
+DIMENSIONS = (
+    ('structure', '結構化', 30),
+    ('discoverability', '可發現性', 20),
+    ('trust', '信任訊號', 20),
+    ('technical', '技術體質', 15),
+    ('identity', '身份識別', 15),
+)
+
+BOOL_COLUMNS = (
+    'has_title', 'has_description', 'has_favicon', 'has_https', 'is_mobile_friendly',
+    'has_about_page', 'has_contact', 'has_author', 'has_jsonld', 'analysis_has_details',
+)
+NUMERIC_COLUMNS = ('schema_count', 'social_links_count', 'analysis_score', 'page_load_time')
+
+
+def signals_to_columns(signals_list: Sequence[Any]) -> Dict[str, List[Any]]:
+    """Columnar table of the inputs Scoring 2.0 reads (``SignalRecord``, ``SiteSignals`` or dicts)."""
+    if signals_list and isinstance(signals_list[0], SignalRecord):
+        def column(name: str) -> List[Any]:
+            return [getattr(signals, name) for signals in signals_list]
+    else:
+        rows = signals_list if signals_list and isinstance(signals_list[0], dict) else [s.__dict__ for s in signals_list]
+
+        def column(name: str) -> List[Any]:
+            return [row.get(name) for row in rows]
+
+    columns: Dict[str, List[Any]] = {name: column(name) for name in BOOL_COLUMNS[:-1]}
+    analyses = [analysis or {} for analysis in column('schema_analysis')]
+    columns['analysis_has_details'] = [bool(analysis.get('details')) for analysis in analyses]
+    columns['analysis_score'] = [analysis.get('score', 0) or 0 for analysis in analyses]
+    columns['schema_count'] = [count or 0 for count in column('schema_count')]
+    columns['social_links_count'] = [count or 0 for count in column('social_links_count')]
+    columns['page_load_time'] = [float('nan') if t is None else t for t in column('page_load_time')]
+    return columns
+
+
+def score_columns(columns: Dict[str, Sequence[Any]]) -> Dict[str, Any]:
+    """Dimension scores, total and grade arrays for a columnar table.
+
+    Returns ``{dimension key: scores, 'total': ..., 'score': ..., 'grade': ...}``.
+    """
+    # None counts as False (e.g. is_mobile_friendly when unmeasured)
+    c = {name: np.array([bool(v) for v in columns[name]], dtype=bool) for name in BOOL_COLUMNS}
+    c.update({name: np.asarray(columns[name], dtype=float) for name in NUMERIC_COLUMNS})
+
+    # 1. 結構化 (30): analysis score; legacy fallback when the analysis has no details
+    has_schema = c['has_jsonld'] | (c['schema_count'] > 0)
+    structure = np.where(~c['analysis_has_details'] & has_schema, 10.0, c['analysis_score'])
+
+    # 2. 可發現性 (20)
+    discoverability = 8.0 * c['has_title'] + 7.0 * c['has_description'] + 5.0 * c['has_favicon']
+
+    # 3. 信任訊號 (20): HTTPS + performance (unmeasured load time gets 5)
+    load_time = c['page_load_time']
+    measured = ~np.isnan(load_time)
+    performance = np.where(
+        measured,
+        np.where(load_time < 2.0, 10.0, np.where(load_time < 4.0, 5.0, 0.0)),
+        5.0
+    )
+    trust = 10.0 * c['has_https'] + performance
+
+    # 4. 技術基礎 (15)
+    technical = 10.0 * c['is_mobile_friendly'] + 5.0 * (c['has_title'] | c['has_description'])
+
+    # 5. 身份識別 (15)
+    identity_page = np.where(c['has_about_page'] | c['has_contact'], 10.0, np.where(c['has_author'], 5.0, 0.0))
+    identity = identity_page + 5.0 * (c['social_links_count'] >= 1)
+
+    total = structure + discoverability + trust + technical + identity
+    grade = np.select([total >= 80, total >= 60, total >= 40, total >= 20], ['A', 'B', 'C', 'D'], default='F')
+    return {
+        'structure': structure,
+        'discoverability': discoverability,
+        'trust': trust,
+        'technical': technical,
+        'identity': identity,
+        'total': total,
+        'score': np.minimum(total, 100),
+        'grade': grade,
+    }
+
+
+def _number(value: float) -> Any:
+    return int(value) if float(value).is_integer() else float(value)
+
+
+def _strip_items(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'score': result['score'],
+        'total': sum(d['score'] for d in result['dimensions'].values()),
+        'grade': result['grade'],
+        'dimensions': {
+            key: {k: v for k, v in dim.items() if k != 'items'}
+            for key, dim in result['dimensions'].items()
+        }
+    }
+
+
+def score_table(signals_list: Sequence[Any]) -> Dict[str, List[Any]]:
+    """Bulk scores as plain columns: ``{'score', 'total', 'grade', <dimension keys>}`` lists."""
+    if not NUMPY_AVAILABLE:
+        results = score_batch(signals_list)
+        table = {name: [r[name] for r in results] for name in ('score', 'total', 'grade')}
+        table.update({key: [r['dimensions'][key]['score'] for r in results] for key, _, _ in DIMENSIONS})
+        return table
+    scores = score_columns(signals_to_columns(signals_list))
+    table = {name: [_number(v) for v in scores[name].tolist()] for name in ('score', 'total')}
+    table['grade'] = scores['grade'].tolist()
+    table.update({key: [_number(v) for v in scores[key].tolist()] for key, _, _ in DIMENSIONS})
+    return table
+
+
+def score_batch(signals_list: Sequence[Any]) -> List[Dict[str, Any]]:
+    """Score many signals; same numbers as ``calculate_score_v2`` without the per-item details.
+
+    Each result is ``{'score', 'total', 'grade', 'dimensions': {key: {name, score, max, percentage}}}``.
+    """
+    if not NUMPY_AVAILABLE:
+        return [_strip_items(calculate_score_v2(signals)) for signals in signals_list]
+    if not signals_list:
+        return []
+
+    scores = score_columns(signals_to_columns(signals_list))
+    percentages = {
+        key: np.where(scores[key] > 0, (scores[key] / maximum) * 100, 0).astype(int)
+        for key, _, maximum in DIMENSIONS
+    }
+    columns = {key: scores[key].tolist() for key, _, _ in DIMENSIONS}
+    pct_columns = {key: percentages[key].tolist() for key, _, _ in DIMENSIONS}
+    totals = scores['total'].tolist()
+    capped = scores['score'].tolist()
+    grades = scores['grade'].tolist()
+
+    return [
+        {
+            'score': _number(capped[row]),
+            'total': _number(totals[row]),
+            'grade': grades[row],
+            'dimensions': {
+                key: {
+                    'name': name,
+                    'score': _number(columns[key][row]),
+                    'max': maximum,
+                    'percentage': pct_columns[key][row]
+                }
+                for key, name, maximum in DIMENSIONS
+            }
+        }
+        for row in range(len(signals_list))
+    ]
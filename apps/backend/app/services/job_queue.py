@@ -0,0 +1,338 @@
+"""Scan job queue backed by the ``scan_jobs`` table.
+
+The API only enqueues (inserts a ``pending`` row); worker processes claim jobs
+with a time-limited lease, extend it with heartbeats while scanning, and hand
+the job back for retry (or mark it failed) when it errors. A job whose worker
+dies (crash, redeploy) is re-claimed once its lease expires.
+
+Two implementations share the same interface:
+
+- ``SupabaseJobQueue``: production; claiming is an atomic ``claim_scan_job``
+  Postgres function (``FOR UPDATE SKIP LOCKED``, see supabase/migrations)
+- ``SQLiteJobQueue``: local development and tests
+"""
+
+import json
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobQueue:
+    """Interface shared by the queue backends. All methods are synchronous;
+    async callers should go through ``asyncio.to_thread``."""
+
+    def enqueue(self, url: str, org_id: Optional[str] = None, user_id: Optional[str] = None, scan_key: Optional[str] = None) -> Dict[str, Any]:
+        """Insert a pending job and return its row.
+
+        ``scan_key`` identifies identical scans (see ``app.services.scan_coalescer``).
+        """
+        raise NotImplementedError
+
+    def enqueue_many(self, items: List[Dict[str, Any]], org_id: Optional[str] = None, user_id: Optional[str] = None, batch_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Insert one pending job per ``{url, scan_key}`` item, tagged with ``batch_id``."""
+        raise NotImplementedError
+
+    def find_latest_scan(self, scan_key: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Most recently completed job with ``scan_key``, completed less than ``max_age`` seconds ago if given."""
+        raise NotImplementedError
+
+    def claim(self, worker_id: str, lease_seconds: int) -> Optional[Dict[str, Any]]:
+        """Lease the oldest claimable job (pending, or processing with an expired lease)."""
+        raise NotImplementedError
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: int) -> bool:
+        """Extend the lease; False means the lease was lost to another worker."""
+        raise NotImplementedError
+
+    def complete(self, job_id: str, worker_id: str, result: Optional[Dict[str, Any]] = None) -> None:
+        raise NotImplementedError
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        """Release a failed job: back to pending while attempts remain, else ``failed``.
+
+        Returns True if the job will be retried.
+        """
+        raise NotImplementedError
+
+
+class SQLiteJobQueue(JobQueue):
+    """Single-file queue with the same semantics as the Supabase table."""
+
+    def __init__(self, path: Union[str, Path] = "output/scan_jobs.sqlite", max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.max_attempts = max_attempts
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scan_jobs (
+                id TEXT PRIMARY KEY,
+                org_id TEXT,
+                user_id TEXT,
+                url TEXT NOT NULL,
+                scan_key TEXT,
+                batch_id TEXT,
+                status TEXT NOT NULL,
+                progress_stage TEXT,
+                error_message TEXT,
+                result TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                lease_owner TEXT,
+                lease_expires_at TEXT,
+                heartbeat_at TEXT,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                completed_at TEXT
+            )
+            """
+        )
+        # Queue files created before scan coalescing
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(scan_jobs)")}
+        for column in ("scan_key", "batch_id"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE scan_jobs ADD COLUMN {column} TEXT")
+
+    def _row(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute("SELECT * FROM scan_jobs WHERE id = ?", (job_id,)).fetchone()
+        if not row:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._row(job_id)
+
+    def enqueue(self, url: str, org_id: Optional[str] = None, user_id: Optional[str] = None, scan_key: Optional[str] = None) -> Dict[str, Any]:
+        return self.enqueue_many([{"url": url, "scan_key": scan_key}], org_id, user_id)[0]
+
+    def enqueue_many(self, items: List[Dict[str, Any]], org_id: Optional[str] = None, user_id: Optional[str] = None, batch_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        job_ids = [str(uuid.uuid4()) for _ in items]
+        now = _now()
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT INTO scan_jobs (id, org_id, user_id, url, scan_key, batch_id, status, progress_stage, max_attempts, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, 'pending', '排隊中...', ?, ?)
+                """,
+                [
+                    # Distinct created_at values keep the batch's FIFO order when claiming
+                    (job_id, org_id, user_id, item["url"], item.get("scan_key"), batch_id, self.max_attempts,
+                     (now + timedelta(microseconds=position)).isoformat())
+                    for position, (job_id, item) in enumerate(zip(job_ids, items))
+                ]
+            )
+            return [self._row(job_id) for job_id in job_ids]
+
+    def find_latest_scan(self, scan_key: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        cutoff = (_now() - timedelta(seconds=max_age)).isoformat() if max_age is not None else ""
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT id FROM scan_jobs
+                WHERE scan_key = ? AND status = 'completed' AND completed_at >= ?
+                ORDER BY completed_at DESC
+                LIMIT 1
+                """,
+                (scan_key, cutoff)
+            ).fetchone()
+            return self._row(row["id"]) if row else None
+
+    def claim(self, worker_id: str, lease_seconds: int) -> Optional[Dict[str, Any]]:
+        now = _now()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs whose worker died on their last attempt will never be claimed again
+                self._conn.execute(
+                    """
+                    UPDATE scan_jobs SET status = 'failed', progress_stage = '分析失敗',
+                        error_message = COALESCE(error_message, 'Worker lease expired'), lease_owner = NULL
+                    WHERE status = 'processing' AND lease_expires_at < ? AND attempts >= max_attempts
+                    """,
+                    (now.isoformat(),)
+                )
+                row = self._conn.execute(
+                    """
+                    SELECT id FROM scan_jobs
+                    WHERE attempts < max_attempts
+                      AND (status = 'pending' OR (status = 'processing' AND lease_expires_at < ?))
+                    ORDER BY created_at
+                    LIMIT 1
+                    """,
+                    (now.isoformat(),)
+                ).fetchone()
+                if not row:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    """
+                    UPDATE scan_jobs SET
+                        status = 'processing',
+                        attempts = attempts + 1,
+                        lease_owner = ?,
+                        lease_expires_at = ?,
+                        heartbeat_at = ?,
+                        started_at = COALESCE(started_at, ?)
+                    WHERE id = ?
+                    """,
+                    (worker_id, (now + timedelta(seconds=lease_seconds)).isoformat(), now.isoformat(), now.isoformat(), row["id"])
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self._row(row["id"])
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: int) -> bool:
+        now = _now()
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                UPDATE scan_jobs SET lease_expires_at = ?, heartbeat_at = ?
+                WHERE id = ? AND lease_owner = ? AND status = 'processing'
+                """,
+                ((now + timedelta(seconds=lease_seconds)).isoformat(), now.isoformat(), job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Optional[Dict[str, Any]] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                """
+                UPDATE scan_jobs SET
+                    status = 'completed', progress_stage = '[100%] 分析完成', result = ?,
+                    completed_at = ?, lease_owner = NULL, lease_expires_at = NULL
+                WHERE id = ? AND lease_owner = ?
+                """,
+                (json.dumps(result, ensure_ascii=False) if result is not None else None, _now().isoformat(), job_id, worker_id)
+            )
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        with self._lock:
+            job = self._row(job_id)
+            if not job or job["lease_owner"] != worker_id:
+                return False
+            retry = job["attempts"] < job["max_attempts"]
+            self._conn.execute(
+                """
+                UPDATE scan_jobs SET
+                    status = ?, progress_stage = ?, error_message = ?,
+                    lease_owner = NULL, lease_expires_at = NULL
+                WHERE id = ?
+                """,
+                ("pending" if retry else "failed", "排隊重試中..." if retry else "分析失敗", error, job_id)
+            )
+            return retry
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class SupabaseJobQueue(JobQueue):
+    """Queue over the Supabase ``scan_jobs`` table."""
+
+    def __init__(self, client: Any = None, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        if client is None:
+            from app.core.supabase import supabase as client
+        self.client = client
+        self.max_attempts = max_attempts
+
+    def enqueue(self, url: str, org_id: Optional[str] = None, user_id: Optional[str] = None, scan_key: Optional[str] = None) -> Dict[str, Any]:
+        return self.enqueue_many([{"url": url, "scan_key": scan_key}], org_id, user_id)[0]
+
+    def enqueue_many(self, items: List[Dict[str, Any]], org_id: Optional[str] = None, user_id: Optional[str] = None, batch_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        # One bulk insert for the whole batch
+        rows = [
+            {
+                "org_id": org_id,
+                "user_id": user_id,
+                "url": item["url"],
+                "scan_key": item.get("scan_key"),
+                "batch_id": batch_id,
+                "status": "pending",
+                "progress_stage": "排隊中...",
+                "max_attempts": self.max_attempts
+            }
+            for item in items
+        ]
+        result = self.client.table("scan_jobs").insert(rows).execute()
+        if not result.data or len(result.data) != len(rows):
+            raise RuntimeError("Failed to create scan job")
+        return result.data
+
+    def find_latest_scan(self, scan_key: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        query = self.client.table("scan_jobs").select("*")\
+            .eq("scan_key", scan_key)\
+            .eq("status", "completed")
+        if max_age is not None:
+            query = query.gte("completed_at", (_now() - timedelta(seconds=max_age)).isoformat())
+        rows = query.order("completed_at", desc=True).limit(1).execute().data
+        return rows[0] if rows else None
+
+    def claim(self, worker_id: str, lease_seconds: int) -> Optional[Dict[str, Any]]:
+        result = self.client.rpc("claim_scan_job", {
+            "p_worker_id": worker_id,
+            "p_lease_seconds": lease_seconds
+        }).execute()
+        rows = result.data or []
+        if isinstance(rows, dict):
+            rows = [rows]
+        # The function returns an empty row set (or a NULL row) when nothing is claimable
+        return rows[0] if rows and rows[0].get("id") else None
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: int) -> bool:
+        now = _now()
+        result = self.client.table("scan_jobs").update({
+            "lease_expires_at": (now + timedelta(seconds=lease_seconds)).isoformat(),
+            "heartbeat_at": now.isoformat()
+        }).eq("id", job_id).eq("lease_owner", worker_id).eq("status", "processing").execute()
+        return bool(result.data)
+
+    def complete(self, job_id: str, worker_id: str, result: Optional[Dict[str, Any]] = None) -> None:
+        self.client.table("scan_jobs").update({
+            "status": "completed",
+            "progress_stage": "[100%] 分析完成",
+            "completed_at": "now()",
+            "result": result,
+            "lease_owner": None,
+            "lease_expires_at": None
+        }).eq("id", job_id).eq("lease_owner", worker_id).execute()
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        rows = self.client.table("scan_jobs").select("attempts, max_attempts")\
+            .eq("id", job_id).eq("lease_owner", worker_id).execute().data
+        if not rows:
+            return False
+        retry = rows[0]["attempts"] < rows[0]["max_attempts"]
+        self.client.table("scan_jobs").update({
+            "status": "pending" if retry else "failed",
+            "progress_stage": "排隊重試中..." if retry else "分析失敗",
+            "error_message": error,
+            "lease_owner": None,
+            "lease_expires_at": None
+        }).eq("id", job_id).eq("lease_owner", worker_id).execute()
+        return retry
+
+
+def create_job_queue(backend: str = "supabase", sqlite_path: Optional[str] = None, max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> JobQueue:
+    """Build the queue selected by ``JOB_QUEUE_BACKEND``."""
+    if backend == "sqlite":
+        return SQLiteJobQueue(sqlite_path or "output/scan_jobs.sqlite", max_attempts=max_attempts)
+    if backend == "supabase":
+        return SupabaseJobQueue(max_attempts=max_attempts)
+    raise ValueError(f"Unknown job queue backend: {backend}")
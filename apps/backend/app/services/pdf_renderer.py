@@ -0,0 +1,127 @@
+"""Queued PDF rendering on the shared browser.
+
+Each PDF used to launch its own Chromium. ``PdfRenderService`` renders on pages
+leased from a context pool of the browser started in ``app.main.lifespan``,
+runs at most ``max_concurrency`` renders at once, and caches the bytes per
+``(job_id, report_version)`` so repeat downloads are free.
+
+A request whose render can start right away waits for it. When every render
+slot is busy the render is queued and the caller gets ``None`` (the API answers
+202 and the client polls). ``RenderQueueFull`` is raised once ``max_queue``
+renders are already waiting.
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+Key = Tuple[str, str]
+
+
+class RenderQueueFull(Exception):
+    """Too many PDF renders are already waiting."""
+
+
+class PdfRenderService:
+    """Bounded render queue with an LRU of finished PDFs.
+
+    Args:
+        render: Coroutine function ``render(job_id, *render_args)`` returning PDF bytes
+        max_concurrency: Renders running at once (size the context pool to match)
+        max_queue: Renders allowed to wait for a slot
+        cache_size: Finished PDFs kept in memory
+        wait_timeout: Seconds a request waits for a render that started right away
+    """
+
+    def __init__(
+        self,
+        render: Callable[..., Awaitable[bytes]],
+        max_concurrency: int = 2,
+        max_queue: int = 8,
+        cache_size: int = 32,
+        wait_timeout: float = 90.0
+    ):
+        self.render = render
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max_queue
+        self.cache_size = cache_size
+        self.wait_timeout = wait_timeout
+        self.renders = 0
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._cache: "OrderedDict[Key, bytes]" = OrderedDict()
+        self._tasks: Dict[Key, asyncio.Task] = {}
+        self._queued: Set[Key] = set()
+        self._errors: Dict[Key, BaseException] = {}
+
+    def cached(self, job_id: str, version: str) -> Optional[bytes]:
+        key = (job_id, version)
+        pdf = self._cache.get(key)
+        if pdf is not None:
+            self._cache.move_to_end(key)
+        return pdf
+
+    async def get(self, job_id: str, version: str, *render_args: Any) -> Optional[bytes]:
+        """PDF bytes if cached or rendered in time, else None while it is queued.
+
+        ``render_args`` (e.g. the report bundle) are passed to ``render`` when a
+        new render is started.
+
+        Raises the render's exception once if it failed, and ``RenderQueueFull``
+        when the queue cannot take another job.
+        """
+        key = (job_id, version)
+        pdf = self.cached(job_id, version)
+        if pdf is not None:
+            return pdf
+        error = self._errors.pop(key, None)
+        if error is not None:
+            raise error
+
+        task = self._tasks.get(key)
+        if task is None:
+            immediate = len(self._tasks) < self.max_concurrency
+            if not immediate:
+                if len(self._queued) >= self.max_queue:
+                    raise RenderQueueFull(f"{len(self._queued)} PDF renders already queued")
+                self._queued.add(key)
+            task = asyncio.create_task(self._run(key, render_args))
+            self._tasks[key] = task
+        else:
+            immediate = key not in self._queued
+
+        if not immediate:
+            return None
+        # asyncio.wait never cancels the task, so a disconnecting client cannot abort a render
+        done, _ = await asyncio.wait({task}, timeout=self.wait_timeout)
+        if not done:
+            return None
+        pdf = task.result()
+        if pdf is None:
+            raise self._errors.pop(key, None) or RuntimeError("PDF render failed")
+        return pdf
+
+    async def _run(self, key: Key, render_args: Tuple[Any, ...]) -> Optional[bytes]:
+        try:
+            async with self._semaphore:
+                self._queued.discard(key)
+                pdf = await self.render(key[0], *render_args)
+            self.renders += 1
+            self._cache[key] = pdf
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return pdf
+        except Exception as e:
+            print(f"[WARN] PDF render failed for job {key[0]}: {e}")
+            # Reported to the next poll, then forgotten so a later request retries
+            self._errors[key] = e
+            return None
+        finally:
+            self._queued.discard(key)
+            self._tasks.pop(key, None)
+
+    async def close(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,167 @@
+"""In-process pub/sub for live scan progress.
+
+The scan pipeline publishes structured progress events (``percent``, ``stage``,
+``page_url``) as ``SiteParser`` reports them; every open dashboard tab holds a
+subscription and receives them over server-sent events. Viewers cost no
+database reads, and slow viewers only ever see the latest events (each
+subscriber queue drops its oldest event when full).
+
+Scans run by this process (the embedded worker) publish directly. Scans run by
+external workers reach the hub through ``ProgressListener`` (Postgres
+LISTEN/NOTIFY on ``scan_jobs``), which sets ``remote_feed`` while connected.
+Without that feed (listener down, or the SQLite queue), the event stream falls
+back to an occasional per-viewer status read so it still ends when an external
+worker finishes the job.
+"""
+
+import asyncio
+import json
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional, Set
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+Event = Dict[str, Any]
+
+
+class ProgressHub:
+    """Fan-out of progress events per job.
+
+    Args:
+        queue_size: Events buffered per subscriber before the oldest is dropped
+        retain: Finished jobs whose last event is kept for late subscribers
+    """
+
+    def __init__(self, queue_size: int = 16, retain: int = 256):
+        self.queue_size = queue_size
+        self.retain = retain
+        self.published = 0
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._latest: "OrderedDict[str, Event]" = OrderedDict()
+        self._live: Set[str] = set()
+        # True while a cross-process feed (ProgressListener) delivers external workers' events
+        self.remote_feed = False
+
+    def progress(self, job_id: str, percent: int, stage: str, page_url: Optional[str] = None) -> None:
+        """Publish one progress update (called by ``ProgressReporter`` on every update)."""
+        self._live.add(job_id)
+        self._publish(job_id, {"type": "progress", "percent": percent, "stage": stage, "page_url": page_url})
+
+    def relay(self, job_id: str, event: Event) -> None:
+        """Publish an event received from another process (the job is not live here)."""
+        self._publish(job_id, event)
+
+    def status(self, job_id: str, status: str, error: Optional[str] = None) -> None:
+        """Publish a status change; the scan is no longer live in this process."""
+        self._live.discard(job_id)
+        event = {"type": "status", "status": status}
+        if error:
+            event["error"] = error
+        self._publish(job_id, event)
+
+    def latest(self, job_id: str) -> Optional[Event]:
+        return self._latest.get(job_id)
+
+    def is_live(self, job_id: str) -> bool:
+        """True while this process is scanning ``job_id``."""
+        return job_id in self._live
+
+    @contextmanager
+    def subscribe(self, job_id: str) -> Iterator[asyncio.Queue]:
+        """Queue receiving every event published for ``job_id`` while the block runs."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(job_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[job_id]
+
+    def subscriber_count(self, job_id: str) -> int:
+        return len(self._subscribers.get(job_id, ()))
+
+    def _publish(self, job_id: str, event: Event) -> None:
+        self.published += 1
+        self._latest[job_id] = event
+        self._latest.move_to_end(job_id)
+        while len(self._latest) > self.retain:
+            oldest = next(iter(self._latest))
+            if oldest in self._live:
+                break
+            del self._latest[oldest]
+        for queue in self._subscribers.get(job_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+
+def format_sse(event: Event) -> str:
+    """One server-sent event; the event name is the event's ``type``."""
+    data = {k: v for k, v in event.items() if k != "type"}
+    return f"event: {event['type']}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def parse_progress_stage(stage: Optional[str]) -> Event:
+    """Progress event from a stored ``progress_stage`` string like ``"[45%] ..."``."""
+    percent = 0
+    text = stage or ""
+    if text.startswith("[") and "%]" in text:
+        head, _, text = text.partition("%]")
+        try:
+            percent = int(head[1:])
+        except ValueError:
+            percent = 0
+        text = text.strip()
+    return {"type": "progress", "percent": percent, "stage": text, "page_url": None}
+
+
+async def job_event_stream(
+    hub: ProgressHub,
+    job: Dict[str, Any],
+    reload_job: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+    keepalive: float = 15.0,
+    remote_reload_every: int = 20
+) -> AsyncIterator[str]:
+    """Server-sent events for one job until it completes or fails.
+
+    Starts with the current state (the hub's latest event, or the stored
+    ``progress_stage``), then streams hub events. Every ``keepalive`` seconds
+    without events it sends a comment; if the scan is not live in this process
+    it also re-reads the job (``reload_job``) to notice external completion.
+    With a cross-process feed (``remote_feed``) it only re-reads every
+    ``remote_reload_every`` idle intervals, in case a notification was lost
+    while the listener reconnected.
+    """
+    job_id = job["id"]
+    if job.get("status") in TERMINAL_STATUSES:
+        yield format_sse({"type": "status", "status": job["status"]})
+        return
+
+    with hub.subscribe(job_id) as queue:
+        first = hub.latest(job_id) or parse_progress_stage(job.get("progress_stage"))
+        yield format_sse(first)
+        # The job may have finished between loading it and subscribing
+        if first.get("status") in TERMINAL_STATUSES:
+            return
+        idle = 0
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                idle += 1
+                if not hub.is_live(job_id) and (not hub.remote_feed or idle % remote_reload_every == 0):
+                    current = await reload_job()
+                    if not current or current.get("status") in TERMINAL_STATUSES:
+                        yield format_sse({"type": "status", "status": (current or {}).get("status", "failed")})
+                        return
+                    yield format_sse(parse_progress_stage(current.get("progress_stage")))
+                else:
+                    yield ": keepalive\n\n"
+                continue
+            yield format_sse(event)
+            if event.get("status") in TERMINAL_STATUSES:
+                return
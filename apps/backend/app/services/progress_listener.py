@@ -0,0 +1,109 @@
+"""Cross-process feed for the progress hub over Postgres LISTEN/NOTIFY.
+
+When scans run in separate worker processes (``EMBEDDED_WORKER=false``), the
+API's ``ProgressHub`` sees none of their events. The worker already writes
+``progress_stage`` / ``status`` to ``scan_jobs`` (coalesced by
+``ProgressReporter``); the ``scan_jobs_progress_notify`` trigger (see
+supabase/migrations) forwards every change on the ``scan_progress`` channel.
+One ``ProgressListener`` per API process LISTENs on a dedicated connection and
+relays the events into the hub, so viewers cost no database reads.
+
+While the listener is disconnected, ``hub.remote_feed`` is False and event
+streams fall back to per-viewer status reads. LISTEN needs a session
+connection: it does not work through a transaction-mode pooler.
+"""
+
+import asyncio
+import json
+import re
+from typing import Any, Optional
+
+from app.services.progress_hub import TERMINAL_STATUSES, ProgressHub, parse_progress_stage
+
+CHANNEL = "scan_progress"
+
+
+def listen_dsn(database_url: str) -> str:
+    """libpq DSN from a SQLAlchemy URL (``postgresql+psycopg2://`` → ``postgresql://``)."""
+    return re.sub(r"^postgres(ql)?(\+\w+)?://", "postgresql://", database_url)
+
+
+def relay_notification(hub: ProgressHub, payload: str) -> None:
+    """Publish one ``scan_progress`` notification into the hub."""
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        return
+    job_id = data.get("id")
+    if not job_id:
+        return
+    status = data.get("status")
+    if status in TERMINAL_STATUSES:
+        hub.status(job_id, status, data.get("error_message"))
+    else:
+        hub.relay(job_id, parse_progress_stage(data.get("progress_stage")))
+
+
+class ProgressListener:
+    """LISTEN on ``scan_progress`` and feed a ``ProgressHub``, reconnecting on errors.
+
+    Args:
+        dsn: Postgres connection string (session connection)
+        hub: Hub of this API process
+        retry_seconds: Wait before reconnecting after a failure
+        health_seconds: Quiet period after which the connection is checked
+    """
+
+    def __init__(self, dsn: str, hub: ProgressHub, retry_seconds: float = 5.0, health_seconds: float = 60.0):
+        self.dsn = dsn
+        self.hub = hub
+        self.retry_seconds = retry_seconds
+        self.health_seconds = health_seconds
+
+    def _connect(self) -> Any:
+        import psycopg2
+        import psycopg2.extensions
+
+        conn = psycopg2.connect(self.dsn)
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        return conn
+
+    async def run(self) -> None:
+        """Run until cancelled."""
+        while True:
+            conn: Optional[Any] = None
+            try:
+                conn = await asyncio.to_thread(self._connect)
+                print("[INFO] Listening for scan progress notifications")
+                await self._listen(conn)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[WARN] Progress listener disconnected, retrying in {self.retry_seconds:.0f}s: {e}")
+            finally:
+                self.hub.remote_feed = False
+                if conn is not None:
+                    conn.close()
+            await asyncio.sleep(self.retry_seconds)
+
+    async def _listen(self, conn: Any) -> None:
+        loop = asyncio.get_running_loop()
+        readable = asyncio.Event()
+        loop.add_reader(conn.fileno(), readable.set)
+        self.hub.remote_feed = True
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(readable.wait(), timeout=self.health_seconds)
+                except asyncio.TimeoutError:
+                    # A dropped connection may never become readable: probe it
+                    with conn.cursor() as cursor:
+                        await asyncio.to_thread(cursor.execute, "SELECT 1")
+                readable.clear()
+                conn.poll()
+                while conn.notifies:
+                    relay_notification(self.hub, conn.notifies.pop(0).payload)
+        finally:
+            loop.remove_reader(conn.fileno())
@@ -0,0 +1,76 @@
+"""Coalescing progress writer for scan jobs.
+
+A scan reports progress for every page, but the frontend only needs the latest
+stage. ``ProgressReporter`` keeps just the newest stage, writes it at most once
+per ``min_interval`` seconds on a worker thread (the Supabase client is
+synchronous), and flushes whatever is pending when the scan ends.
+
+Live viewers do not need the throttle: every update is also handed to an
+optional ``publish`` hook (the in-process ``ProgressHub``) as it happens.
+"""
+
+import asyncio
+import time
+from typing import Callable, Optional
+
+PublishProgress = Callable[[int, str, Optional[str]], None]
+
+
+class ProgressReporter:
+    """Throttled, latest-wins progress updates.
+
+    Args:
+        write: Blocking function that persists one stage string
+        min_interval: Minimum seconds between two writes
+        publish: Optional non-blocking ``(percent, message, page_url)`` hook called on every update
+    """
+
+    def __init__(self, write: Callable[[str], None], min_interval: float = 2.0, publish: Optional[PublishProgress] = None):
+        self.write = write
+        self.min_interval = min_interval
+        self.publish = publish
+        self.writes = 0
+        self._pending: Optional[str] = None
+        self._last_write = float("-inf")
+        self._timer: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def format_stage(percent: int, message: str) -> str:
+        # Percentage prefix is parsed by the frontend
+        return f"[{percent}%] {message}"
+
+    async def update(self, percent: int, message: str, page_url: Optional[str] = None) -> None:
+        """Record the latest stage; written now or at the end of the current interval."""
+        if self.publish:
+            self.publish(percent, message, page_url)
+        self._pending = self.format_stage(percent, message)
+        wait = self._last_write + self.min_interval - time.monotonic()
+        if wait <= 0 and not self._lock.locked():
+            await self._write_pending()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._delayed_write(max(wait, 0)))
+
+    async def flush(self) -> None:
+        """Write any pending stage immediately (call on completion or failure)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self._write_pending()
+
+    async def _delayed_write(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._timer = None
+        await self._write_pending()
+
+    async def _write_pending(self) -> None:
+        async with self._lock:
+            stage, self._pending = self._pending, None
+            if stage is None:
+                return
+            self._last_write = time.monotonic()
+            try:
+                await asyncio.to_thread(self.write, stage)
+                self.writes += 1
+            except Exception as e:
+                print(f"Failed to write progress ({stage}): {e}")
@@ -1,9 +1,9 @@
 """Quick Wins 建議生成邏輯"""
 from typing import List, Dict, Any
-from app.models.signals import SiteSignals
+from app.models.signals import SignalRecord
 
 
-def generate_quick_wins(signals: SiteSignals, dimension_scores: Dict[str, Dict]) -> List[Dict[str, Any]]:
+def generate_quick_wins(signals: SignalRecord, dimension_scores: Dict[str, Dict]) -> List[Dict[str, Any]]:
     """生成快速勝利建議
     
     Args:
@@ -31,7 +31,7 @@ def generate_quick_wins(signals: SiteSignals, dimension_scores: Dict[str, Dict])
     return [_format_suggestion(s) for s in suggestions[:3]]
 
 
-def _create_suggestion(dimension: str, item: Dict, signals: SiteSignals) -> Dict[str, Any]:
+def _create_suggestion(dimension: str, item: Dict, signals: SignalRecord) -> Dict[str, Any]:
     """為單一失分項目建立建議"""
     
     name = item['name']
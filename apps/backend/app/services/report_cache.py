@@ -0,0 +1,129 @@
+"""Materialised reports for completed scans.
+
+A completed scan never changes, so the report, the dimension breakdown and the
+PDF inputs are computed once (normally by the worker when the scan finishes),
+persisted in ``scan_jobs.report_cache`` and fronted by an in-process LRU. The
+cache key is ``BUNDLE_VERSION`` (``ReportEngine.VERSION`` plus ``SCORING_VERSION``):
+bumping either makes old entries miss and be rebuilt on the next request.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.report_engine import ReportEngine
+from app.services.scoring import SCORING_VERSION, calculate_dimension_scores, score_to_grade
+from app.services.quick_wins import generate_quick_wins
+
+engine = ReportEngine()
+BUNDLE_VERSION = f"{ReportEngine.VERSION}+s{SCORING_VERSION}"
+
+
+def build_report_bundle(job: Dict[str, Any], artifacts: List[Dict[str, Any]], previous_report: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Run the report pipeline once and return everything the report endpoints serve.
+
+    ``previous_report`` is the report of the previous completed scan with the same
+    ``scan_key``; its signals and fired rules let the rule engine re-evaluate only
+    the rules whose input signals changed.
+    """
+    signals = engine.extract_signals(artifacts)
+    previous_report = previous_report or {}
+    report = engine.generate_report(
+        signals,
+        previous_signals=previous_report.get("signals"),
+        previous_rules_fired=previous_report.get("rules_fired"),
+        previous_rules_fingerprint=previous_report.get("rules_fingerprint")
+    )
+    report["job_id"] = job["id"]
+    report["url"] = job["url"]
+    report["status"] = job.get("status")
+
+    dimension_scores = calculate_dimension_scores(signals)
+    total_score = sum(d['score'] for d in dimension_scores.values())
+    grade = score_to_grade(total_score)
+    quick_wins = generate_quick_wins(signals, dimension_scores)
+
+    formatted_dimensions = {}
+    for key, data in dimension_scores.items():
+        formatted_dimensions[key] = {
+            'name': data.get('name', key),
+            'score': data['score'],
+            'max': data['max'],
+            'percentage': data.get('percentage', 0),
+            'items': data['items']
+        }
+
+    return {
+        "version": BUNDLE_VERSION,
+        "report": report,
+        "dimensions": {
+            "scan_id": job["id"],
+            "url": job["url"],
+            "total_score": total_score,
+            "grade": grade,
+            "dimensions": formatted_dimensions,
+            "quick_wins": quick_wins
+        },
+        "pdf": {
+            "dimensions": dimension_scores,
+            "quick_wins": quick_wins,
+            "total_score": total_score
+        }
+    }
+
+
+class ReportCache:
+    """LRU of report bundles keyed by ``(job_id, BUNDLE_VERSION)``.
+
+    Entries remember the owning org so a hit never bypasses the org check.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, job_id: str, org_id: str) -> Optional[Dict[str, Any]]:
+        key = (job_id, BUNDLE_VERSION)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != org_id:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, job_id: str, org_id: str, bundle: Dict[str, Any]) -> None:
+        key = (job_id, bundle.get("version", BUNDLE_VERSION))
+        self._entries[key] = (org_id, bundle)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, job_id: str) -> None:
+        for key in [key for key in self._entries if key[0] == job_id]:
+            del self._entries[key]
+
+    async def load(self, repository: Any, job: Dict[str, Any], artifacts: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Bundle for a fetched job: persisted copy if current, else built (and persisted once completed).
+
+        Returns None when there are no artifacts yet.
+        """
+        if not artifacts:
+            return None
+
+        persisted = job.get("report_cache")
+        if persisted and persisted.get("version") == BUNDLE_VERSION:
+            bundle = persisted
+        else:
+            bundle = build_report_bundle(job, artifacts)
+            if job.get("status") != "completed":
+                # Still running: artifacts may change, so neither persist nor cache
+                return bundle
+            try:
+                await repository.save_report_cache(job["id"], bundle)
+            except Exception as e:
+                print(f"Failed to persist report cache for job {job['id']}: {e}")
+
+        self.put(job["id"], job.get("org_id"), bundle)
+        return bundle
@@ -0,0 +1,120 @@
+"""Server-side HTML for the PDF report.
+
+Renders the same layout as the frontend ``/pdf-report/:scanId`` page
+(``PDFReportTemplate.tsx``) straight from the cached report bundle, so a PDF
+only needs ``page.set_content`` + ``page.pdf`` instead of a full SPA load.
+"""
+
+from datetime import datetime
+from html import escape
+from pathlib import Path
+from string import Template
+from typing import Any, Dict, List, Optional
+
+from app.services.scoring import score_to_grade
+
+TEMPLATE_PATH = Path(__file__).resolve().parent.parent / "templates" / "pdf_report.html"
+
+GRADE_COLORS = {
+    'A': '#22c55e',
+    'B': '#3b82f6',
+    'C': '#f59e0b',
+    'D': '#ef4444',
+    'F': '#dc2626'
+}
+
+_template: Optional[Template] = None
+
+
+def _load_template() -> Template:
+    global _template
+    if _template is None:
+        _template = Template(TEMPLATE_PATH.read_text(encoding="utf-8"))
+    return _template
+
+
+def grade_color(grade: str) -> str:
+    return GRADE_COLORS.get(grade, '#6b7280')
+
+
+def score_color(percentage: float) -> str:
+    if percentage >= 80:
+        return '#22c55e'
+    if percentage >= 60:
+        return '#f59e0b'
+    return '#ef4444'
+
+
+def trust_gaps(signals: Dict[str, Any]) -> List[str]:
+    """Top 5 trust gaps (same rules as the frontend template)."""
+    s = signals or {}
+    gaps = []
+    if not s.get('has_title'):
+        gaps.append('缺少網站標題')
+    if not s.get('has_description'):
+        gaps.append('缺少網站描述')
+    if not s.get('has_jsonld') and (s.get('schema_count') or 0) == 0:
+        gaps.append('缺少結構化資料')
+    if not s.get('has_author') and not s.get('has_organization') and not s.get('has_about_page'):
+        gaps.append('缺少作者/組織資訊')
+    if not s.get('has_social_proof') and (s.get('social_links_count') or 0) < 2:
+        gaps.append('社群證明不足')
+    return gaps[:5]
+
+
+def render_report_html(report: Dict[str, Any], pdf_data: Dict[str, Any], scan_date: Optional[str] = None) -> str:
+    """Full HTML document for one report.
+
+    Args:
+        report: ``bundle["report"]`` (url, job_id, summary, signals)
+        pdf_data: ``bundle["pdf"]`` (dimensions, quick_wins, total_score)
+        scan_date: Date shown in the header (defaults to today)
+    """
+    total_score = pdf_data.get('total_score', 0)
+    grade = score_to_grade(total_score)
+
+    dimension_rows = []
+    for key, dim in (pdf_data.get('dimensions') or {}).items():
+        percentage = dim.get('percentage', 0)
+        dimension_rows.append(
+            '                <div class="dimension-row">'
+            f'<div class="dim-name">{escape(str(dim.get("name", key)))}</div>'
+            '<div class="dim-bar-container">'
+            f'<div class="dim-bar-fill" style="width: {percentage}%; background-color: {score_color(percentage)}"></div>'
+            '</div>'
+            f'<div class="dim-score">{dim.get("score", 0)}/{dim.get("max", 0)}</div>'
+            '</div>'
+        )
+
+    quick_win_items = []
+    for idx, win in enumerate((pdf_data.get('quick_wins') or [])[:3]):
+        quick_win_items.append(
+            '                <div class="quick-win-item">'
+            f'<div class="win-number">{idx + 1}</div>'
+            '<div class="win-content">'
+            f'<div class="win-title">{escape(str(win.get("title", "")))}</div>'
+            '<div class="win-meta">'
+            f'<span class="win-impact">影響: {escape(str(win.get("impact", "")))}</span>'
+            f'<span class="win-effort">難度: {escape(str(win.get("effort", "")))}</span>'
+            '</div></div></div>'
+        )
+
+    gap_items = [
+        f'                <li class="gap-item">{escape(gap)}</li>'
+        for gap in trust_gaps(report.get('signals'))
+    ]
+
+    scan_id = str(report.get('job_id') or '')
+    return _load_template().substitute(
+        url=escape(str(report.get('url', ''))),
+        scan_date=escape(scan_date or datetime.now().strftime("%Y/%m/%d")),
+        total_score=total_score,
+        grade=escape(grade),
+        grade_color=grade_color(grade),
+        conclusion=escape(str((report.get('summary') or {}).get('conclusion') or '分析完成')),
+        dimension_rows="\n".join(dimension_rows),
+        quick_win_items="\n".join(quick_win_items),
+        gap_items="\n".join(gap_items),
+        engine_version=escape(str(report.get('report_version') or 'r2.0')),
+        scan_id_short=escape(scan_id[:8])
+    )
@@ -10,6 +10,7 @@ from datetime import datetime
 from urllib.parse import urlparse
 import logging
 from pypdf import PdfReader # Use pypdf>=3.0.0
+from app.services.report_html import render_report_html
 
 logger = logging.getLogger(__name__)
 
@@ -22,23 +23,99 @@ except ImportError:
     logger.error("Playwright not installed! Setup requires: pip install playwright && playwright install chromium")
 
 
+# Safe margins used for every rendered report
+PDF_OPTIONS = {
+    'format': 'A4',
+    'print_background': True,
+    'margin': {
+        'top': '12mm',
+        'right': '14mm',
+        'bottom': '12mm',
+        'left': '14mm'
+    },
+    'prefer_css_page_size': True
+}
+
+
+def _check_page_count(pdf_bytes: bytes, scan_id: str) -> None:
+    """QUALITY ASSURANCE: PAGE COUNT CHECK (Max 2 pages)"""
+    try:
+        reader = PdfReader(io.BytesIO(pdf_bytes))
+        page_count = len(reader.pages)
+        
+        if page_count > 2:
+            logger.error(f"[QA FAIL] PDF exceeds 2 pages (Count: {page_count}). ScanID: {scan_id}")
+            # Strict mode: Raise error if page count exceeds limit
+            # Uncomment next line to enforce strict blocking:
+            # raise ValueError(f"PDF Quality Check Failed: Output is {page_count} pages (Limit: 2). Please condense report content.")
+            
+            # For now, log error prominently but allow return (to avoid 100% failure during tuning)
+            # Ideally, we should re-render with 'condensed' mode here.
+        else:
+            logger.info(f"[QA PASS] PDF Page Count: {page_count}")
+            
+    except Exception as qa_err:
+        logger.warning(f"Failed to perform PDF QA check: {qa_err}")
+
+
+async def render_pdf_on_page(page, scan_id: str, frontend_url: str = None) -> bytes:
+    """Render /pdf-report/:scanId on an already open page and return the PDF bytes."""
+    # Default to local dev if not specified
+    if not frontend_url:
+        frontend_url = os.getenv("FRONTEND_URL", "http://localhost:5173")
+    
+    pdf_url = f"{frontend_url}/pdf-report/{scan_id}"
+    
+    logger.info(f"Generating PDF from: {pdf_url}")
+    
+    # Navigate to PDF template
+    # Increased timeout to 45s for production environments
+    await page.goto(pdf_url, wait_until='networkidle', timeout=45000)
+    
+    # Wait for content to load (wait for the .pdf-report element)
+    await page.wait_for_selector('.pdf-report', timeout=15000)
+    
+    # Final stabilization wait
+    await asyncio.sleep(1.5)
+    
+    # Generate PDF with SAFE MARGINS
+    pdf_bytes = await page.pdf(**PDF_OPTIONS)
+    _check_page_count(pdf_bytes, scan_id)
+    return pdf_bytes
+
+
+async def render_html_pdf_on_page(page, html: str, scan_id: str) -> bytes:
+    """Print server-rendered report HTML (no frontend, no network, no stabilization sleep)."""
+    await page.set_content(html, wait_until='load', timeout=15000)
+    pdf_bytes = await page.pdf(**PDF_OPTIONS)
+    _check_page_count(pdf_bytes, scan_id)
+    return pdf_bytes
+
+
+async def render_pdf_with_pool(context_pool, scan_id: str, bundle: dict = None, frontend_url: str = None) -> bytes:
+    """Render the frontend /pdf-report page on a page leased from the shared browser's context pool."""
+    async with context_pool.lease() as page:
+        return await render_pdf_on_page(page, scan_id, frontend_url)
+
+
+async def render_native_pdf_with_pool(context_pool, scan_id: str, bundle: dict) -> bytes:
+    """Render the report bundle with the server-side template on a leased page."""
+    html = render_report_html(bundle["report"], bundle["pdf"])
+    async with context_pool.lease() as page:
+        return await render_html_pdf_on_page(page, html, scan_id)
+
+
 async def generate_pdf_with_playwright(scan_id: str, frontend_url: str = None) -> bytes:
     """
     Generate PDF using Playwright with Strict Quality Control:
     1. Safe Margins (12mm V, 14mm H)
     2. Page Count Limit (Max 2 pages)
+
+    Launches a dedicated browser; the API uses PdfRenderService with the shared browser instead.
     """
     if not PLAYWRIGHT_AVAILABLE:
         raise RuntimeError("Playwright is missing. Please notify engineering.")
     
-    # Default to local dev if not specified
-    if not frontend_url:
-        frontend_url = os.getenv("FRONTEND_URL", "http://localhost:5173")
-    
-    pdf_url = f"{frontend_url}/pdf-report/{scan_id}"
-    
-    logger.info(f"Generating PDF from: {pdf_url}")
-    
     async with async_playwright() as p:
         # Launch browser in headless mode
         browser = await p.chromium.launch(
@@ -49,55 +126,24 @@ async def generate_pdf_with_playwright(scan_id: str, frontend_url: str = None) -
         try:
             # Create new page
             page = await browser.new_page()
-            
-            # Navigate to PDF template
-            # Increased timeout to 45s for production environments
-            await page.goto(pdf_url, wait_until='networkidle', timeout=45000)
-            
-            # Wait for content to load (wait for the .pdf-report element)
-            await page.wait_for_selector('.pdf-report', timeout=15000)
-            
-            # Final stabilization wait
-            await asyncio.sleep(1.5)
-            
-            # Generate PDF with SAFE MARGINS
-            pdf_bytes = await page.pdf(
-                format='A4',
-                print_background=True,
-                margin={
-                    'top': '12mm',
-                    'right': '14mm',
-                    'bottom': '12mm',
-                    'left': '14mm'
-                },
-                prefer_css_page_size=True
-            )
-            
-            # --- QUALITY ASSURANCE: PAGE COUNT CHECK ---
-            try:
-                reader = PdfReader(io.BytesIO(pdf_bytes))
-                page_count = len(reader.pages)
-                
-                if page_count > 2:
-                    logger.error(f"[QA FAIL] PDF exceeds 2 pages (Count: {page_count}). ScanID: {scan_id}")
-                    # Strict mode: Raise error if page count exceeds limit
-                    # Uncomment next line to enforce strict blocking:
-                    # raise ValueError(f"PDF Quality Check Failed: Output is {page_count} pages (Limit: 2). Please condense report content.")
-                    
-                    # For now, log error prominently but allow return (to avoid 100% failure during tuning)
-                    # Ideally, we should re-render with 'condensed' mode here.
-                else:
-                    logger.info(f"[QA PASS] PDF Page Count: {page_count}")
-                    
-            except Exception as qa_err:
-                logger.warning(f"Failed to perform PDF QA check: {qa_err}")
-                
-            return pdf_bytes
+            return await render_pdf_on_page(page, scan_id, frontend_url)
             
         finally:
             await browser.close()
 
 
+def report_pdf_filename(report_data: dict) -> str:
+    """Trust-WEDO-<domain>-<date>.pdf"""
+    url = report_data.get("url", "")
+    try:
+        domain = urlparse(url).netloc.replace("www.", "")
+    except:
+        domain = "report"
+    
+    date_str = datetime.now().strftime("%Y-%m-%d")
+    return f"Trust-WEDO-{domain}-{date_str}.pdf"
+
+
 def generate_report_pdf(report_data: dict, dimensions: dict) -> tuple[str, bytes]:
     """
     Generate PDF for the report using Playwright (Strict Mode)
@@ -114,17 +160,7 @@ def generate_report_pdf(report_data: dict, dimensions: dict) -> tuple[str, bytes
         # Generate PDF using Playwright (async)
         pdf_content = asyncio.run(generate_pdf_with_playwright(scan_id, frontend_url))
         
-        # Generate filename
-        url = report_data.get("url", "")
-        try:
-            domain = urlparse(url).netloc.replace("www.", "")
-        except:
-            domain = "report"
-        
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        filename = f"Trust-WEDO-{domain}-{date_str}.pdf"
-        
-        return filename, pdf_content
+        return report_pdf_filename(report_data), pdf_content
         
     except Exception as e:
         logger.error(f"Failed to generate PDF with Playwright: {e}")
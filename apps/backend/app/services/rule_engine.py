@@ -0,0 +1,202 @@
+"""Compiled, field-indexed report rules.
+
+Rules are declarative (see ``app.constants.report_rules``): a list of
+``[field, op(, value)]`` clauses that must all hold. ``RuleEngine`` compiles
+them once into predicates, validates the fields against ``SiteSignals`` and
+indexes every rule by the signal fields it reads. That enables:
+
+- ``evaluate``: fired rules for one ``SiteSignals``.
+- ``evaluate_incremental``: re-evaluate only rules whose input fields changed
+  since a previous scan, reusing the previous result for the rest (only when the
+  previous result came from the same rule set, see ``fingerprint``).
+- ``evaluate_batch``: column-wise evaluation over thousands of signals, where
+  each distinct clause is computed once per column instead of once per rule.
+"""
+
+import hashlib
+import json
+import operator
+from itertools import compress
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from app.models.signals import SiteSignals
+
+# op -> (needs a comparison value, predicate(field_value, value))
+OPERATORS: Dict[str, Tuple[bool, Callable[[Any, Any], bool]]] = {
+    "is_true": (False, lambda v, _: bool(v)),
+    "is_false": (False, lambda v, _: not v),
+    "is_none": (False, lambda v, _: v is None),
+    "eq": (True, operator.eq),
+    "ne": (True, operator.ne),
+    "lt": (True, lambda v, x: v is not None and v < x),
+    "lte": (True, lambda v, x: v is not None and v <= x),
+    "gt": (True, lambda v, x: v is not None and v > x),
+    "gte": (True, lambda v, x: v is not None and v >= x),
+    "contains": (True, lambda v, x: v is not None and x in v),
+    "not_contains": (True, lambda v, x: v is None or x not in v),
+    "in": (True, lambda v, x: v in x),
+}
+
+Clause = Tuple[str, str, Any]
+
+
+def _field_value(signals: Any, field: str) -> Any:
+    if isinstance(signals, dict):
+        return signals.get(field)
+    return getattr(signals, field, None)
+
+
+def _column(signals_list: Sequence[Any], field: str) -> List[Any]:
+    if signals_list and isinstance(signals_list[0], dict):
+        return [signals.get(field) for signals in signals_list]
+    return [getattr(signals, field, None) for signals in signals_list]
+
+
+def _clause_mask(column: List[Any], op: str, value: Any) -> List[bool]:
+    # Boolean flags are the common case: avoid a function call per row
+    if op == "is_false":
+        return [not v for v in column]
+    if op == "is_true":
+        return [bool(v) for v in column]
+    check = OPERATORS[op][1]
+    return [check(v, value) for v in column]
+
+
+def _clause_key(clause: Clause) -> Tuple[str, str, str]:
+    # Values may be lists (unhashable); clauses are compared by their JSON form
+    return clause[0], clause[1], json.dumps(clause[2], sort_keys=True, default=str)
+
+
+class Rule:
+    """單一規則（已編譯）"""
+
+    def __init__(self, rule_id: str, clauses: Sequence[Clause], issue: Dict[str, Any], suggestion: Dict[str, Any]):
+        self.rule_id = rule_id
+        self.clauses = tuple(clauses)
+        self.fields: FrozenSet[str] = frozenset(field for field, _, _ in self.clauses)
+        self.issue = issue
+        self.suggestion = suggestion
+        self._checks = [(field, OPERATORS[op][1], value) for field, op, value in self.clauses]
+
+    def evaluate(self, signals: Any) -> bool:
+        """評估規則是否命中（所有條件皆成立）"""
+        for field, check, value in self._checks:
+            if not check(_field_value(signals, field), value):
+                return False
+        return True
+
+
+def compile_rule(spec: Dict[str, Any], known_fields: Optional[Iterable[str]] = None) -> Rule:
+    """Validate one declarative rule and compile it."""
+    rule_id = spec.get("rule_id")
+    if not rule_id:
+        raise ValueError(f"Rule without rule_id: {spec!r}")
+    when = spec.get("when")
+    if not when:
+        raise ValueError(f"Rule {rule_id} has no conditions")
+    known = set(known_fields) if known_fields is not None else None
+
+    clauses = []
+    for clause in when:
+        if not 2 <= len(clause) <= 3:
+            raise ValueError(f"Rule {rule_id}: clause must be [field, op] or [field, op, value], got {clause!r}")
+        field, op = clause[0], clause[1]
+        if op not in OPERATORS:
+            raise ValueError(f"Rule {rule_id}: unknown operator {op!r}")
+        needs_value = OPERATORS[op][0]
+        if needs_value != (len(clause) == 3):
+            raise ValueError(f"Rule {rule_id}: operator {op!r} {'needs' if needs_value else 'takes no'} value")
+        if known is not None and field not in known:
+            raise ValueError(f"Rule {rule_id}: unknown signal field {field!r}")
+        clauses.append((field, op, clause[2] if needs_value else None))
+
+    return Rule(rule_id, clauses, spec.get("issue", {}), spec.get("suggestion", {}))
+
+
+class RuleEngine:
+    """Compiled rule set, indexed by the signal fields each rule depends on."""
+
+    def __init__(self, specs: Sequence[Dict[str, Any]], known_fields: Optional[Iterable[str]] = None):
+        if known_fields is None:
+            known_fields = SiteSignals.model_fields.keys()
+        self.rules: List[Rule] = [compile_rule(spec, known_fields) for spec in specs]
+        ids = [rule.rule_id for rule in self.rules]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Duplicate rule_id in rule set")
+        self.by_id: Dict[str, Rule] = {rule.rule_id: rule for rule in self.rules}
+        self.index: Dict[str, List[int]] = {}
+        for position, rule in enumerate(self.rules):
+            for field in rule.fields:
+                self.index.setdefault(field, []).append(position)
+        # Identifies which rules fire for given signals: ids and clauses, in order
+        canonical = json.dumps([[rule.rule_id, [_clause_key(clause) for clause in rule.clauses]] for rule in self.rules])
+        self.fingerprint = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def from_file(cls, path: str) -> "RuleEngine":
+        """Load a JSON rule set (same shape as ``REPORT_RULES``)."""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def default(cls) -> "RuleEngine":
+        from app.constants.report_rules import REPORT_RULES
+        return cls(REPORT_RULES)
+
+    @property
+    def fields(self) -> FrozenSet[str]:
+        return frozenset(self.index)
+
+    def evaluate(self, signals: Any) -> List[Rule]:
+        """Fired rules, in rule-set order."""
+        return [rule for rule in self.rules if rule.evaluate(signals)]
+
+    def rules_for_fields(self, fields: Iterable[str]) -> List[int]:
+        """Positions of the rules that read any of ``fields``."""
+        positions = set()
+        for field in fields:
+            positions.update(self.index.get(field, ()))
+        return sorted(positions)
+
+    def changed_fields(self, signals: Any, previous: Any) -> List[str]:
+        """Indexed fields whose value differs between two signal sets."""
+        return [field for field in self.index if _field_value(signals, field) != _field_value(previous, field)]
+
+    def evaluate_incremental(self, signals: Any, previous: Any, previous_fired: Iterable[str], previous_fingerprint: Optional[str]) -> List[Rule]:
+        """Fired rules, re-evaluating only rules whose input fields changed since ``previous``.
+
+        ``previous_fired`` and ``previous_fingerprint`` are the ``rules_fired`` and
+        ``rules_fingerprint`` stored with the previous report. When the rule set has
+        changed since (rules added or edited), everything is evaluated again.
+        """
+        if previous_fingerprint != self.fingerprint:
+            return self.evaluate(signals)
+        fired = set(previous_fired)
+        for position in self.rules_for_fields(self.changed_fields(signals, previous)):
+            rule = self.rules[position]
+            if rule.evaluate(signals):
+                fired.add(rule.rule_id)
+            else:
+                fired.discard(rule.rule_id)
+        return [rule for rule in self.rules if rule.rule_id in fired]
+
+    def evaluate_batch(self, signals_list: Sequence[Any]) -> List[List[str]]:
+        """Fired rule ids for every signals object, evaluated column by column."""
+        count = len(signals_list)
+        columns = {field: _column(signals_list, field) for field in self.index}
+        clause_masks: Dict[Tuple[str, str, str], List[bool]] = {}
+        fired: List[List[str]] = [[] for _ in range(count)]
+
+        for rule in self.rules:
+            mask: Optional[List[bool]] = None
+            for clause in rule.clauses:
+                key = _clause_key(clause)
+                clause_mask = clause_masks.get(key)
+                if clause_mask is None:
+                    field, op, value = clause
+                    clause_mask = _clause_mask(columns[field], op, value)
+                    clause_masks[key] = clause_mask
+                mask = clause_mask if mask is None else [a and b for a, b in zip(mask, clause_mask)]
+            for row in compress(range(count), mask):
+                fired[row].append(rule.rule_id)
+        return fired
@@ -0,0 +1,106 @@
+"""Coalescing of identical scans.
+
+Several users (or a campaign) often submit the same site within minutes. Every
+submission still gets its own ``scan_jobs`` row, but the expensive part — the
+Playwright crawl — is shared by jobs with the same ``scan_key`` (normalised URL
+plus the parser options that change the output):
+
+- in flight: a job whose key is already being scanned in this worker process
+  waits for that scan instead of starting another one;
+- fresh: a job whose key was scanned (by any worker) less than ``ttl`` seconds
+  ago reuses that scan's ``site.json`` artifact.
+
+Freshness is the age of the crawl itself (``meta.generated_at`` in the site
+data), not of the job that returned it: a job that reused a result completes
+with the same key, so chained reuses would otherwise keep a crawl alive forever.
+"""
+
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from trust_wedo.utils.url import normalize_url
+
+SiteData = Dict[str, Any]
+FreshLookup = Callable[[str, float], Awaitable[Optional[SiteData]]]
+
+
+def scan_key(url: str, options: Optional[Dict[str, Any]] = None) -> str:
+    """Stable key for ``url`` scanned with ``options`` (trailing slash, tracking params... ignored)."""
+    payload = json.dumps([normalize_url(url), options or {}], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def crawl_age(site_data: SiteData) -> Optional[float]:
+    """Seconds since the site data was crawled (``meta.generated_at``), or None if unknown."""
+    generated_at = (site_data.get("meta") or {}).get("generated_at")
+    if not generated_at:
+        return None
+    try:
+        crawled = datetime.fromisoformat(generated_at.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if crawled.tzinfo is None:
+        crawled = crawled.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - crawled).total_seconds()
+
+
+class ScanCoalescer:
+    """Shares scan results between jobs with the same key.
+
+    Args:
+        lookup_fresh: Coroutine ``(key, max_age_seconds)`` returning the site data of
+            a recent completed scan with that key, or None
+        ttl: Maximum age in seconds of a reusable completed scan; 0 disables reuse
+    """
+
+    def __init__(self, lookup_fresh: Optional[FreshLookup] = None, ttl: float = 600.0):
+        self.lookup_fresh = lookup_fresh
+        self.ttl = ttl
+        self.stats = {"scanned": 0, "shared": 0, "reused": 0}
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    async def run(self, key: str, scan: Callable[[], Awaitable[SiteData]]) -> Tuple[SiteData, str]:
+        """Site data for ``key`` and where it came from: ``scanned``, ``shared`` or ``reused``."""
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.stats["shared"] += 1
+            return await asyncio.shield(task), "shared"
+
+        if self.lookup_fresh and self.ttl > 0:
+            try:
+                site_data = await self.lookup_fresh(key, self.ttl)
+            except Exception as e:
+                print(f"[WARN] Fresh scan lookup failed, scanning instead: {e}")
+                site_data = None
+            age = crawl_age(site_data) if site_data else None
+            if site_data and (age is None or age > self.ttl):
+                # A reused copy of an older crawl: crawl again
+                site_data = None
+            if site_data:
+                self.stats["reused"] += 1
+                return site_data, "reused"
+            # Another job may have started the same scan while we looked
+            task = self._in_flight.get(key)
+            if task is not None:
+                self.stats["shared"] += 1
+                return await asyncio.shield(task), "shared"
+
+        # The scan runs in its own task so followers keep it even if this job is cancelled
+        task = asyncio.create_task(scan())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._finished(key, done))
+        self.stats["scanned"] += 1
+        return await asyncio.shield(task), "scanned"
+
+    def _finished(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the error as retrieved when every waiting job was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._in_flight
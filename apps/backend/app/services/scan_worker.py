@@ -0,0 +1,132 @@
+"""Worker loop that drains the scan job queue.
+
+Each worker process runs one ``ScanWorker``: it claims up to ``concurrency``
+jobs at a time, keeps each lease alive with periodic heartbeats while the
+handler runs, and reports success or failure back to the queue (which decides
+whether a failed job is retried).
+"""
+
+import asyncio
+import os
+import socket
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from app.services.job_queue import JobQueue
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+class ScanWorker:
+    """Claims jobs from ``queue`` and runs ``handler(job)`` for each.
+
+    Args:
+        queue: JobQueue backend
+        handler: Coroutine returning the job result dict (stored on completion)
+        worker_id: Lease owner name; unique per process
+        concurrency: Maximum jobs processed at once by this worker
+        lease_seconds: Lease length granted on claim and on every heartbeat
+        heartbeat_seconds: Interval between heartbeats (well under lease_seconds)
+        poll_seconds: Sleep between claims when the queue is empty
+        progress_hub: Optional ``ProgressHub`` told when a job completes, fails or is requeued
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handler: JobHandler,
+        worker_id: Optional[str] = None,
+        concurrency: int = 2,
+        lease_seconds: int = 300,
+        heartbeat_seconds: int = 30,
+        poll_seconds: float = 2.0,
+        progress_hub: Optional[Any] = None
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.worker_id = worker_id or default_worker_id()
+        self.concurrency = max(1, concurrency)
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.poll_seconds = poll_seconds
+        self.progress_hub = progress_hub
+        self._active: Set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Stop claiming new jobs; ``run`` returns once active jobs finish."""
+        self._stopping.set()
+
+    async def run(self, max_jobs: Optional[int] = None) -> None:
+        """Claim and process jobs until ``stop()`` (or ``max_jobs`` claims, for tests)."""
+        print(f"[INFO] Scan worker {self.worker_id} started (concurrency={self.concurrency})")
+        claimed = 0
+        try:
+            while not self._stopping.is_set() and (max_jobs is None or claimed < max_jobs):
+                if len(self._active) >= self.concurrency:
+                    await asyncio.wait(self._active, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                try:
+                    job = await asyncio.to_thread(self.queue.claim, self.worker_id, self.lease_seconds)
+                except Exception as e:
+                    print(f"[WARN] Worker {self.worker_id} failed to claim a job: {e}")
+                    job = None
+
+                if not job:
+                    try:
+                        await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_seconds)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                claimed += 1
+                task = asyncio.create_task(self._process(job))
+                self._active.add(task)
+                task.add_done_callback(self._active.discard)
+        finally:
+            if self._active:
+                await asyncio.gather(*self._active, return_exceptions=True)
+            print(f"[INFO] Scan worker {self.worker_id} stopped")
+
+    async def _process(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        print(f"[INFO] Worker {self.worker_id} claimed job {job_id} (attempt {job.get('attempts')})")
+        job_task = asyncio.create_task(self.handler(job))
+        heartbeat_task = asyncio.create_task(self._heartbeat(job_id, job_task))
+        try:
+            result = await job_task
+        except asyncio.CancelledError:
+            # Lease lost: another worker owns the job now, so report nothing
+            print(f"[WARN] Worker {self.worker_id} lost the lease on job {job_id}, abandoning it")
+            return
+        except Exception as e:
+            retry = await asyncio.to_thread(self.queue.fail, job_id, self.worker_id, str(e))
+            print(f"[WARN] Job {job_id} failed ({e}); {'will retry' if retry else 'giving up'}")
+            if self.progress_hub:
+                self.progress_hub.status(job_id, "pending" if retry else "failed", str(e))
+            return
+        finally:
+            heartbeat_task.cancel()
+
+        await asyncio.to_thread(self.queue.complete, job_id, self.worker_id, result)
+        print(f"[INFO] Job {job_id} completed")
+        if self.progress_hub:
+            self.progress_hub.status(job_id, "completed")
+
+    async def _heartbeat(self, job_id: str, job_task: asyncio.Task) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                alive = await asyncio.to_thread(self.queue.heartbeat, job_id, self.worker_id, self.lease_seconds)
+            except Exception as e:
+                # Transient DB error: keep scanning, the lease has headroom
+                print(f"[WARN] Heartbeat failed for job {job_id}: {e}")
+                continue
+            if not alive:
+                job_task.cancel()
+                return
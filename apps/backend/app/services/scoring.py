@@ -1,6 +1,9 @@
-from app.models.signals import SiteSignals
+from app.models.signals import SignalRecord
 from typing import Dict, Any
 
+# 評分權重版本：調整權重時請一併更新，已快取的報告（report_cache 與 LRU）會因此重新產生
+SCORING_VERSION = "2.0"
+
 def score_to_grade(score: int) -> str:
     """
     評級標準 (配合 Scoring 2.0)
@@ -20,7 +23,7 @@ def score_to_grade(score: int) -> str:
         return 'D'
     return 'F'
 
-def calculate_score_v2(signals: SiteSignals) -> Dict[str, Any]:
+def calculate_score_v2(signals: SignalRecord) -> Dict[str, Any]:
     """
     新版評分系統 (2.0) - Scheme B Revised
     
@@ -199,8 +202,8 @@ def calculate_score_v2(signals: SiteSignals) -> Dict[str, Any]:
         }
     }
 
-def calculate_weighted_score(signals: SiteSignals) -> int:
+def calculate_weighted_score(signals: SignalRecord) -> int:
     return calculate_score_v2(signals)['score']
 
-def calculate_dimension_scores(signals: SiteSignals) -> Dict[str, Dict]:
+def calculate_dimension_scores(signals: SignalRecord) -> Dict[str, Dict]:
     return calculate_score_v2(signals)['dimensions']
@@ -1,7 +1,7 @@
-from app.models.signals import SiteSignals
+from app.models.signals import SignalRecord
 from typing import Tuple, List, Dict, Any
 
-def classify_site_type(signals: SiteSignals) -> Tuple[str, float]:
+def classify_site_type(signals: SignalRecord) -> Tuple[str, float]:
     """
     識別網站類型
     
@@ -30,7 +30,7 @@ def classify_site_type(signals: SiteSignals) -> Tuple[str, float]:
     # 未知類型
     return ('unknown', 0.5)
 
-def generate_custom_suggestions(signals: SiteSignals, site_type: str) -> List[Dict[str, Any]]:
+def generate_custom_suggestions(signals: SignalRecord, site_type: str) -> List[Dict[str, Any]]:
     """根據網站類型生成客製化建議"""
     
     suggestions = []
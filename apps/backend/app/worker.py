@@ -0,0 +1,63 @@
+"""Scan worker entrypoint: ``python -m app.worker``.
+
+Runs outside the API process; start as many as needed to scale scanning.
+"""
+
+import asyncio
+import signal
+from functools import partial
+from typing import Any
+
+from app.config import settings
+from app.core.browser import launch_shared_browser, close_shared_browser
+from app.services.job_queue import JobQueue, create_job_queue
+from app.services.scan_coalescer import ScanCoalescer
+from app.services.scan_worker import ScanWorker
+
+
+def build_worker(queue: JobQueue, browser: Any = None, context_pool: Any = None, progress_hub: Any = None) -> ScanWorker:
+    """ScanWorker that runs the scan pipeline on the shared browser.
+
+    ``progress_hub`` (embedded worker only) streams live progress to API viewers.
+    Jobs with the same ``scan_key`` share in-flight and recently completed scans.
+    """
+    from app.api.scans import find_fresh_scan, run_scan_pipeline
+
+    # Fresh-scan reuse and incremental baselines come from the queue backend (Supabase or SQLite)
+    coalescer = ScanCoalescer(partial(find_fresh_scan, queue), ttl=settings.SCAN_REUSE_TTL)
+
+    async def handle(job):
+        return await run_scan_pipeline(
+            job["id"], job["url"], browser, context_pool, progress_hub,
+            coalescer=coalescer, key=job.get("scan_key"), job_queue=queue
+        )
+
+    return ScanWorker(
+        queue,
+        handle,
+        concurrency=settings.WORKER_CONCURRENCY,
+        lease_seconds=settings.JOB_LEASE_SECONDS,
+        heartbeat_seconds=settings.JOB_HEARTBEAT_SECONDS,
+        progress_hub=progress_hub
+    )
+
+
+async def main() -> None:
+    print("[INFO] Starting Playwright browser for scan worker...")
+    playwright, browser, context_pool = await launch_shared_browser(settings.BROWSER_POOL_SIZE)
+    queue = create_job_queue(settings.JOB_QUEUE_BACKEND, settings.JOB_QUEUE_SQLITE_PATH, settings.JOB_MAX_ATTEMPTS)
+    worker = build_worker(queue, browser, context_pool)
+
+    # SIGTERM (redeploy): stop claiming, let active scans finish; unfinished leases expire and are re-claimed
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await close_shared_browser(playwright, browser, context_pool)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
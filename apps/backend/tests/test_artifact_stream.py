@@ -0,0 +1,88 @@
+import gzip
+import json
+from types import SimpleNamespace
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api import reports
+from app.repositories import InMemoryScanRepository
+from app.services.artifact_stream import choose_encoding, iter_page_json
+
+HEADERS = {"Authorization": "Bearer token-1", "Accept-Encoding": "identity"}
+PAGES = [
+    {"url": f"https://example.com/p{i}", "title_missing": False, "meta_missing": False, "schemas": [], "html_size": i}
+    for i in range(25)
+]
+
+
+def build_client():
+    repository = InMemoryScanRepository(
+        jobs=[{"id": "job-1", "org_id": "org-a", "url": "https://example.com", "status": "completed", "completed_at": "2026-10-18T00:00:00"}],
+        artifacts=[{"job_id": "job-1", "stage": "scan", "jsonb_payload": {"site": "https://example.com", "pages": PAGES}}],
+        memberships={"user-1": "org-a"},
+        users={"token-1": SimpleNamespace(id="user-1")}
+    )
+    app = FastAPI()
+    app.state.repository = repository
+    app.include_router(reports.router, prefix="/api/reports")
+    return TestClient(app)
+
+
+def test_report_no_longer_embeds_raw_artifacts():
+    reports.report_cache = reports.ReportCache()
+    body = build_client().get("/api/reports/job-1", headers=HEADERS).json()
+
+    assert "raw_artifacts" not in body
+    assert body["artifacts_url"] == "/api/reports/job-1/artifacts"
+
+
+def test_artifacts_are_paginated_and_projected():
+    client = build_client()
+
+    body = client.get("/api/reports/job-1/artifacts?page=2&page_size=10&fields=url,html_size", headers=HEADERS).json()
+
+    assert body["total_items"] == 25
+    assert body["page"] == 2
+    assert body["items"][0] == {"url": "https://example.com/p10", "html_size": 10}
+    assert len(body["items"]) == 10
+
+
+def test_artifacts_are_gzip_compressed_when_accepted():
+    client = build_client()
+
+    response = client.get(
+        "/api/reports/job-1/artifacts",
+        headers={"Authorization": "Bearer token-1", "Accept-Encoding": "gzip"}
+    )
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    # TestClient already decodes gzip transparently
+    assert len(response.json()["items"]) == 20
+
+
+def test_matching_etag_returns_304():
+    client = build_client()
+    etag = client.get("/api/reports/job-1/artifacts", headers=HEADERS).headers["etag"]
+
+    response = client.get("/api/reports/job-1/artifacts", headers={**HEADERS, "If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert client.get("/api/reports/job-1/artifacts?page=2", headers={**HEADERS, "If-None-Match": etag}).status_code == 200
+
+
+def test_streamed_json_is_valid_and_gzip_roundtrips():
+    from app.services.artifact_stream import compress_stream
+
+    chunks = list(iter_page_json({"page": 1}, PAGES, chunk_size=256))
+    assert len(chunks) > 1
+    assert json.loads(b"".join(chunks))["items"] == PAGES
+    assert json.loads(b"".join(iter_page_json({}, []))) == {"items": []}
+
+    compressed = b"".join(compress_stream(iter(chunks), "gzip"))
+    assert json.loads(gzip.decompress(compressed))["page"] == 1
+
+
+def test_choose_encoding_respects_quality_values():
+    assert choose_encoding("gzip;q=0, deflate") is None
+    assert choose_encoding("deflate, gzip;q=0.5") == "gzip"
+    assert choose_encoding(None) is None
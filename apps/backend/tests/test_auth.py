@@ -0,0 +1,125 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+from app.api import reports
+from app.core.token_verifier import InvalidToken, TokenVerifier
+from app.core.ttl_cache import TTLCache
+from app.repositories import InMemoryScanRepository
+
+SECRET = "test-jwt-secret"
+
+
+def make_repository():
+    return InMemoryScanRepository(
+        jobs=[
+            {"id": "job-1", "org_id": "org-a", "url": "https://example.com", "status": "completed"},
+            {"id": "job-2", "org_id": "org-b", "url": "https://other.com", "status": "completed"},
+        ],
+        artifacts=[{
+            "job_id": "job-1",
+            "stage": "scan",
+            "jsonb_payload": {"site": "https://example.com", "pages": [{"url": "https://example.com", "schemas": []}]}
+        }],
+        memberships={"user-1": "org-a"}
+    )
+
+
+def build_client(repository):
+    app = FastAPI()
+    app.state.repository = repository
+    app.include_router(reports.router, prefix="/api/reports")
+    return TestClient(app)
+
+
+def make_token(sub="user-1", expires_in=3600, secret=SECRET, **claims):
+    payload = {"sub": sub, "aud": "authenticated", "exp": int(time.time()) + expires_in, "email": "a@example.com", **claims}
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+def build_local_client(repository, ttl=60.0):
+    client = build_client(repository)
+    client.app.state.token_verifier = TokenVerifier(secret=SECRET)
+    client.app.state.membership_cache = TTLCache(ttl=ttl)
+    return client
+
+
+def test_valid_token_is_verified_without_auth_round_trip():
+    user = asyncio.run(TokenVerifier(secret=SECRET).verify(make_token()))
+
+    assert user.id == "user-1"
+    assert user.email == "a@example.com"
+
+
+def test_expired_or_forged_tokens_are_rejected():
+    verifier = TokenVerifier(secret=SECRET)
+
+    for token in (make_token(expires_in=-10), make_token(secret="other"), make_token(aud="anon"), "not-a-jwt"):
+        try:
+            asyncio.run(verifier.verify(token))
+        except InvalidToken:
+            continue
+        raise AssertionError(f"accepted {token!r}")
+
+
+def test_unknown_signing_key_falls_back_to_remote_auth():
+    fetches = []
+
+    async def fetch_jwks():
+        fetches.append(1)
+        return {"keys": []}
+
+    verifier = TokenVerifier(secret=None, jwks_url="http://auth/jwks", fetch_jwks=fetch_jwks)
+    rs_header_token = "eyJhbGciOiJSUzI1NiIsImtpZCI6Im5ldyJ9.e30.c2ln"
+
+    assert asyncio.run(verifier.verify(make_token())) is None  # HS token without a configured secret
+    assert asyncio.run(verifier.verify(rs_header_token)) is None
+    assert asyncio.run(verifier.verify(rs_header_token)) is None
+    # Unknown kids do not refetch the JWKS on every request
+    assert len(fetches) == 1
+
+
+def test_polling_skips_auth_and_membership_round_trips():
+    reports.report_cache = reports.ReportCache()
+    repository = make_repository()
+    client = build_local_client(repository)
+    headers = {"Authorization": f"Bearer {make_token()}"}
+
+    assert client.get("/api/reports/job-1", headers=headers).status_code == 200
+    trips = repository.round_trips
+    assert client.get("/api/reports/job-1", headers=headers).status_code == 200
+    # Token verified locally, membership cached, report served from the LRU
+    assert repository.round_trips == trips
+    assert client.get("/api/reports/job-2", headers=headers).status_code == 404
+
+
+def test_invalid_local_token_is_401_without_remote_call():
+    repository = make_repository()
+    client = build_local_client(repository)
+
+    response = client.get("/api/reports/job-1", headers={"Authorization": f"Bearer {make_token(expires_in=-10)}"})
+
+    assert response.status_code == 401
+    assert repository.round_trips == 0
+
+
+def test_membership_cache_expires():
+    now = [0.0]
+    cache = TTLCache(ttl=60, clock=lambda: now[0])
+    cache.set("user-1", None)
+    missing = object()
+
+    assert cache.get("user-1", missing) is None
+    now[0] = 61
+    assert cache.get("user-1", missing) is missing
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_remote_user_still_works_without_verifier():
+    repository = make_repository()
+    repository.users["token-2"] = SimpleNamespace(id="user-1")
+    client = build_client(repository)
+
+    assert client.get("/api/reports/job-1", headers={"Authorization": "Bearer token-2"}).status_code == 200
@@ -0,0 +1,52 @@
+import asyncio
+import json
+from app.repositories import InMemoryScanRepository
+from app.services.batch_scans import iter_batch_jsonl, summarize_batch
+from app.services.job_queue import SQLiteJobQueue
+
+
+def test_enqueue_many_creates_one_job_per_url_in_order():
+    queue = SQLiteJobQueue(":memory:")
+    items = [{"url": f"https://site{i}.example.com", "scan_key": f"k{i}"} for i in range(5)]
+
+    jobs = queue.enqueue_many(items, org_id="org-a", user_id="u1", batch_id="batch-1")
+
+    assert [job["batch_id"] for job in jobs] == ["batch-1"] * 5
+    assert [queue.claim("w1", 60)["url"] for _ in range(5)] == [item["url"] for item in items]
+
+
+def test_batch_jobs_are_scoped_to_the_org():
+    repository = InMemoryScanRepository(jobs=[
+        {"id": "j1", "org_id": "org-a", "batch_id": "b1", "url": "https://a.com", "created_at": "1"},
+        {"id": "j2", "org_id": "org-b", "batch_id": "b1", "url": "https://b.com", "created_at": "2"},
+    ])
+
+    assert [job["id"] for job in asyncio.run(repository.list_batch_jobs("b1", "org-a"))] == ["j1"]
+
+
+def test_summary_counts_and_throughput():
+    jobs = [
+        {"id": "j1", "url": "https://a.com", "status": "completed",
+         "started_at": "2026-10-18T10:00:00+00:00", "completed_at": "2026-10-18T10:01:00+00:00"},
+        {"id": "j2", "url": "https://b.com", "status": "failed",
+         "started_at": "2026-10-18T10:00:10+00:00", "completed_at": "2026-10-18T10:02:00Z"},
+        {"id": "j3", "url": "https://c.com", "status": "pending"},
+    ]
+
+    summary = summarize_batch("b1", jobs)
+
+    assert summary["counts"] == {"pending": 1, "processing": 0, "completed": 1, "failed": 1}
+    assert summary["done"] is False
+    assert summary["sites_per_min"] == 1.0
+
+
+def test_jsonl_export_has_one_record_per_site():
+    jobs = [
+        {"id": "j1", "url": "https://a.com", "status": "completed", "result": {"total_score": 72, "grade": "B"}},
+        {"id": "j2", "url": "https://b.com", "status": "failed", "error_message": "分析超時"},
+    ]
+
+    records = [json.loads(line) for line in iter_batch_jsonl(jobs)]
+
+    assert records[0] == {"job_id": "j1", "url": "https://a.com", "status": "completed", "total_score": 72, "grade": "B"}
+    assert records[1]["error"] == "分析超時"
@@ -0,0 +1,122 @@
+import itertools
+import json
+from click.testing import CliRunner
+from app.models.signals import SiteSignals
+from app.services import batch_scoring
+from app.services.batch_scoring import score_batch, score_table
+from app.services.scoring import calculate_score_v2
+from app.rescore import main as rescore_main, merge_result, rescore_artifacts, rescore_update, rules_changed, score_changed
+from app.services.report_engine import ReportEngine
+
+
+def corpus():
+    analyses = [{}, {"score": 22, "details": ["Organization 完整"]}, {"score": 12}]
+    combos = itertools.product([True, False], [True, False], [None, 1.2, 3.0, 6.5], [None, True, False], [0, 2], analyses)
+    return [
+        SiteSignals(
+            has_title=title, has_description=not title, has_favicon=flag, has_https=flag,
+            page_load_time=load_time, is_mobile_friendly=mobile, has_author=flag, has_contact=not flag,
+            social_links_count=social, has_jsonld=flag, schema_count=social, schema_analysis=analysis
+        )
+        for title, flag, load_time, mobile, social, analysis in combos
+    ]
+
+
+def scalar(signals):
+    result = calculate_score_v2(signals)
+    return result["score"], result["grade"], {key: (d["score"], d["percentage"]) for key, d in result["dimensions"].items()}
+
+
+def test_batch_matches_scalar_scoring():
+    signals = corpus()
+
+    results = score_batch(signals)
+
+    assert len(results) == len(signals)
+    for batch, single in zip(results, signals):
+        assert (batch["score"], batch["grade"], {k: (d["score"], d["percentage"]) for k, d in batch["dimensions"].items()}) == scalar(single)
+
+
+def test_table_accepts_dicts_and_matches_batch():
+    signals = corpus()
+
+    table = score_table([s.model_dump() for s in signals])
+
+    assert table["total"] == [r["total"] for r in score_batch(signals)]
+    assert table["grade"] == [r["grade"] for r in score_batch(signals)]
+
+
+def test_fallback_without_numpy(monkeypatch):
+    signals = corpus()[:10]
+    expected = score_batch(signals)
+
+    monkeypatch.setattr(batch_scoring, "NUMPY_AVAILABLE", False)
+
+    assert score_batch(signals) == expected
+    assert score_table(signals)["total"] == [r["total"] for r in expected]
+
+
+def test_rescore_merges_into_existing_result():
+    artifact = {"job_id": "job-1", "stage": "scan", "jsonb_payload": {"site": "https://example.com", "pages": [{"title_missing": False}]}}
+
+    scored = rescore_artifacts([artifact])[0]
+    merged = merge_result({"total_score": 1, "dimension_scores": {"trust": {"score": 0, "items": ["kept"]}}}, scored)
+
+    assert merged["total_score"] == scored["total_score"]
+    assert merged["dimension_scores"]["trust"]["score"] == scored["dimensions"]["trust"]
+    assert merged["dimension_scores"]["trust"]["items"] == ["kept"]
+
+
+def test_rescore_drops_persisted_report_bundle():
+    artifact = {"job_id": "job-1", "stage": "scan", "jsonb_payload": {"site": "https://example.com", "pages": [{"title_missing": False}]}}
+
+    update = rescore_update({"total_score": 1}, rescore_artifacts([artifact])[0])
+
+    assert update["report_cache"] is None
+    assert update["result"]["rescored_at"]
+
+
+def test_dimension_shift_with_same_total_counts_as_changed():
+    artifact = {"job_id": "job-1", "stage": "scan", "jsonb_payload": {"site": "https://example.com", "pages": [{"title_missing": False}]}}
+    scored = rescore_artifacts([artifact])[0]
+    current = merge_result({"dimension_scores": {key: {"score": 0} for key in scored["dimensions"]}}, scored)
+
+    assert not score_changed(current, scored)
+    # Points moved between two dimensions; total and grade unchanged
+    shifted = {key: dict(value) for key, value in current["dimension_scores"].items()}
+    first, second = list(shifted)[:2]
+    shifted[first]["score"] += 1
+    shifted[second]["score"] -= 1
+    assert score_changed({**current, "dimension_scores": shifted}, scored)
+
+
+def test_rescore_evaluates_rules_for_the_whole_batch():
+    pages = [[{"title_missing": False}], [{"title_missing": True, "has_favicon": True}], []]
+    artifacts = [
+        {"job_id": f"job-{i}", "stage": "scan", "jsonb_payload": {"site": "https://example.com", "pages": page}}
+        for i, page in enumerate(pages)
+    ]
+    engine = ReportEngine()
+
+    scored = rescore_artifacts(artifacts)
+
+    for score, artifact in zip(scored, artifacts):
+        report = engine.generate_report(engine.extract_signals([artifact]))
+        assert score["rules_fired"] == report["rules_fired"]
+        assert not rules_changed(report["rules_fired"], score)
+    assert rules_changed(scored[0]["rules_fired"] + ["retired_rule"], scored[0])
+    # No persisted report: nothing to invalidate
+    assert not rules_changed(None, scored[0])
+
+
+def test_rescore_cli_reads_local_scans(tmp_path):
+    for job_id in ("job-a", "job-b"):
+        (tmp_path / job_id).mkdir()
+        (tmp_path / job_id / "site.json").write_text(json.dumps({"site": "https://example.com", "pages": [{"title_missing": False}]}))
+    out = tmp_path / "scores.jsonl"
+
+    result = CliRunner().invoke(rescore_main, ["--from-dir", str(tmp_path), "--batch-size", "1", "-o", str(out)])
+
+    assert result.exit_code == 0, result.output
+    lines = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [line["job_id"] for line in lines] == ["job-a", "job-b"]
@@ -0,0 +1,89 @@
+import asyncio
+from app.services.job_queue import SQLiteJobQueue
+from app.services.scan_worker import ScanWorker
+
+
+def test_claim_leases_oldest_pending_job_once():
+    queue = SQLiteJobQueue(":memory:")
+    first = queue.enqueue("https://a.example.com")
+    queue.enqueue("https://b.example.com")
+
+    job = queue.claim("w1", lease_seconds=60)
+    assert job["id"] == first["id"]
+    assert job["status"] == "processing"
+    assert job["attempts"] == 1
+    assert queue.claim("w2", lease_seconds=60)["url"] == "https://b.example.com"
+    assert queue.claim("w3", lease_seconds=60) is None
+
+
+def test_expired_lease_is_reclaimed_and_old_owner_loses_it():
+    queue = SQLiteJobQueue(":memory:")
+    job = queue.enqueue("https://a.example.com")
+    queue.claim("w1", lease_seconds=-1)
+
+    reclaimed = queue.claim("w2", lease_seconds=60)
+    assert reclaimed["id"] == job["id"]
+    assert reclaimed["attempts"] == 2
+    assert queue.heartbeat(job["id"], "w1", 60) is False
+    assert queue.heartbeat(job["id"], "w2", 60) is True
+
+
+def test_fail_retries_until_max_attempts():
+    queue = SQLiteJobQueue(":memory:", max_attempts=2)
+    job = queue.enqueue("https://a.example.com")
+
+    queue.claim("w1", 60)
+    assert queue.fail(job["id"], "w1", "boom") is True
+    assert queue.get(job["id"])["status"] == "pending"
+
+    queue.claim("w1", 60)
+    assert queue.fail(job["id"], "w1", "boom again") is False
+    failed = queue.get(job["id"])
+    assert failed["status"] == "failed"
+    assert failed["error_message"] == "boom again"
+    assert queue.claim("w1", 60) is None
+
+
+def test_find_latest_scan_returns_newest_completed_job_with_key():
+    queue = SQLiteJobQueue(":memory:")
+    old = queue.enqueue("https://a.example.com", scan_key="k1")
+    new = queue.enqueue("https://a.example.com/", scan_key="k1")
+    queue.enqueue("https://b.example.com", scan_key="k2")
+    for job in (old, new):
+        queue.claim("w1", 60)
+        queue.complete(job["id"], "w1", {"total_score": 50})
+    # Still running: never a reuse candidate
+    queue.enqueue("https://a.example.com", scan_key="k1")
+    queue.claim("w1", 60)
+
+    assert queue.find_latest_scan("k1")["id"] == new["id"]
+    assert queue.find_latest_scan("k1", max_age=60)["id"] == new["id"]
+    assert queue.find_latest_scan("k1", max_age=-1) is None
+    assert queue.find_latest_scan("k2") is None
+
+
+def test_worker_processes_jobs_with_bounded_concurrency():
+    queue = SQLiteJobQueue(":memory:", max_attempts=2)
+    jobs = [queue.enqueue(f"https://site{i}.example.com") for i in range(4)]
+    active = 0
+    peak = 0
+    calls = {}
+
+    async def handler(job):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.02)
+        active -= 1
+        calls[job["url"]] = calls.get(job["url"], 0) + 1
+        if job["url"] == "https://site0.example.com" and calls[job["url"]] == 1:
+            raise RuntimeError("transient")
+        return {"total_score": 80}
+
+    worker = ScanWorker(queue, handler, worker_id="w1", concurrency=2, heartbeat_seconds=0.005, poll_seconds=0.01)
+    asyncio.run(worker.run(max_jobs=5))
+
+    assert peak == 2
+    assert all(queue.get(job["id"])["status"] == "completed" for job in jobs)
+    assert queue.get(jobs[0]["id"])["attempts"] == 2
+    assert queue.get(jobs[1]["id"])["result"] == {"total_score": 80}
@@ -0,0 +1,90 @@
+import asyncio
+import pytest
+from app.services.pdf_renderer import PdfRenderService, RenderQueueFull
+
+
+class FakeRenderer:
+    def __init__(self):
+        self.calls = []
+        self.release = None
+
+    async def __call__(self, job_id):
+        self.calls.append(job_id)
+        if self.release:
+            await self.release.wait()
+        return f"%PDF {job_id}".encode()
+
+
+def test_render_is_cached_per_job_and_version():
+    async def scenario():
+        render = FakeRenderer()
+        service = PdfRenderService(render)
+        first = await service.get("job-1", "r1")
+        again = await service.get("job-1", "r1")
+        bumped = await service.get("job-1", "r2")
+        return render, first, again, bumped
+
+    render, first, again, bumped = asyncio.run(scenario())
+
+    assert first == again == bumped == b"%PDF job-1"
+    assert render.calls == ["job-1", "job-1"]
+
+
+def test_saturated_renderer_queues_then_rejects():
+    async def scenario():
+        render = FakeRenderer()
+        render.release = asyncio.Event()
+        service = PdfRenderService(render, max_concurrency=1, max_queue=1, wait_timeout=5)
+
+        running = asyncio.create_task(service.get("job-1", "r1"))
+        await asyncio.sleep(0)
+        queued = await service.get("job-2", "r1")
+        with pytest.raises(RenderQueueFull):
+            await service.get("job-3", "r1")
+
+        render.release.set()
+        first = await running
+        await asyncio.sleep(0.01)
+        polled = await service.get("job-2", "r1")
+        return queued, first, polled, render.calls
+
+    queued, first, polled, calls = asyncio.run(scenario())
+
+    assert queued is None
+    assert first == b"%PDF job-1"
+    assert polled == b"%PDF job-2"
+    assert calls == ["job-1", "job-2"]
+
+
+def test_concurrent_requests_share_one_render():
+    async def scenario():
+        render = FakeRenderer()
+        service = PdfRenderService(render, max_concurrency=2)
+        results = await asyncio.gather(*(service.get("job-1", "r1") for _ in range(3)))
+        return render.calls, results
+
+    calls, results = asyncio.run(scenario())
+
+    assert calls == ["job-1"]
+    assert results == [b"%PDF job-1"] * 3
+
+
+def test_failed_render_is_reported_and_retried():
+    async def scenario():
+        attempts = []
+
+        async def flaky(job_id):
+            attempts.append(job_id)
+            if len(attempts) == 1:
+                raise RuntimeError("page crashed")
+            return b"%PDF ok"
+
+        service = PdfRenderService(flaky)
+        with pytest.raises(RuntimeError):
+            await service.get("job-1", "r1")
+        return await service.get("job-1", "r1"), attempts
+
+    pdf, attempts = asyncio.run(scenario())
+
+    assert pdf == b"%PDF ok"
+    assert len(attempts) == 2
@@ -0,0 +1,165 @@
+import asyncio
+import json
+from app.services.progress_hub import ProgressHub, job_event_stream, parse_progress_stage
+from app.services.progress_listener import listen_dsn, relay_notification
+from app.services.progress_reporter import ProgressReporter
+
+
+def parse(chunk):
+    lines = chunk.strip().split("\n")
+    return lines[0].removeprefix("event: "), json.loads(lines[1].removeprefix("data: "))
+
+
+def test_events_fan_out_to_every_viewer_without_db_writes():
+    hub = ProgressHub()
+    written = []
+
+    async def run():
+        reporter = ProgressReporter(written.append, min_interval=60, publish=lambda *args: hub.progress("job-1", *args))
+        with hub.subscribe("job-1") as first, hub.subscribe("job-1") as second:
+            for i in range(5):
+                await reporter.update(10 + i, f"page {i}", f"https://example.com/p{i}")
+            return [first.get_nowait() for _ in range(5)], second.qsize()
+
+    events, second_size = asyncio.run(run())
+
+    assert events[-1] == {"type": "progress", "percent": 14, "stage": "page 4", "page_url": "https://example.com/p4"}
+    assert second_size == 5
+    # The database still gets the throttled latest-wins writes only
+    assert len(written) == 1
+    assert hub.subscriber_count("job-1") == 0
+
+
+def test_slow_viewer_keeps_only_latest_events():
+    hub = ProgressHub(queue_size=2)
+
+    async def run():
+        with hub.subscribe("job-1") as queue:
+            for percent in range(5):
+                hub.progress("job-1", percent, "scanning")
+            return [queue.get_nowait()["percent"] for _ in range(queue.qsize())]
+
+    assert asyncio.run(run()) == [3, 4]
+
+
+def test_stream_starts_with_current_state_and_ends_on_completion():
+    hub = ProgressHub()
+    hub.progress("job-1", 40, "正在掃描頁面 (3/10)...", "https://example.com/a")
+
+    async def reload_job():
+        raise AssertionError("live scans must not hit the database")
+
+    async def run():
+        chunks = []
+        stream = job_event_stream(hub, {"id": "job-1", "status": "processing"}, reload_job, keepalive=1)
+        async for chunk in stream:
+            chunks.append(chunk)
+            if len(chunks) == 1:
+                hub.progress("job-1", 90, "正在計算網站成信度分數...")
+                hub.status("job-1", "completed")
+        return chunks
+
+    chunks = [parse(chunk) for chunk in asyncio.run(run())]
+
+    assert chunks[0] == ("progress", {"percent": 40, "stage": "正在掃描頁面 (3/10)...", "page_url": "https://example.com/a"})
+    assert chunks[1][1]["percent"] == 90
+    assert chunks[-1] == ("status", {"status": "completed"})
+
+
+def test_stream_polls_job_when_scan_runs_in_another_process():
+    hub = ProgressHub()
+    reloads = []
+
+    async def reload_job():
+        reloads.append(1)
+        if len(reloads) == 1:
+            return {"id": "job-1", "status": "processing", "progress_stage": "[50%] 正在掃描頁面 (5/10)..."}
+        return {"id": "job-1", "status": "failed"}
+
+    async def run():
+        job = {"id": "job-1", "status": "pending", "progress_stage": "排隊中"}
+        return [chunk async for chunk in job_event_stream(hub, job, reload_job, keepalive=0.01)]
+
+    chunks = [parse(chunk) for chunk in asyncio.run(run())]
+
+    assert chunks[0][1]["percent"] == 0
+    assert chunks[1][1]["percent"] == 50
+    assert chunks[-1] == ("status", {"status": "failed"})
+
+
+def test_notifications_from_external_workers_reach_viewers_without_polling():
+    hub = ProgressHub()
+    hub.remote_feed = True
+    reloads = []
+
+    async def reload_job():
+        reloads.append(1)
+        return {"id": "job-1", "status": "processing"}
+
+    async def run():
+        chunks = []
+        job = {"id": "job-1", "status": "processing", "progress_stage": "[10%] 正在讀取 sitemap..."}
+        async for chunk in job_event_stream(hub, job, reload_job, keepalive=0.01, remote_reload_every=1000):
+            chunks.append(chunk)
+            if len(chunks) == 1:
+                await asyncio.sleep(0.05)
+                relay_notification(hub, json.dumps({"id": "job-1", "status": "processing", "progress_stage": "[60%] 正在掃描頁面 (6/10)..."}))
+                relay_notification(hub, json.dumps({"id": "job-1", "status": "failed", "error_message": "timeout"}))
+        return chunks
+
+    chunks = [parse(chunk) for chunk in asyncio.run(run()) if not chunk.startswith(":")]
+
+    assert reloads == []
+    assert chunks[1][1]["percent"] == 60
+    assert chunks[-1] == ("status", {"status": "failed", "error": "timeout"})
+    assert not hub.is_live("job-1")
+
+
+def test_remote_feed_still_rechecks_the_job_occasionally():
+    hub = ProgressHub()
+    hub.remote_feed = True
+
+    async def reload_job():
+        return {"id": "job-1", "status": "completed"}
+
+    async def run():
+        job = {"id": "job-1", "status": "processing"}
+        return [chunk async for chunk in job_event_stream(hub, job, reload_job, keepalive=0.01, remote_reload_every=3)]
+
+    chunks = asyncio.run(run())
+
+    assert chunks.count(": keepalive\n\n") == 2
+    assert parse(chunks[-1]) == ("status", {"status": "completed"})
+
+
+def test_stream_ends_when_job_finished_before_subscribing():
+    hub = ProgressHub()
+    hub.status("job-1", "completed")
+
+    async def run():
+        job = {"id": "job-1", "status": "processing"}
+        return [chunk async for chunk in job_event_stream(hub, job, None)]
+
+    assert [parse(chunk) for chunk in asyncio.run(run())] == [("status", {"status": "completed"})]
+
+
+def test_notification_helpers():
+    assert listen_dsn("postgresql+psycopg2://u:p@db:5432/app") == "postgresql://u:p@db:5432/app"
+    assert listen_dsn("postgres://u:p@db/app") == "postgresql://u:p@db/app"
+    hub = ProgressHub()
+    relay_notification(hub, "not json")
+    relay_notification(hub, json.dumps({"status": "processing"}))
+    assert hub.published == 0
+
+
+def test_finished_job_gets_a_single_status_event():
+    async def run():
+        job = {"id": "job-1", "status": "completed"}
+        return [chunk async for chunk in job_event_stream(ProgressHub(), job, None)]
+
+    assert [parse(chunk) for chunk in asyncio.run(run())] == [("status", {"status": "completed"})]
+
+
+def test_parse_progress_stage():
+    assert parse_progress_stage("[45%] 正在掃描頁面")["percent"] == 45
+    assert parse_progress_stage(None) == {"type": "progress", "percent": 0, "stage": "", "page_url": None}
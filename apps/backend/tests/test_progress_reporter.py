@@ -0,0 +1,35 @@
+import asyncio
+from app.services.progress_reporter import ProgressReporter
+
+
+def test_coalesces_updates_and_flushes_latest_stage():
+    written = []
+
+    async def run():
+        reporter = ProgressReporter(written.append, min_interval=0.05)
+        for i in range(20):
+            await reporter.update(10 + i, f"page {i}")
+        await asyncio.sleep(0.08)
+        await reporter.update(95, "report")
+        await reporter.flush()
+        return reporter
+
+    reporter = asyncio.run(run())
+
+    assert written[0] == "[10%] page 0"
+    assert "[29%] page 19" in written
+    assert written[-1] == "[95%] report"
+    assert reporter.writes == len(written) <= 4
+
+
+def test_write_errors_do_not_break_the_scan():
+    def broken(stage):
+        raise RuntimeError("db down")
+
+    async def run():
+        reporter = ProgressReporter(broken, min_interval=0)
+        await reporter.update(50, "halfway")
+        await reporter.flush()
+        return reporter
+
+    assert asyncio.run(run()).writes == 0
@@ -0,0 +1,64 @@
+import asyncio
+from contextlib import asynccontextmanager
+from app.services.report_cache import build_report_bundle
+from app.services.report_html import render_report_html, trust_gaps
+from app.services.report_pdf import render_native_pdf_with_pool
+
+ARTIFACTS = [{
+    "job_id": "job-12345678-abcd",
+    "stage": "scan",
+    "jsonb_payload": {
+        "site": "https://example.com",
+        "pages": [{"url": "https://example.com", "title_missing": False, "meta_missing": True, "schemas": []}]
+    }
+}]
+
+
+def make_bundle():
+    return build_report_bundle({"id": "job-12345678-abcd", "url": "https://example.com/?a=<b>", "status": "completed"}, ARTIFACTS)
+
+
+def test_html_contains_every_report_section():
+    bundle = make_bundle()
+
+    html = render_report_html(bundle["report"], bundle["pdf"], scan_date="2026/10/18")
+
+    assert html.count('class="dimension-row"') == len(bundle["pdf"]["dimensions"])
+    assert html.count('class="quick-win-item"') == min(3, len(bundle["pdf"]["quick_wins"]))
+    assert f'<div class="score-value">{bundle["pdf"]["total_score"]}</div>' in html
+    assert "掃描編號: job-1234" in html
+    assert "2026/10/18" in html
+    # Values are escaped, never injected as markup
+    assert "https://example.com/?a=&lt;b&gt;" in html
+    assert "<b>" not in html
+
+
+def test_trust_gaps_follow_frontend_rules():
+    assert trust_gaps({"has_title": True, "has_description": True, "has_jsonld": True, "has_author": True, "social_links_count": 3}) == []
+    assert trust_gaps({}) == ['缺少網站標題', '缺少網站描述', '缺少結構化資料', '缺少作者/組織資訊', '社群證明不足']
+
+
+class FakePage:
+    def __init__(self):
+        self.content = None
+
+    async def set_content(self, html, **kwargs):
+        self.content = html
+
+    async def pdf(self, **options):
+        assert options["format"] == "A4"
+        return b"%PDF-1.4 not really"
+
+
+def test_native_render_prints_template_without_navigation():
+    page = FakePage()
+
+    class Pool:
+        @asynccontextmanager
+        async def lease(self):
+            yield page
+
+    pdf = asyncio.run(render_native_pdf_with_pool(Pool(), "job-12345678-abcd", make_bundle()))
+
+    assert pdf.startswith(b"%PDF")
+    assert 'class="pdf-report"' in page.content
@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api import reports
+from app.repositories import InMemoryScanRepository
+from app.services.report_cache import BUNDLE_VERSION
+
+ARTIFACT = {
+    "job_id": "job-1",
+    "stage": "scan",
+    "jsonb_payload": {
+        "site": "https://example.com",
+        "pages": [{"url": "https://example.com", "title_missing": False, "meta_missing": False, "schemas": []}]
+    }
+}
+
+
+def build_client(repository):
+    app = FastAPI()
+    app.state.repository = repository
+    app.include_router(reports.router, prefix="/api/reports")
+    return TestClient(app)
+
+
+def make_repository():
+    return InMemoryScanRepository(
+        jobs=[
+            {"id": "job-1", "org_id": "org-a", "url": "https://example.com", "status": "completed"},
+            {"id": "job-2", "org_id": "org-b", "url": "https://other.com", "status": "completed"},
+        ],
+        artifacts=[ARTIFACT],
+        memberships={"user-1": "org-a"},
+        users={"token-1": SimpleNamespace(id="user-1")}
+    )
+
+
+def test_report_loads_job_and_artifacts_in_one_round_trip():
+    reports.report_cache = reports.ReportCache()
+    repository = make_repository()
+    client = build_client(repository)
+
+    response = client.get("/api/reports/job-1", headers={"Authorization": "Bearer token-1"})
+
+    assert response.status_code == 200
+    assert response.json()["url"] == "https://example.com"
+    # user lookup + org lookup + one job/artifacts fetch + persisting the materialised report
+    assert repository.round_trips == 4
+
+
+def test_report_is_scoped_to_the_users_org():
+    client = build_client(make_repository())
+
+    assert client.get("/api/reports/job-2", headers={"Authorization": "Bearer token-1"}).status_code == 404
+    assert client.get("/api/reports/job-1", headers={"Authorization": "Bearer bad"}).status_code == 401
+
+
+def test_report_bundle_is_persisted_then_served_from_lru():
+    reports.report_cache = reports.ReportCache()
+    repository = make_repository()
+    client = build_client(repository)
+    headers = {"Authorization": "Bearer token-1"}
+
+    first = client.get("/api/reports/job-1/dimensions", headers=headers).json()
+    assert repository.jobs["job-1"]["report_cache"]["version"] == BUNDLE_VERSION
+    trips = repository.round_trips
+
+    again = client.get("/api/reports/job-1", headers=headers)
+    assert again.status_code == 200
+    assert client.get("/api/reports/job-1/dimensions", headers=headers).json() == first
+    # Only auth lookups after the first request: the report itself came from the LRU
+    assert repository.round_trips - trips == 4
+    assert reports.report_cache.hits == 2
+
+
+def test_stale_engine_version_is_rebuilt():
+    reports.report_cache = reports.ReportCache()
+    repository = make_repository()
+    repository.jobs["job-1"]["report_cache"] = {"version": "r0.1", "dimensions": {"stale": True}}
+    client = build_client(repository)
+
+    body = client.get("/api/reports/job-1/dimensions", headers={"Authorization": "Bearer token-1"}).json()
+
+    assert "stale" not in body
+    assert repository.jobs["job-1"]["report_cache"]["version"] == BUNDLE_VERSION
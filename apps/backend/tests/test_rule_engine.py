@@ -0,0 +1,92 @@
+import json
+import pytest
+from app.models.signals import SiteSignals
+from app.services import report_cache
+from app.services.report_engine import ReportEngine
+from app.services.rule_engine import RuleEngine
+
+RULES = [
+    {"rule_id": "X1", "when": [["has_title", "is_false"]]},
+    {"rule_id": "X2", "when": [["has_jsonld", "is_true"], ["schema_count", "lt", 2]]},
+    {"rule_id": "X3", "when": [["schema_types", "not_contains", "Organization"]]},
+]
+
+
+def test_default_rules_are_compiled_once_and_shared():
+    first, second = ReportEngine(), ReportEngine()
+
+    assert first.rule_engine is second.rule_engine
+    assert [rule.rule_id for rule in first.rules] == ["R001", "R002", "R003", "R004", "R005", "R006", "R007"]
+    fired = first.generate_report(SiteSignals(has_title=True, has_https=True))["rules_fired"]
+    assert fired == ["R002", "R003", "R004", "R006", "R007"]
+
+
+def test_rules_are_indexed_by_signal_field():
+    engine = RuleEngine(RULES)
+
+    assert engine.fields == {"has_title", "has_jsonld", "schema_count", "schema_types"}
+    assert engine.rules_for_fields(["schema_count"]) == [1]
+    assert [rule.rule_id for rule in engine.evaluate(SiteSignals(has_jsonld=True, schema_count=1))] == ["X1", "X2", "X3"]
+
+
+def test_incremental_evaluation_only_touches_changed_fields():
+    engine = RuleEngine(RULES)
+    previous = SiteSignals(has_title=False, schema_types=["Organization"])
+    current = SiteSignals(has_title=True, schema_types=["Organization"])
+
+    assert engine.changed_fields(current, previous) == ["has_title"]
+    # X2 is carried over from the previous result because none of its inputs changed
+    fired = engine.evaluate_incremental(current, previous, ["X1", "X2"], engine.fingerprint)
+    assert [rule.rule_id for rule in fired] == ["X2"]
+
+
+def test_incremental_evaluation_reevaluates_after_rule_set_change():
+    previous = SiteSignals(has_title=False, schema_types=["Organization"])
+    current = SiteSignals(has_title=True, schema_types=["Organization"])
+    old_engine = RuleEngine(RULES[:1])
+    report = ReportEngine(old_engine).generate_report(previous)
+
+    # X2-X4 were added since the previous report: X4 fires although its input did not change
+    engine = RuleEngine(RULES + [{"rule_id": "X4", "when": [["has_jsonld", "is_false"]]}])
+    assert engine.fingerprint != report["rules_fingerprint"]
+    fired = engine.evaluate_incremental(current, previous, report["rules_fired"], report["rules_fingerprint"])
+    assert [rule.rule_id for rule in fired] == ["X4"]
+    assert fired == engine.evaluate(current)
+
+
+def test_batch_matches_single_evaluation():
+    engine = ReportEngine().rule_engine
+    batch = [
+        SiteSignals(has_title=bool(i & 1), has_description=bool(i & 2), has_https=bool(i & 4), has_social_proof=bool(i & 8))
+        for i in range(16)
+    ]
+
+    expected = [[rule.rule_id for rule in engine.evaluate(signals)] for signals in batch]
+    assert engine.evaluate_batch(batch) == expected
+    assert engine.evaluate_batch([signals.model_dump() for signals in batch]) == expected
+
+
+def test_report_bundle_reuses_previous_report_for_same_scan(monkeypatch):
+    job = {"id": "job-2", "url": "https://example.com", "status": "completed"}
+    artifact = {"stage": "scan", "jsonb_payload": {"site": "https://example.com", "pages": [{"title_missing": False}]}}
+    previous = report_cache.build_report_bundle({**job, "id": "job-1"}, [artifact])["report"]
+
+    def full_evaluation(signals):
+        raise AssertionError("unchanged signals must not re-evaluate every rule")
+
+    monkeypatch.setattr(report_cache.engine.rule_engine, "evaluate", full_evaluation)
+    report = report_cache.build_report_bundle(job, [artifact], previous)["report"]
+
+    assert report["rules_fired"] == previous["rules_fired"]
+    assert report["issues"] == previous["issues"]
+
+
+def test_invalid_rules_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        RuleEngine([{"rule_id": "B1", "when": [["no_such_field", "is_false"]]}])
+    with pytest.raises(ValueError):
+        RuleEngine([{"rule_id": "B2", "when": [["schema_count", "lt"]]}])
+
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(RULES), encoding="utf-8")
+    assert len(RuleEngine.from_file(str(path)).rules) == 3
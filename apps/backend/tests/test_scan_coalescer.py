@@ -0,0 +1,113 @@
+import asyncio
+from datetime import datetime, timedelta
+from app.services.job_queue import SQLiteJobQueue
+from app.services.scan_coalescer import ScanCoalescer, scan_key
+
+
+def crawled_at(seconds_ago):
+    return (datetime.utcnow() - timedelta(seconds=seconds_ago)).isoformat() + "Z"
+
+
+def test_scan_key_ignores_cosmetic_url_differences_but_not_options():
+    options = {"max_pages": 10, "fetch_mode": "playwright"}
+
+    assert scan_key("https://Example.com/?utm_source=ad", options) == scan_key("https://example.com", options)
+    assert scan_key("https://example.com", options) != scan_key("https://example.com", {**options, "max_pages": 5})
+    assert scan_key("https://example.com", options) != scan_key("https://example.org", options)
+
+
+def test_concurrent_identical_jobs_share_one_scan():
+    scans = []
+
+    async def scan():
+        scans.append(1)
+        await asyncio.sleep(0.02)
+        return {"site": "https://example.com", "pages": []}
+
+    async def run():
+        coalescer = ScanCoalescer()
+        results = await asyncio.gather(*(coalescer.run("key", scan) for _ in range(3)))
+        return coalescer, results
+
+    coalescer, results = asyncio.run(run())
+
+    assert len(scans) == 1
+    assert sorted(source for _, source in results) == ["scanned", "shared", "shared"]
+    assert all(site_data is results[0][0] for site_data, _ in results)
+    assert not coalescer.in_flight("key")
+
+
+def test_fresh_completed_scan_is_reused_within_ttl():
+    lookups = []
+
+    async def lookup_fresh(key, max_age):
+        lookups.append((key, max_age))
+        site_data = {"site": "https://example.com", "pages": [{"url": "https://example.com"}], "meta": {"generated_at": crawled_at(60)}}
+        return site_data if key == "fresh" else None
+
+    async def scan():
+        return {"site": "https://example.com", "pages": []}
+
+    async def run():
+        coalescer = ScanCoalescer(lookup_fresh, ttl=300)
+        return await coalescer.run("fresh", scan), await coalescer.run("stale", scan), coalescer
+
+    reused, scanned, coalescer = asyncio.run(run())
+
+    assert reused[1] == "reused" and reused[0]["pages"]
+    assert scanned[1] == "scanned"
+    assert lookups == [("fresh", 300), ("stale", 300)]
+    assert coalescer.stats == {"scanned": 1, "shared": 0, "reused": 1}
+
+
+def test_chained_reuse_does_not_extend_crawl_age():
+    # A crawled at T, B reused it at T+5min and completed: B is the latest job, but the data is A's crawl
+    latest = {"site": "https://example.com", "pages": [], "meta": {"generated_at": crawled_at(400)}}
+    scans = []
+
+    async def lookup_fresh(key, max_age):
+        return latest
+
+    async def scan():
+        scans.append(1)
+        return {"site": "https://example.com", "pages": [], "meta": {"generated_at": crawled_at(0)}}
+
+    async def run():
+        coalescer = ScanCoalescer(lookup_fresh, ttl=300)
+        return await coalescer.run("key", scan)
+
+    site_data, source = asyncio.run(run())
+
+    assert source == "scanned" and scans == [1]
+    assert site_data is not latest
+
+
+def test_failed_scan_fails_every_waiting_job_and_is_not_cached():
+    attempts = []
+
+    async def scan():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("timeout")
+
+    async def run():
+        coalescer = ScanCoalescer()
+        results = await asyncio.gather(coalescer.run("key", scan), coalescer.run("key", scan), return_exceptions=True)
+        retry = await asyncio.gather(coalescer.run("key", scan), return_exceptions=True)
+        return results + retry
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(attempts) == 2
+
+
+def test_every_submission_keeps_its_own_job_row():
+    queue = SQLiteJobQueue(":memory:")
+    key = scan_key("https://example.com", {"max_pages": 10})
+
+    first = queue.enqueue("https://example.com", org_id="org-a", user_id="u1", scan_key=key)
+    second = queue.enqueue("https://example.com/", org_id="org-b", user_id="u2", scan_key=key)
+
+    assert first["id"] != second["id"]
+    assert first["scan_key"] == second["scan_key"] == key
@@ -0,0 +1,38 @@
+import pytest
+from app.models.signals import SignalRecord, SiteSignals
+from app.services.report_engine import ReportEngine
+
+
+def test_record_matches_pydantic_defaults_and_dump():
+    record = SignalRecord(has_title=True, schema_types=["Organization"])
+
+    assert record.to_dict() == SiteSignals(has_title=True, schema_types=["Organization"]).model_dump()
+    assert not hasattr(record, "__dict__")
+
+
+def test_mutable_defaults_are_not_shared():
+    first, second = SignalRecord(), SignalRecord()
+
+    first.schema_types.append("Person")
+
+    assert second.schema_types == []
+
+
+def test_coerce_accepts_models_dicts_and_records():
+    record = SignalRecord(has_https=True)
+
+    assert SignalRecord.coerce(record) is record
+    assert SignalRecord.coerce(SiteSignals(has_https=True)) == record
+    assert SignalRecord.coerce({"has_https": True, "extra": 1}) == record
+    with pytest.raises(TypeError):
+        SignalRecord(no_such_signal=True)
+
+
+def test_engine_uses_records_internally_and_accepts_models():
+    engine = ReportEngine()
+    artifacts = [{"stage": "scan", "jsonb_payload": {"site": "https://example.com", "pages": [{"title_missing": False}]}}]
+
+    signals = engine.extract_signals(artifacts)
+
+    assert isinstance(signals, SignalRecord)
+    assert engine.generate_report(signals) == engine.generate_report(SiteSignals(**signals.to_dict()))
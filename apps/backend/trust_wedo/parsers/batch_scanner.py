@@ -0,0 +1,236 @@
+"""Batch (portfolio) scanning for Trust WEDO.
+
+Scans many sites through one shared HTTP client, one browser with a bounded
+context pool and one ``HostScheduler``:
+
+- ``site_concurrency`` caps how many sites are scanned at once (global limit);
+- ``per_host`` caps how many of them may share a host, and the shared
+  scheduler rate-limits requests per host across the whole batch;
+- results are appended to a JSONL file as each site finishes, so an
+  interrupted batch resumes by skipping URLs that already have a result.
+"""
+
+import asyncio
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Optional, Set, Union
+
+import httpx
+
+from trust_wedo.parsers.host_scheduler import HostScheduler
+from trust_wedo.parsers.http_cache import HttpCache
+from trust_wedo.parsers.site_parser import DEFAULT_HEADERS, PLAYWRIGHT_AVAILABLE, SiteParser
+from trust_wedo.utils.url import normalize_url
+
+
+def read_urls(lines: Iterable[str]) -> Iterator[str]:
+    """URLs from a text file: one per line, blank lines and ``#`` comments skipped.
+
+    Bare domains get ``https://``; duplicates (after normalisation) are dropped,
+    and malformed URLs (bad port, unclosed IPv6 literal...) are skipped with a warning.
+    """
+    seen: Set[str] = set()
+    for line in lines:
+        url = line.split("#", 1)[0].strip()
+        if not url:
+            continue
+        if "://" not in url:
+            url = f"https://{url}"
+        try:
+            key = normalize_url(url)
+        except ValueError:
+            print(f"[WARN] Skipping invalid URL: {url}")
+            continue
+        if key not in seen:
+            seen.add(key)
+            yield url
+
+
+def completed_urls(jsonl_path: Union[str, Path]) -> Set[str]:
+    """Normalised URLs that already have a successful result in ``jsonl_path``.
+
+    A truncated last line (interrupted write) is ignored; failed sites are retried.
+    """
+    done: Set[str] = set()
+    path = Path(jsonl_path)
+    if not path.exists():
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "ok" and record.get("url"):
+                try:
+                    done.add(normalize_url(record["url"]))
+                except ValueError:
+                    continue
+    return done
+
+
+class BatchScanner:
+    """Scan a stream of URLs with shared resources and bounded concurrency.
+
+    Args:
+        site_concurrency: Sites scanned at once
+        page_concurrency: Pages fetched at once within one site
+        per_host: Sites on the same host scanned at once
+        max_pages: Pages per site
+        fetch_mode: ``static`` / ``playwright`` / ``hybrid`` (see ``SiteParser``)
+        crawl_depth: Link-following depth when a site has no sitemap
+        cache: Optional ``HttpCache`` shared by every site
+        browser / context_pool: Reuse an existing browser; otherwise one is launched when needed
+        site_timeout: Seconds before a single site is abandoned
+    """
+
+    def __init__(
+        self,
+        site_concurrency: int = 8,
+        page_concurrency: int = 2,
+        per_host: int = 1,
+        max_pages: int = 10,
+        fetch_mode: str = "static",
+        crawl_depth: int = 2,
+        cache: Optional[HttpCache] = None,
+        browser: Optional[Any] = None,
+        context_pool: Optional[Any] = None,
+        site_timeout: float = 180.0
+    ):
+        self.site_concurrency = max(1, site_concurrency)
+        self.page_concurrency = max(1, page_concurrency)
+        self.per_host = max(1, per_host)
+        self.max_pages = max_pages
+        self.fetch_mode = fetch_mode
+        self.crawl_depth = crawl_depth
+        self.cache = cache
+        self.browser = browser
+        self.context_pool = context_pool
+        self.site_timeout = site_timeout
+        self.scheduler = HostScheduler()
+        self.stats = {"ok": 0, "failed": 0, "skipped": 0}
+        self._host_slots: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+        self._playwright = None
+        self._owns_pool = False
+
+    async def _start_browser(self) -> None:
+        """Launch one shared browser and context pool for the batch (browser modes only)."""
+        if self.fetch_mode == "static" or self.context_pool is not None or not PLAYWRIGHT_AVAILABLE:
+            return
+        from trust_wedo.parsers.context_pool import BrowserContextPool
+        from trust_wedo.parsers.playwright_parser import async_playwright
+
+        if self.browser is None:
+            self._playwright = await async_playwright().start()
+            self.browser = await self._playwright.chromium.launch(
+                headless=True,
+                args=['--no-sandbox', '--disable-setuid-sandbox', '--disable-blink-features=AutomationControlled']
+            )
+        self.context_pool = BrowserContextPool(self.browser, size=self.site_concurrency * self.page_concurrency)
+        self._owns_pool = True
+
+    async def _stop_browser(self) -> None:
+        if self._owns_pool:
+            await self.context_pool.close()
+            self.context_pool = None
+            self._owns_pool = False
+        if self._playwright is not None:
+            await self.browser.close()
+            await self._playwright.stop()
+            self._playwright = self.browser = None
+
+    async def scan_site(self, client: httpx.AsyncClient, url: str) -> Dict[str, Any]:
+        """One JSONL record: ``{url, status, elapsed, result | error}``."""
+        started = time.perf_counter()
+        async with self._host_slots[HostScheduler.host_for(url)]:
+            parser = SiteParser(
+                url,
+                max_pages=self.max_pages,
+                concurrency=self.page_concurrency,
+                fetch_mode=self.fetch_mode,
+                scheduler=self.scheduler,
+                cache=self.cache,
+                crawl_depth=self.crawl_depth,
+                browser=self.browser,
+                context_pool=self.context_pool,
+                client=client
+            )
+            try:
+                result = await asyncio.wait_for(parser.scan(), timeout=self.site_timeout)
+            except Exception as e:
+                error = f"Timed out after {self.site_timeout:.0f}s" if isinstance(e, asyncio.TimeoutError) else str(e)
+                return {"url": url, "status": "error", "elapsed": round(time.perf_counter() - started, 2), "error": error}
+        elapsed = round(time.perf_counter() - started, 2)
+        if not any(page.get("fetched") for page in result.get("pages", [])):
+            # Unreachable site: record as an error so a resumed batch tries it again
+            return {"url": url, "status": "error", "elapsed": elapsed, "error": "No page could be fetched"}
+        return {"url": url, "status": "ok", "elapsed": elapsed, "result": result}
+
+    async def scan(self, urls: Iterable[str], skip: Optional[Set[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Records in completion order. URLs are consumed lazily, so the input may be huge.
+
+        ``skip`` holds normalised URLs to leave out (see ``completed_urls``).
+        """
+        skip = skip or set()
+        pending = iter(urls)
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.site_concurrency * 2)
+        limits = httpx.Limits(max_connections=self.site_concurrency * self.page_concurrency * 2)
+
+        async def worker(client: httpx.AsyncClient) -> None:
+            for url in pending:
+                try:
+                    key = normalize_url(url)
+                except ValueError:
+                    # One bad entry must not abort the whole batch
+                    await results.put({"url": url, "status": "error", "elapsed": 0.0, "error": "invalid URL"})
+                    continue
+                if key in skip:
+                    self.stats["skipped"] += 1
+                    continue
+                await results.put(await self.scan_site(client, url))
+
+        await self._start_browser()
+        try:
+            async with httpx.AsyncClient(follow_redirects=True, headers=DEFAULT_HEADERS, timeout=30.0, limits=limits) as client:
+                workers = [asyncio.create_task(worker(client)) for _ in range(self.site_concurrency)]
+                done = asyncio.ensure_future(asyncio.gather(*workers))
+                try:
+                    while not (done.done() and results.empty()):
+                        getter = asyncio.ensure_future(results.get())
+                        await asyncio.wait({getter, done}, return_when=asyncio.FIRST_COMPLETED)
+                        if getter.done():
+                            record = getter.result()
+                            self.stats["ok" if record["status"] == "ok" else "failed"] += 1
+                            yield record
+                        else:
+                            getter.cancel()
+                    done.result()
+                finally:
+                    for task in workers:
+                        task.cancel()
+                    done.cancel()
+        finally:
+            await self._stop_browser()
+
+    async def scan_to_jsonl(self, urls: Iterable[str], jsonl_path: Union[str, Path], resume: bool = True) -> Dict[str, Any]:
+        """Append one JSON line per site to ``jsonl_path``; returns throughput stats."""
+        path = Path(jsonl_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        skip = completed_urls(path) if resume else set()
+        started = time.perf_counter()
+        with open(path, "a" if resume else "w", encoding="utf-8") as out:
+            # Terminate a line cut short by an interruption before appending
+            if resume and out.tell() > 0 and not path.read_bytes().endswith(b"\n"):
+                out.write("\n")
+            async for record in self.scan(urls, skip):
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+        elapsed = time.perf_counter() - started
+        scanned = self.stats["ok"] + self.stats["failed"]
+        return {
+            **self.stats,
+            "elapsed": round(elapsed, 2),
+            "sites_per_min": round(scanned / elapsed * 60, 1) if elapsed > 0 else 0.0
+        }
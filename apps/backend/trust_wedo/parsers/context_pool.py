@@ -0,0 +1,152 @@
+"""
+Pool of warm Playwright browser contexts for page fetching.
+Avoids paying new_context()/route() setup on every URL.
+"""
+import asyncio
+import logging
+import random
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from playwright.async_api import Browser, BrowserContext, Page
+
+logger = logging.getLogger(__name__)
+
+# Resource types that never affect the signals we extract
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+# Common User Agents to rotate (one is picked per pooled context)
+USER_AGENTS = [
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15"
+]
+
+
+async def _block_heavy_resources(route) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class _PooledPage:
+    """A context with its single page and usage counter."""
+
+    def __init__(self, context: BrowserContext, page: Page):
+        self.context = context
+        self.page = page
+        self.navigations = 0
+
+
+class BrowserContextPool:
+    """Bounded pool of reusable browser contexts, leased one page at a time.
+
+    - At most ``size`` pages are leased at once; further leases wait.
+    - Idle contexts are health-checked before reuse and recycled after
+      ``max_navigations`` leases.
+    - Cookies, local/session storage and the current document are cleared
+      when a page is returned, so no state leaks between sites.
+    """
+
+    def __init__(
+        self,
+        browser: Browser,
+        size: int = 4,
+        max_navigations: int = 50,
+        context_options: Optional[Dict[str, Any]] = None,
+        block_resources: bool = True
+    ):
+        self.browser = browser
+        self.size = max(1, size)
+        self.max_navigations = max_navigations
+        self.context_options = context_options or {
+            "viewport": {"width": 1280, "height": 800},
+            "locale": "en-US",
+        }
+        # Rendering (e.g. PDFs) needs images and fonts; scanning does not
+        self.block_resources = block_resources
+        self._semaphore = asyncio.Semaphore(self.size)
+        self._idle: List[_PooledPage] = []
+        self._closed = False
+
+    async def _create(self) -> _PooledPage:
+        context = await self.browser.new_context(
+            user_agent=random.choice(USER_AGENTS),
+            **self.context_options
+        )
+        try:
+            page = await context.new_page()
+            if self.block_resources:
+                # Resource optimization: Block images/fonts/media
+                await page.route("**/*", _block_heavy_resources)
+        except Exception:
+            await context.close()
+            raise
+        return _PooledPage(context, page)
+
+    def _is_healthy(self, slot: _PooledPage) -> bool:
+        return (
+            self.browser.is_connected()
+            and not slot.page.is_closed()
+            and slot.navigations < self.max_navigations
+        )
+
+    async def _discard(self, slot: _PooledPage) -> None:
+        try:
+            await slot.context.close()
+        except Exception as e:
+            logger.debug(f"[ContextPool] Error closing context: {e}")
+
+    async def _reset(self, slot: _PooledPage) -> None:
+        """Clear all per-site state so the next lease starts clean."""
+        try:
+            await slot.page.evaluate(
+                "() => { try { localStorage.clear(); sessionStorage.clear(); } catch (e) {} }"
+            )
+        except Exception:
+            # Page may be on an error document; cookies and navigation still get reset
+            pass
+        await slot.context.clear_cookies()
+        await slot.page.goto("about:blank")
+
+    async def _checkout(self) -> _PooledPage:
+        while self._idle:
+            slot = self._idle.pop()
+            if self._is_healthy(slot):
+                return slot
+            await self._discard(slot)
+        return await self._create()
+
+    async def _checkin(self, slot: _PooledPage) -> None:
+        slot.navigations += 1
+        if self._closed or not self._is_healthy(slot):
+            await self._discard(slot)
+            return
+        try:
+            await self._reset(slot)
+        except Exception as e:
+            logger.warning(f"[ContextPool] Reset failed, recycling context: {e}")
+            await self._discard(slot)
+            return
+        self._idle.append(slot)
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[Page]:
+        """Lease a clean page; it is reset and returned to the pool on exit."""
+        if self._closed:
+            raise RuntimeError("BrowserContextPool is closed")
+        async with self._semaphore:
+            slot = await self._checkout()
+            try:
+                yield slot.page
+            finally:
+                await self._checkin(slot)
+
+    async def close(self) -> None:
+        """Close all idle contexts; leased ones are closed when returned."""
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for slot in idle:
+            await self._discard(slot)
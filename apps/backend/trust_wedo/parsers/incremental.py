@@ -0,0 +1,83 @@
+"""Incremental rescans for Trust WEDO.
+
+A rescan that is given the previous ``site.json`` only refetches pages that
+may have changed. A page from the previous scan is reused as-is when:
+
+1. its sitemap ``<lastmod>`` is not newer than when it was last scanned;
+2. a conditional GET with its stored ETag / Last-Modified returns 304; or
+3. the raw HTML body hashes to the stored ``content_hash``.
+
+``diff_scans`` then records which signals moved between the two scans.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from trust_wedo.parsers.sitemap_reader import parse_lastmod
+from trust_wedo.utils.url import normalize_url
+
+# Page signals compared between scans
+SIGNAL_FIELDS = (
+    "has_jsonld", "schema_types", "has_meta", "has_favicon", "has_viewport",
+    "title_missing", "meta_missing", "is_about_author",
+    "external_links_count", "social_links_count", "social_platforms",
+)
+
+# Site-level checks compared between scans
+CHECK_FIELDS = ("robots_ok", "sitemap_ok")
+
+
+def content_hash(body: bytes) -> str:
+    """Short, stable fingerprint of a raw HTML body."""
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def previous_pages(site_data: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Successfully fetched pages of a previous scan, keyed by normalised URL."""
+    if not site_data:
+        return {}
+    return {
+        normalize_url(page["url"]): page
+        for page in site_data.get("pages", [])
+        if page.get("url") and page.get("fetched")
+    }
+
+
+def unchanged_since(previous_lastmod: Optional[str], lastmod: Optional[str]) -> bool:
+    """True when the sitemap ``lastmod`` is not newer than the one seen at the previous scan."""
+    before, now = parse_lastmod(previous_lastmod), parse_lastmod(lastmod)
+    return before is not None and now is not None and now <= before
+
+
+def diff_scans(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Pages added / removed and signals that changed between two scans.
+
+    ``changed_pages`` entries are ``{"url", "changes": {field: [old, new]}}``.
+    """
+    before = previous_pages(previous)
+    after = previous_pages(current)
+
+    changed: List[Dict[str, Any]] = []
+    for key, page in after.items():
+        old = before.get(key)
+        if old is None or page.get("from_previous"):
+            continue
+        changes = {
+            field: [old.get(field), page.get(field)]
+            for field in SIGNAL_FIELDS
+            if old.get(field) != page.get(field)
+        }
+        if changes:
+            changed.append({"url": page["url"], "changes": changes})
+
+    old_checks, new_checks = previous.get("checks") or {}, current.get("checks") or {}
+    return {
+        "added_pages": [after[key]["url"] for key in after if key not in before],
+        "removed_pages": [before[key]["url"] for key in before if key not in after],
+        "changed_pages": changed,
+        "checks": {
+            field: [old_checks.get(field), new_checks.get(field)]
+            for field in CHECK_FIELDS
+            if old_checks.get(field) != new_checks.get(field)
+        }
+    }
@@ -0,0 +1,59 @@
+"""Cheap "does this page need a browser?" classifier for hybrid fetching."""
+
+import re
+from typing import Tuple, Union
+
+# Minimum visible text (characters) for a statically served page to count as rendered
+MIN_VISIBLE_TEXT = 200
+
+_SCRIPT_STYLE_RE = re.compile(rb"<(script|style|noscript|template)\b.*?</\1\s*>", re.I | re.S)
+_TAG_RE = re.compile(rb"<[^>]+>")
+_BODY_RE = re.compile(rb"<body\b[^>]*>(.*)</body\s*>", re.I | re.S)
+_SPA_ROOT_RE = re.compile(
+    rb"<div\b[^>]*\bid=[\"']?(root|app|__next|__nuxt|___gatsby)[\"']?[^>]*>\s*</div\s*>", re.I
+)
+_NOSCRIPT_RE = re.compile(rb"<noscript\b[^>]*>(.*?)</noscript\s*>", re.I | re.S)
+_NOSCRIPT_MARKERS = tuple(
+    marker.encode("utf-8")
+    for marker in ("enable javascript", "javascript is required", "javascript enabled", "啟用 javascript")
+)
+
+
+def visible_text_length(html: bytes) -> int:
+    """Approximate length of the visible text in the document body."""
+    match = _BODY_RE.search(html)
+    body = match.group(1) if match else html
+    body = _SCRIPT_STYLE_RE.sub(b" ", body)
+    text = _TAG_RE.sub(b" ", body)
+    return len(b" ".join(text.split()))
+
+
+def needs_rendering(html: Union[str, bytes, None]) -> Tuple[bool, str]:
+    """Decide whether statically fetched HTML must be rendered in a browser.
+
+    Returns:
+        (needs_rendering, reason) where reason is one of
+        ``empty_document``, ``spa_root``, ``noscript_required``, ``empty_body``,
+        ``missing_jsonld`` or ``static_complete``.
+    """
+    if not html:
+        return True, "empty_document"
+    if isinstance(html, str):
+        html = html.encode("utf-8", errors="ignore")
+
+    if _SPA_ROOT_RE.search(html):
+        return True, "spa_root"
+
+    for noscript in _NOSCRIPT_RE.findall(html):
+        lowered = noscript.lower()
+        if any(marker in lowered for marker in _NOSCRIPT_MARKERS):
+            return True, "noscript_required"
+
+    if visible_text_length(html) < MIN_VISIBLE_TEXT:
+        return True, "empty_body"
+
+    # JSON-LD is frequently injected client-side; only the browser can tell
+    if b"application/ld+json" not in html.lower():
+        return True, "missing_jsonld"
+
+    return False, "static_complete"
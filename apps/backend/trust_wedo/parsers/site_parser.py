@@ -1,14 +1,23 @@
 """Site parser module for Trust WEDO."""
 
 import asyncio
-import json
+import contextlib
+import heapq
+import inspect
 import logging
 import time
-from typing import List, Dict, Any, Optional, Set, Callable, Awaitable
+from typing import List, Dict, Any, Optional, Set, Callable, Awaitable, Tuple
 import httpx
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin
 from trust_wedo.utils.meta import get_meta
+from trust_wedo.parsers.host_scheduler import HostScheduler, RETRYABLE_STATUS_CODES, parse_crawl_delay
+from trust_wedo.parsers.render_classifier import needs_rendering
+from trust_wedo.parsers.http_cache import HttpCache
+from trust_wedo.parsers.incremental import content_hash, diff_scans, previous_pages, unchanged_since
+from trust_wedo.parsers.page_analyzer import analyze_html
+from trust_wedo.parsers.sitemap_reader import SitemapReader, parse_sitemap_directives
+from trust_wedo.parsers.url_sampler import identity_keyword, sample_urls
+from trust_wedo.utils.url import normalize_url
 
 try:
     from trust_wedo.parsers.playwright_parser import PlaywrightParser
@@ -18,35 +27,80 @@ except ImportError:
     print("[WARN] Playwright parser not available, falling back to static parser")
 
 
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9,zh-TW;q=0.8,zh;q=0.7",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "none",
+    "Sec-Fetch-User": "?1",
+    "Cache-Control": "max-age=0",
+    "Sec-Ch-Ua": '"Not A(Brand";v="99", "Google Chrome";v="121", "Chromium";v="121"',
+    "Sec-Ch-Ua-Mobile": "?0",
+    "Sec-Ch-Ua-Platform": '"macOS"'
+}
+
+
+def _accepts_keyword(func: Optional[Callable[..., Any]], name: str) -> bool:
+    if func is None:
+        return False
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(p.name == name or p.kind is p.VAR_KEYWORD for p in parameters)
+
+
 class SiteParser:
     """Parser for scanning websites."""
 
-    def __init__(self, base_url: str, max_pages: int = 10, use_playwright: bool = True, progress_callback: Optional[Callable[[int, str], Awaitable[None]]] = None, browser: Optional[Any] = None):
+    MAX_FETCH_ATTEMPTS = 3
+    # Sitemap candidates collected per page we intend to scan (headroom for sampling)
+    SITEMAP_CANDIDATE_FACTOR = 5
+    # static: httpx only / playwright: render every page / hybrid: httpx first, render on demand
+    FETCH_MODES = ("static", "playwright", "hybrid")
+
+    def __init__(self, base_url: str, max_pages: int = 10, use_playwright: bool = True, progress_callback: Optional[Callable[[int, str], Awaitable[None]]] = None, browser: Optional[Any] = None, concurrency: int = 1, scheduler: Optional[HostScheduler] = None, context_pool: Optional[Any] = None, hydration_timeout_ms: int = 3000, fetch_mode: Optional[str] = None, cache: Optional[HttpCache] = None, crawl_depth: int = 2, client: Optional[httpx.AsyncClient] = None, previous: Optional[Dict[str, Any]] = None):
         self.base_url = base_url.rstrip("/")
         self.max_pages = max_pages
+        self.concurrency = max(1, concurrency)
+        self.scheduler = scheduler or HostScheduler()
         self.progress_callback = progress_callback
+        # Callbacks that accept a ``page_url`` keyword also get the page being scanned
+        self._progress_page_url = _accepts_keyword(progress_callback, "page_url")
         self.pages: List[Dict[str, Any]] = []
         self.checks = {"robots_ok": False, "sitemap_ok": False}
         self.visited_urls = set()
-        self.use_playwright = use_playwright and (PLAYWRIGHT_AVAILABLE or browser is not None)
+        self.sitemap_entries: List[Dict[str, Any]] = []
+        # Link-following fallback when there is no sitemap (0 disables it)
+        self.crawl_depth = max(0, crawl_depth)
+        self.page_links: Dict[str, List[str]] = {}
+        if fetch_mode is None:
+            fetch_mode = "playwright" if use_playwright else "static"
+        if fetch_mode not in self.FETCH_MODES:
+            raise ValueError(f"Unknown fetch_mode: {fetch_mode} (expected one of {self.FETCH_MODES})")
+        if fetch_mode != "static" and not (PLAYWRIGHT_AVAILABLE or browser is not None or context_pool is not None):
+            fetch_mode = "static"
+        self.fetch_mode = fetch_mode
+        self.use_playwright = fetch_mode == "playwright"
+        self._playwright_parser = None
+        self._playwright_lock = asyncio.Lock()
         self.browser = browser
+        self.context_pool = context_pool
+        self.hydration_timeout_ms = hydration_timeout_ms
+        self.cache = cache
+        # Shared HTTP client (batch scans); None opens one per scan
+        self.client = client
+        # Incremental rescan: pages of the previous site.json are reused when unchanged
+        self.previous = previous
+        self._previous_pages = previous_pages(previous)
+        self._sitemap_lastmod: Dict[str, Optional[str]] = {}
         
-        self.headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9,zh-TW;q=0.8,zh;q=0.7",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-            "Sec-Fetch-Dest": "document",
-            "Sec-Fetch-Mode": "navigate",
-            "Sec-Fetch-Site": "none",
-            "Sec-Fetch-User": "?1",
-            "Cache-Control": "max-age=0",
-            "Sec-Ch-Ua": '"Not A(Brand";v="99", "Google Chrome";v="121", "Chromium";v="121"',
-            "Sec-Ch-Ua-Mobile": "?0",
-            "Sec-Ch-Ua-Platform": '"macOS"'
-        }
+        self.headers = dict(DEFAULT_HEADERS)
 
     async def scan(self) -> Dict[str, Any]:
         """Perform site scan."""
@@ -55,40 +109,46 @@ class SiteParser:
             
         playwright_parser = None
         # Parser selection logic
-        # Note: self.use_playwright is already set in __init__ based on input and PLAYWRIGHT_AVAILABLE
+        # Note: self.fetch_mode is already set in __init__ based on input and PLAYWRIGHT_AVAILABLE
         # The following block adds logging based on that decision.
-        if self.use_playwright:
-            if not PLAYWRIGHT_AVAILABLE:
-                # Use print for critical initialization issues that might happen before logging is fully set up
-                print("[ERROR] Playwright requested but NOT AVAILABLE. Falling back to static HTTP.")
-            else:
-                print(f"[INFO] Strict Mode: Playwright enabled for scan of {self.base_url}")
+        if self.fetch_mode == "playwright":
+            print(f"[INFO] Strict Mode: Playwright enabled for scan of {self.base_url}")
+        elif self.fetch_mode == "hybrid":
+            print(f"[INFO] Hybrid Mode: static HTTP first, Playwright on demand for {self.base_url}")
         else:
             print("[INFO] Default Mode: Using static HTTP parser.")
+            if not PLAYWRIGHT_AVAILABLE:
+                print("[WARN] Playwright not available, using static parser.")
         
-        # Initialize Playwright if enabled
+        # Initialize Playwright up front in strict mode (hybrid starts it on first escalation)
         if self.use_playwright:
             try:
-                playwright_parser = PlaywrightParser(browser=self.browser)
-                await playwright_parser.__aenter__()
-                print(f"[INFO] Initialized Playwright parser for {self.base_url} (Shared Browser: {self.browser is not None})")
+                playwright_parser = await self._ensure_playwright()
             except Exception as e:
                 print(f"[ERROR] Failed to init Playwright: {e}")
                 # In strict mode, we should probably fail here instead of falling back
                 # to static parsing which we know will give poor results for SPAs.
                 raise RuntimeError(f"Playwright initialization failed: {e}") from e
-        elif not PLAYWRIGHT_AVAILABLE:
-             print("[WARN] Playwright not available, using static parser.")
 
         try:
-            async with httpx.AsyncClient(follow_redirects=True, headers=self.headers, timeout=30.0) as client:
+            async with self._http_client() as client:
                 # 1. Check robots.txt (minimal check)
+                robots_sitemaps: List[str] = []
                 if self.base_url.startswith("file://"):
                     self.checks["robots_ok"] = True
                 else:
                     try:
-                        robots_resp = await client.get(f"{self.base_url}/robots.txt")
-                        self.checks["robots_ok"] = robots_resp.status_code == 200
+                        robots_status, robots_body = await self._cached_get(client, f"{self.base_url}/robots.txt")
+                        self.checks["robots_ok"] = robots_status == 200
+                        if self.checks["robots_ok"]:
+                            crawl_delay = parse_crawl_delay(robots_body.decode("utf-8", errors="ignore"))
+                            if crawl_delay:
+                                applied = self.scheduler.set_crawl_delay(HostScheduler.host_for(self.base_url), crawl_delay)
+                                if applied < crawl_delay:
+                                    print(f"[WARN] Crawl-delay of {crawl_delay}s for {self.base_url} clamped to {applied}s")
+                                else:
+                                    print(f"[INFO] Honouring Crawl-delay of {crawl_delay}s for {self.base_url}")
+                            robots_sitemaps = parse_sitemap_directives(robots_body.decode("utf-8", errors="ignore"))
                     except Exception as e:
                         print(f"[WARN] Failed to check robots.txt: {e}")
                         self.checks["robots_ok"] = False
@@ -97,10 +157,12 @@ class SiteParser:
                 urls_to_scan = [self.base_url]
                 if not self.base_url.startswith("file://"):
                     try:
-                        sitemap_urls = await self._find_sitemap_urls(client)
+                        sitemap_urls = await self._find_sitemap_urls(client, robots_sitemaps)
                         if sitemap_urls:
                             self.checks["sitemap_ok"] = True
-                            urls_to_scan = sitemap_urls[:self.max_pages]
+                            # Homepage + identity pages + one page per path template
+                            urls_to_scan = sample_urls(sitemap_urls, self.base_url, self.max_pages)
+                            print(f"[INFO] Sampled {len(urls_to_scan)} of {len(sitemap_urls)} sitemap URLs for {self.base_url}")
                         else:
                             self.checks["sitemap_ok"] = False
                     except Exception as e:
@@ -108,256 +170,429 @@ class SiteParser:
                         self.checks["sitemap_ok"] = False
 
                 # 3. Scan pages
-                print(f"[INFO] Starting scan for {self.base_url} with {len(urls_to_scan)} URLs")
-                
-                current_count = 0
-                total_to_scan = min(len(urls_to_scan), self.max_pages)
-
-                for url in urls_to_scan:
-                    if len(self.pages) >= self.max_pages:
-                        break
-                    
-                    current_count += 1
-                    percent = 10 + int((current_count / total_to_scan) * 80)
-                    if self.progress_callback:
-                        await self.progress_callback(percent, f"正在掃描頁面 ({current_count}/{total_to_scan})...")
-                        
-                    try:
-                        page_info = await self._scan_page(client, url, playwright_parser)
-                        if page_info:
-                            self.pages.append(page_info)
-                    except Exception as e:
-                        print(f"[ERROR] Failed to scan page {url}: {e}")
+                urls_to_scan = urls_to_scan[:self.max_pages]
+                if not self.checks["sitemap_ok"] and self.crawl_depth > 0 and not self.base_url.startswith("file://"):
+                    print(f"[INFO] No sitemap, crawling {self.base_url} (depth={self.crawl_depth}, max_pages={self.max_pages}, concurrency={self.concurrency})")
+                    await self._crawl(client, playwright_parser)
+                else:
+                    print(f"[INFO] Starting scan for {self.base_url} with {len(urls_to_scan)} URLs (concurrency={self.concurrency})")
+                    await self._scan_urls(client, urls_to_scan, playwright_parser)
 
         finally:
-            if playwright_parser:
-                await playwright_parser.__aexit__(None, None, None)
+            if self._playwright_parser:
+                await self._playwright_parser.__aexit__(None, None, None)
+                self._playwright_parser = None
 
-        return {
+        result = {
             "site": self.base_url,
             "pages": self.pages,
             "checks": self.checks,
             "meta": get_meta(self.base_url),
-            "parser_used": "playwright" if playwright_parser else "static"
+            "parser_used": self.fetch_mode,
+            "fetch_stats": self._fetch_stats()
+        }
+        if self.previous is not None:
+            result["incremental"] = self._incremental_summary(result)
+        return result
+
+    def _incremental_summary(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Reuse counts and the signal diff against the previous scan."""
+        reasons: Dict[str, int] = {}
+        for page in self.pages:
+            if page.get("from_previous"):
+                reasons[page["reuse_reason"]] = reasons.get(page["reuse_reason"], 0) + 1
+        return {
+            "previous_generated_at": (self.previous.get("meta") or {}).get("generated_at"),
+            "reused_pages": sum(reasons.values()),
+            "refetched_pages": len(self.pages) - sum(reasons.values()),
+            "reuse_reasons": reasons,
+            "diff": diff_scans(self.previous, result)
+        }
+
+    def _http_client(self) -> Any:
+        if self.client is not None:
+            return contextlib.nullcontext(self.client)
+        return httpx.AsyncClient(follow_redirects=True, headers=self.headers, timeout=30.0)
+
+    async def _ensure_playwright(self) -> Any:
+        """Start the Playwright parser once; safe to call from concurrent workers."""
+        async with self._playwright_lock:
+            if self._playwright_parser is None:
+                parser = PlaywrightParser(
+                    browser=self.browser,
+                    context_pool=self.context_pool,
+                    pool_size=self.concurrency,
+                    hydration_timeout_ms=self.hydration_timeout_ms
+                )
+                await parser.__aenter__()
+                self._playwright_parser = parser
+                print(f"[INFO] Initialized Playwright parser for {self.base_url} (Shared Browser: {self.browser is not None}, Shared Pool: {self.context_pool is not None})")
+        return self._playwright_parser
+
+    def _fetch_stats(self) -> Dict[str, Any]:
+        """Summarise which fetch path each page took, to measure browser time saved."""
+        fresh = [p for p in self.pages if not p.get("from_cache") and not p.get("from_previous")]
+        rendered = [p for p in fresh if p.get("fetch_path") == "playwright"]
+        static = [p for p in fresh if p.get("fetch_path") == "static"]
+        render_times = [p["load_time"] for p in rendered if p.get("load_time") is not None]
+        avg_render_time = sum(render_times) / len(render_times) if render_times else None
+        return {
+            "cached_pages": sum(1 for p in self.pages if p.get("from_cache")),
+            "reused_pages": sum(1 for p in self.pages if p.get("from_previous")),
+            "static_pages": len(static),
+            "rendered_pages": len(rendered),
+            "avg_render_time": avg_render_time,
+            # Static pages in hybrid mode would otherwise have paid a full render each
+            "estimated_browser_time_saved": (
+                avg_render_time * len(static)
+                if self.fetch_mode == "hybrid" and avg_render_time is not None else None
+            )
         }
 
-    async def _find_sitemap_urls(self, client: httpx.AsyncClient) -> List[str]:
-        """Find URLs from sitemap.xml."""
-        sitemap_url = f"{self.base_url}/sitemap.xml"
+    async def _report_progress(self, percent: int, message: str, page_url: Optional[str] = None) -> None:
+        if self._progress_page_url:
+            await self.progress_callback(percent, message, page_url=page_url)
+        else:
+            await self.progress_callback(percent, message)
+
+    async def _scan_urls(self, client: httpx.AsyncClient, urls: List[str], playwright_parser: Any = None) -> None:
+        """Scan URLs with a bounded worker pool, keeping results in input order.
+
+        Workers share the same HTTP client and Playwright parser (and therefore
+        the same browser). Progress is reported as each page starts, under a
+        lock, so percentages stay monotonic regardless of completion order.
+        """
+        total = len(urls)
+        if total == 0:
+            return
+
+        results: List[Optional[Dict[str, Any]]] = [None] * total
+        queue: asyncio.Queue = asyncio.Queue()
+        for index, url in enumerate(urls):
+            queue.put_nowait((index, url))
+
+        progress_lock = asyncio.Lock()
+        started = 0
+
+        async def report_started(url: str) -> None:
+            nonlocal started
+            async with progress_lock:
+                started += 1
+                if self.progress_callback:
+                    percent = 10 + int((started / total) * 80)
+                    await self._report_progress(percent, f"正在掃描頁面 ({started}/{total})...", url)
+
+        async def worker() -> None:
+            while True:
+                try:
+                    index, url = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await report_started(url)
+                try:
+                    results[index] = await self._scan_page(client, url, playwright_parser)
+                except Exception as e:
+                    print(f"[ERROR] Failed to scan page {url}: {e}")
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.concurrency, total))]
         try:
-            resp = await client.get(sitemap_url)
-            if resp.status_code == 200:
-                soup = BeautifulSoup(resp.content, "xml")
-                urls = [loc.text for loc in soup.find_all("loc")]
-                return urls
-        except Exception:
-            pass
-        return []
-
-    def _extract_schemas(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
-        """Extract all JSON-LD schema objects."""
-        schemas = []
-        scripts = soup.find_all("script", type="application/ld+json")
-        
-        for script in scripts:
-            if not script.string:
-                continue
-                
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+
+        self.pages.extend(page for page in results if page)
+
+    async def _crawl(self, client: httpx.AsyncClient, playwright_parser: Any = None) -> None:
+        """Bounded BFS over same-site links, starting from the base URL.
+
+        Links come from already-parsed pages; URLs are deduplicated after
+        normalisation so none is fetched twice. Identity pages (about /
+        contact / author) jump the queue, then shallower pages go first.
+        Results are kept in the order pages were scheduled.
+        """
+        frontier: List[Tuple[int, int, int, str]] = []
+        seen = {normalize_url(self.base_url)}
+        sequence = 0
+
+        def enqueue(url: str, depth: int) -> None:
+            nonlocal sequence
+            priority = 0 if identity_keyword(url) else 1
+            heapq.heappush(frontier, (priority, depth, sequence, url))
+            sequence += 1
+
+        enqueue(self.base_url, 0)
+        # Incremental rescan: revisit every previous page at the depth it was found,
+        # so it still expands (reused pages restore their stored links)
+        for page in self._previous_pages.values():
+            if normalize_url(page["url"]) not in seen:
+                seen.add(normalize_url(page["url"]))
+                enqueue(page["url"], min(page.get("depth", self.crawl_depth), self.crawl_depth))
+        results: List[Optional[Dict[str, Any]]] = []
+        condition = asyncio.Condition()
+        in_flight = 0
+
+        async def worker() -> None:
+            nonlocal in_flight
+            while True:
+                async with condition:
+                    # Wait for in-flight pages that may still add links
+                    while not frontier and in_flight > 0:
+                        await condition.wait()
+                    if not frontier or len(results) >= self.max_pages:
+                        condition.notify_all()
+                        return
+                    _, depth, _, url = heapq.heappop(frontier)
+                    index = len(results)
+                    results.append(None)
+                    in_flight += 1
+                    if self.progress_callback:
+                        percent = 10 + int((len(results) / self.max_pages) * 80)
+                        await self._report_progress(percent, f"正在掃描頁面 ({len(results)}/{self.max_pages})...", url)
+
+                try:
+                    results[index] = await self._scan_page(client, url, playwright_parser)
+                    if results[index]:
+                        results[index]["depth"] = depth
+                except Exception as e:
+                    print(f"[ERROR] Failed to scan page {url}: {e}")
+
+                async with condition:
+                    if depth < self.crawl_depth:
+                        for link in self.page_links.get(url, []):
+                            normalized = normalize_url(link)
+                            if normalized not in seen:
+                                seen.add(normalized)
+                                enqueue(link, depth + 1)
+                    in_flight -= 1
+                    condition.notify_all()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+
+        self.pages.extend(page for page in results if page)
+
+    async def _find_sitemap_urls(self, client: httpx.AsyncClient, robots_sitemaps: Optional[List[str]] = None) -> List[str]:
+        """Find URLs from robots.txt sitemaps (or /sitemap.xml), following sitemap indexes.
+
+        Reading stops once enough candidates are collected; entries (with
+        lastmod/priority) are kept on ``self.sitemap_entries``.
+        """
+        reader = SitemapReader(
+            client,
+            scheduler=self.scheduler,
+            cache=self.cache,
+            max_urls=self.max_pages * self.SITEMAP_CANDIDATE_FACTOR
+        )
+        self.sitemap_entries = await reader.read(robots_sitemaps or [f"{self.base_url}/sitemap.xml"])
+        self._sitemap_lastmod = {normalize_url(entry["loc"]): entry.get("lastmod") for entry in self.sitemap_entries}
+        return [entry["loc"] for entry in self.sitemap_entries]
+
+    async def _cached_get(self, client: httpx.AsyncClient, url: str) -> Tuple[int, bytes]:
+        """GET a small resource (robots.txt, sitemap) with conditional revalidation."""
+        entry = await self.cache.aget(url) if self.cache else None
+        await self.scheduler.acquire(url)
+        resp = await client.get(url, headers=HttpCache.conditional_headers(entry))
+        if resp.status_code == 304 and entry and entry["body"] is not None:
+            return 200, entry["body"]
+        if resp.status_code == 200 and self.cache:
+            await self.cache.astore(url, body=resp.content, **HttpCache.validators(resp.headers))
+        return resp.status_code, resp.content
+
+    async def _fetch_static(self, client: httpx.AsyncClient, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[httpx.Response]:
+        """Fetch raw HTML over HTTP, retrying 429/5xx through the host scheduler.
+
+        Returns the 200 (or, for conditional requests, 304) response, or None.
+        """
+        for attempt in range(self.MAX_FETCH_ATTEMPTS):
+            await self.scheduler.acquire(url)
             try:
-                data = json.loads(script.string)
-                
-                # Handle list format
-                if isinstance(data, list):
-                    schemas.extend([item for item in data if isinstance(item, dict)])
-                
-                # Handle object format
-                elif isinstance(data, dict):
-                    # Handle @graph format
-                    if "@graph" in data and isinstance(data["@graph"], list):
-                        schemas.extend([item for item in data["@graph"] if isinstance(item, dict)])
-                    else:
-                        schemas.append(data)
-                            
-            except (json.JSONDecodeError, TypeError, KeyError):
-                continue
-        
-        return schemas
+                resp = await client.get(url, timeout=30.0, headers=headers)
+                if resp.status_code in (200, 304):
+                    return resp
+                elif resp.status_code in RETRYABLE_STATUS_CODES:
+                    delay = self.scheduler.retry_delay(url, attempt, resp.headers.get("Retry-After"))
+                    if delay is None:
+                        print(f"[WARN] Status {resp.status_code} for {url} with Retry-After {resp.headers.get('Retry-After')}, giving up")
+                        return None
+                    print(f"[WARN] Status {resp.status_code} for {url}, backing off host for {delay:.1f}s")
+                else:
+                    return None
+            except Exception as e:
+                print(f"[WARN] Fetch attempt {attempt+1} failed for {url}: {e}")
+                self.scheduler.retry_delay(url, attempt)
+        return None
+
+    async def _revalidate_previous(self, client: httpx.AsyncClient, url: str, previous: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[httpx.Response]]:
+        """Reuse the previous scan's page if it is unchanged.
+
+        Returns ``(page, None)`` when reused, otherwise ``(None, response)`` where the
+        response is a fresh 200 fetched during the check (or None).
+        """
+        lastmod = self._sitemap_lastmod.get(normalize_url(url))
+        if unchanged_since(previous.get("lastmod"), lastmod):
+            return self._reuse_previous(url, previous, "lastmod", lastmod), None
+
+        headers = HttpCache.conditional_headers(previous)
+        if not headers and not previous.get("content_hash"):
+            return None, None
+        resp = await self._fetch_static(client, url, headers)
+        if resp is None:
+            return None, None
+        if resp.status_code == 304:
+            return self._reuse_previous(url, previous, "not_modified", lastmod), None
+        if previous.get("content_hash") and content_hash(resp.content) == previous["content_hash"]:
+            return self._reuse_previous(url, previous, "content_hash", lastmod), None
+        return None, resp
+
+    def _reuse_previous(self, url: str, previous: Dict[str, Any], reason: str, lastmod: Optional[str]) -> Dict[str, Any]:
+        print(f"[INFO] Unchanged since last scan ({reason}), reusing {url}")
+        self.page_links[url] = previous.get("internal_links") or []
+        return {**previous, "from_previous": True, "reuse_reason": reason, "lastmod": lastmod or previous.get("lastmod")}
 
     async def _scan_page(self, client: httpx.AsyncClient, url: str, playwright_parser: Any = None) -> Optional[Dict[str, Any]]:
-        """Scan a single page using Playwright or static fallback."""
+        """Scan a single page using the configured fetch mode (static / playwright / hybrid)."""
         if url in self.visited_urls:
             return None
         self.visited_urls.add(url)
 
-        soup = None
+        html = None
         fetched = False
+        hydration_wait_ms = None
+        fetch_path = None
+        render_reason = None
+        validators: Dict[str, Optional[str]] = {}
         start_time = time.time()
         
-        # 1. Try Playwright first if available
-        if playwright_parser and not url.startswith("file://"):
+        if url.startswith("file://"):
             try:
-                content = await playwright_parser.fetch_content(url)
-                if content:
-                    soup = BeautifulSoup(content, "html.parser")
+                with open(url[7:], "rb") as f:
+                    html = f.read()
+                fetched = True
+                fetch_path = "file"
+            except Exception:
+                pass
+        else:
+            # 0. Revalidate a previously extracted page; unchanged pages skip fetching and parsing
+            static_resp = None
+            previous = self._previous_pages.get(normalize_url(url))
+            if previous:
+                reused, static_resp = await self._revalidate_previous(client, url, previous)
+                if reused:
+                    return reused
+            cached = await self.cache.aget(url) if self.cache else None
+            # Only reuse a page extracted under the same fetch mode
+            if cached and cached.get("page") and cached.get("fetch_mode") == self.fetch_mode and static_resp is None:
+                static_resp = await self._fetch_static(client, url, HttpCache.conditional_headers(cached))
+                if static_resp is not None and static_resp.status_code == 304:
+                    print(f"[INFO] Not modified, reusing cached page for {url}")
+                    page = {**cached["page"], "from_cache": True}
+                    self.page_links[url] = page.get("internal_links") or []
+                    return page
+
+            # 1. Hybrid mode: static first, classify, escalate only when needed
+            content = None
+            if self.fetch_mode == "hybrid":
+                static_resp = static_resp or await self._fetch_static(client, url)
+                content = static_resp.content if static_resp is not None else None
+                render, render_reason = needs_rendering(content)
+                if not render:
+                    html = content
                     fetched = True
+                    fetch_path = "static"
+                    validators = HttpCache.validators(static_resp.headers)
                 else:
-                    print(f"[WARN] Playwright returned no content for {url}, falling back to static")
-            except Exception as e:
-                print(f"[WARN] Playwright error for {url}: {e}")
+                    print(f"[INFO] Escalating {url} to Playwright ({render_reason})")
+                    try:
+                        playwright_parser = playwright_parser or await self._ensure_playwright()
+                    except Exception as e:
+                        print(f"[WARN] Playwright unavailable for {url}: {e}")
+                        playwright_parser = None
 
-        # 2. Fallback to httpx if not fetched and playwright NOT attempted
-        if not fetched and not (playwright_parser and not url.startswith("file://")):
-            if url.startswith("file://"):
+            # 2. Playwright (strict mode, or a hybrid escalation)
+            if not fetched and playwright_parser:
                 try:
-                    with open(url[7:], "rb") as f:
-                        content = f.read()
-                    soup = BeautifulSoup(content, "html.parser")
+                    await self.scheduler.acquire(url)
+                    result = await playwright_parser.fetch_page(url)
+                    if result and result.get("status") in RETRYABLE_STATUS_CODES:
+                        # Let other pages on this host back off too
+                        self.scheduler.retry_delay(url, 0)
+                    if result and result["content"]:
+                        html = result["content"]
+                        hydration_wait_ms = result["hydration_wait_ms"]
+                        fetched = True
+                        fetch_path = "playwright"
+                        validators = HttpCache.validators(result.get("headers") or {})
+                    else:
+                        print(f"[WARN] Playwright returned no content for {url}")
+                except Exception as e:
+                    print(f"[WARN] Playwright error for {url}: {e}")
+
+            # Hybrid escalation failed: keep the static result rather than losing the page
+            if not fetched and self.fetch_mode == "hybrid" and content:
+                html = content
+                fetched = True
+                fetch_path = "static"
+                validators = HttpCache.validators(static_resp.headers)
+
+            # 3. Static-only mode
+            if not fetched and self.fetch_mode == "static":
+                static_resp = static_resp or await self._fetch_static(client, url)
+                if static_resp is not None:
+                    html = static_resp.content
                     fetched = True
-                except Exception:
-                    pass
-            else:
-                for attempt in range(2):
-                    try:
-                        resp = await client.get(url, timeout=30.0)
-                        if resp.status_code == 200:
-                            soup = BeautifulSoup(resp.content, "html.parser")
-                            fetched = True
-                            
-                            # Quick check if blocked
-                            if not soup.find("title"):
-                                print(f"[WARN] No title tag found for {url} (status {resp.status_code})")
-                            break
-                        elif resp.status_code in [429, 500, 502, 503, 504]:
-                            await asyncio.sleep(2)
-                    except Exception as e:
-                        print(f"[WARN] Fetch attempt {attempt+1} failed for {url}: {e}")
-                        await asyncio.sleep(1)
-
-        # 3. Analyze content
-        has_jsonld = False
-        has_meta = False
-        schema_types = []
-        raw_schemas = []
-        has_favicon = False
-        social_platforms = []
-        external_links_count = 0
-        social_links_count = 0
-        
-        if fetched and soup:
-            # Extract raw schemas
-            raw_schemas = self._extract_schemas(soup)
-            
-            # Extract types from raw schemas
-            types_set = set()
-            for s in raw_schemas:
-                t = s.get('@type')
-                if isinstance(t, list):
-                    types_set.update(t)
-                elif t:
-                    types_set.add(t)
-            schema_types = list(types_set)
-            
-            has_jsonld = len(schema_types) > 0 or bool(soup.find("script", type="application/ld+json"))
-            
-            # 基本 meta 資訊
-            title_tag = soup.find("title")
-            has_title = bool(title_tag and title_tag.string and title_tag.string.strip())
-            
-            meta_desc = soup.find("meta", attrs={"name": "description"})
-            if not meta_desc:
-                meta_desc = soup.find("meta", attrs={"property": "og:description"})
-            
-            has_meta_desc = bool(meta_desc and meta_desc.get("content", "").strip())
-            has_meta = has_meta_desc
-            
-            has_meta_desc = bool(meta_desc and meta_desc.get("content", "").strip())
-            has_meta = has_meta_desc
-            
-            # 視口檢查 (Mobile Friendly)
-            has_viewport = bool(soup.find("meta", attrs={"name": "viewport"}))
-            
+                    fetch_path = "static"
+                    validators = HttpCache.validators(static_resp.headers)
+                    
+                    # Quick check if blocked
+                    if b"<title" not in html.lower():
+                        print(f"[WARN] No title tag found for {url}")
+
+        # 4. Analyze content (single lxml pass)
+        if fetched and html is not None:
+            signals = analyze_html(html, url, self.base_url)
             load_time = time.time() - start_time
-            print(f"[DEBUG] Parsed{'(PW)' if playwright_parser and not url.startswith('file://') else ''} {url}: Title={has_title}, Desc={has_meta_desc}, Schema={len(schema_types)}, Time={load_time:.2f}s")
-            
-            # Favicon 偵測
-            has_favicon = bool(
-                soup.find("link", rel="icon") or 
-                soup.find("link", rel="shortcut icon") or
-                soup.find("link", rel="apple-touch-icon")
-            )
-            
-            # Check for about/author pages
-            about_author_keywords = ["about", "author", "team", "contact", "關於", "作者"]
-            url_path = urlparse(url).path.lower()
-            is_about_author = any(kw in url_path for kw in about_author_keywords)
-            
-            # Count external links
-            all_links = soup.find_all("a", href=True)
-            external_links = []
-            
-            def get_root_domain(url_str):
-                try:
-                    netloc = urlparse(url_str).netloc.lower().replace('www.', '')
-                    parts = netloc.split('.')
-                    if len(parts) >= 2:
-                        return f"{parts[-2]}.{parts[-1]}"
-                    return netloc
-                except:
-                    return ""
-
-            base_root = get_root_domain(self.base_url)
-            
-            for l in all_links:
-                href = l.get("href")
-                if isinstance(href, list):
-                    href = href[0] if href else ""
-                
-                if href and isinstance(href, str) and href.startswith("http"):
-                    link_root = get_root_domain(href)
-                    if link_root and link_root != base_root:
-                        external_links.append(href)
-            
-            external_links_count = len(external_links)
-            
-            # Count social links & platforms
-            social_domains = {
-                "twitter.com": "Twitter",
-                "x.com": "X (Twitter)",
-                "facebook.com": "Facebook",
-                "linkedin.com": "LinkedIn",
-                "github.com": "GitHub",
-                "instagram.com": "Instagram",
-                "youtube.com": "YouTube",
-                "tiktok.com": "TikTok"
-            }
-            social_links = []
-            for link in external_links:
-                for domain, platform in social_domains.items():
-                    if domain in link:
-                        social_links.append(link)
-                        if platform not in social_platforms:
-                            social_platforms.append(platform)
-                        break
-            
-            social_links_count = len(social_links)
+            print(f"[DEBUG] Parsed{'(PW)' if fetch_path == 'playwright' else ''} {url}: Title={signals['has_title']}, Desc={signals['has_meta']}, Schema={len(signals['schema_types'])}, Time={load_time:.2f}s")
 
-            return {
+            page = {
                 "url": url,
                 "fetched": fetched,
-                "has_jsonld": has_jsonld,
-                "schema_types": schema_types,
-                "schemas": raw_schemas,
-                "has_meta": has_meta,
-                "has_favicon": has_favicon,
-                "has_viewport": has_viewport,
+                "has_jsonld": signals["has_jsonld"],
+                "schema_types": signals["schema_types"],
+                "schemas": signals["schemas"],
+                "has_meta": signals["has_meta"],
+                "has_favicon": signals["has_favicon"],
+                "has_viewport": signals["has_viewport"],
                 "load_time": load_time,
-                "title_missing": not has_title,
-                "meta_missing": not has_meta_desc,
-                "is_about_author": is_about_author,
-                "external_links_count": external_links_count,
-                "social_links_count": social_links_count,
-                "social_platforms": social_platforms
+                "hydration_wait_ms": hydration_wait_ms,
+                "fetch_path": fetch_path,
+                "render_reason": render_reason,
+                "from_cache": False,
+                "title_missing": signals["title_missing"],
+                "meta_missing": signals["meta_missing"],
+                "is_about_author": signals["is_about_author"],
+                "external_links_count": signals["external_links_count"],
+                "social_links_count": signals["social_links_count"],
+                "social_platforms": signals["social_platforms"],
+                # Kept so reused pages (HTTP cache, incremental rescans) can still be crawled through
+                "internal_links": signals["internal_links"]
             }
+
+            # Change detection for incremental rescans
+            page["etag"] = validators.get("etag")
+            page["last_modified"] = validators.get("last_modified")
+            page["content_hash"] = content_hash(html) if fetch_path in ("static", "file") and isinstance(html, bytes) else None
+            page["lastmod"] = self._sitemap_lastmod.get(normalize_url(url))
+
+            self.page_links[url] = signals["internal_links"]
+            if self.cache and validators:
+                await self.cache.astore(url, page=page, fetch_mode=self.fetch_mode, **validators)
+
+            return page
         
         return {
             "url": url,
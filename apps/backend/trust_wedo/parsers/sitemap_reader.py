@@ -0,0 +1,248 @@
+"""Streaming sitemap reader for Trust WEDO.
+
+Discovers sitemaps from robots.txt ``Sitemap:`` lines (falling back to
+``/sitemap.xml``), follows ``<sitemapindex>`` children, transparently inflates
+gzip sitemaps and parses each document incrementally, so a scan stops
+downloading as soon as it has enough candidate URLs instead of loading a
+50k-URL sitemap into memory.
+"""
+
+import zlib
+from contextlib import aclosing
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from lxml import etree
+
+from trust_wedo.parsers.http_cache import HttpCache
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Sitemaps protocol limit for one uncompressed file
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024
+# Bodies larger than this are streamed but not kept in the HTTP cache
+MAX_CACHED_SITEMAP_BYTES = 5 * 1024 * 1024
+
+
+def parse_sitemap_directives(robots_txt: str) -> List[str]:
+    """Return the ``Sitemap:`` URLs listed in robots.txt (in order, de-duplicated)."""
+    urls: List[str] = []
+    for raw_line in robots_txt.splitlines():
+        line = raw_line.split("#", 1)[0].strip()
+        if ":" not in line:
+            continue
+        field, value = line.split(":", 1)
+        value = value.strip()
+        if field.strip().lower() == "sitemap" and value and value not in urls:
+            urls.append(value)
+    return urls
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """Parse a W3C datetime ``<lastmod>`` value; None if missing or malformed."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _entry_from_element(elem: Any) -> Optional[Dict[str, Any]]:
+    entry: Dict[str, Any] = {"loc": None, "lastmod": None, "priority": None}
+    for child in elem:
+        if not isinstance(child.tag, str):
+            continue
+        name = etree.QName(child).localname
+        text = (child.text or "").strip()
+        if name == "loc":
+            entry["loc"] = text
+        elif name == "lastmod":
+            entry["lastmod"] = text or None
+        elif name == "priority":
+            try:
+                entry["priority"] = float(text)
+            except ValueError:
+                pass
+    return entry if entry["loc"] else None
+
+
+def _priority_key(entry: Dict[str, Any]) -> Tuple[float, float]:
+    # Higher <priority> first, then most recently modified; missing values sort last
+    priority = entry.get("priority")
+    lastmod = parse_lastmod(entry.get("lastmod"))
+    return (
+        -(priority if priority is not None else 0.5),
+        -(lastmod.timestamp() if lastmod else float("-inf"))
+    )
+
+
+class _SitemapStream:
+    """Incremental parser for one sitemap document (plain or gzip)."""
+
+    def __init__(self, max_bytes: int = MAX_SITEMAP_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self.truncated = False
+        self._inflater = None
+        self._sniffed = False
+        self._parser = etree.XMLPullParser(
+            events=("end",), resolve_entities=False, no_network=True, recover=True
+        )
+
+    def feed(self, chunk: bytes) -> List[Tuple[str, Dict[str, Any]]]:
+        """Feed raw bytes; return completed ``("url"|"sitemap", entry)`` items."""
+        if not self._sniffed:
+            self._sniffed = True
+            if chunk.startswith(GZIP_MAGIC):
+                self._inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if self._inflater is not None:
+            chunk = self._inflater.decompress(chunk)
+        if self.bytes_read + len(chunk) > self.max_bytes:
+            chunk = chunk[:max(0, self.max_bytes - self.bytes_read)]
+            self.truncated = True
+        self.bytes_read += len(chunk)
+        try:
+            self._parser.feed(chunk)
+        except etree.XMLSyntaxError:
+            self.truncated = True
+        return self._drain()
+
+    def _drain(self) -> List[Tuple[str, Dict[str, Any]]]:
+        items = []
+        try:
+            for _, elem in self._parser.read_events():
+                if not isinstance(elem.tag, str):
+                    continue
+                kind = etree.QName(elem).localname
+                if kind not in ("url", "sitemap"):
+                    continue
+                entry = _entry_from_element(elem)
+                if entry:
+                    items.append((kind, entry))
+                # Drop processed siblings so memory stays flat on huge sitemaps
+                elem.clear()
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+        except etree.XMLSyntaxError:
+            self.truncated = True
+        return items
+
+
+class SitemapReader:
+    """Collects candidate page URLs from a site's sitemaps.
+
+    Args:
+        client: Shared ``httpx.AsyncClient``
+        scheduler: Optional HostScheduler; every sitemap request goes through it
+        cache: Optional HttpCache for conditional revalidation of sitemap bodies
+        max_urls: Stop reading once this many page URLs are collected
+        max_sitemaps: Upper bound on sitemap documents fetched (index children included)
+        max_bytes: Per-document cap on uncompressed bytes
+        prioritize: Order results (and index children) by ``<priority>`` then ``<lastmod>``
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        scheduler: Optional[Any] = None,
+        cache: Optional[HttpCache] = None,
+        max_urls: int = 50,
+        max_sitemaps: int = 20,
+        max_bytes: int = MAX_SITEMAP_BYTES,
+        prioritize: bool = True
+    ):
+        self.client = client
+        self.scheduler = scheduler
+        self.cache = cache
+        self.max_urls = max_urls
+        self.max_sitemaps = max_sitemaps
+        self.max_bytes = max_bytes
+        self.prioritize = prioritize
+        self.sitemaps_read: List[str] = []
+
+    async def read(self, sitemap_urls: List[str]) -> List[Dict[str, Any]]:
+        """Walk the given sitemaps (and their index children) breadth-first.
+
+        Returns:
+            Page entries ``{"loc", "lastmod", "priority"}``, at most ``max_urls``.
+        """
+        pending = list(sitemap_urls)
+        seen_sitemaps = set()
+        seen_locs = set()
+        entries: List[Dict[str, Any]] = []
+
+        while pending and len(entries) < self.max_urls and len(self.sitemaps_read) < self.max_sitemaps:
+            sitemap_url = pending.pop(0)
+            if sitemap_url in seen_sitemaps:
+                continue
+            seen_sitemaps.add(sitemap_url)
+
+            children: List[Dict[str, Any]] = []
+            try:
+                async with aclosing(self._iter_entries(sitemap_url)) as items:
+                    async for kind, entry in items:
+                        if kind == "sitemap":
+                            children.append(entry)
+                        elif entry["loc"] not in seen_locs:
+                            seen_locs.add(entry["loc"])
+                            entries.append(entry)
+                            if len(entries) >= self.max_urls:
+                                break
+            except Exception as e:
+                print(f"[WARN] Failed to read sitemap {sitemap_url}: {e}")
+                continue
+
+            if self.prioritize:
+                children.sort(key=_priority_key)
+            pending.extend(child["loc"] for child in children)
+
+        if self.prioritize:
+            entries.sort(key=_priority_key)
+        return entries
+
+    async def _iter_entries(self, sitemap_url: str):
+        """Yield ``(kind, entry)`` from one sitemap, streaming the response body."""
+        self.sitemaps_read.append(sitemap_url)
+        stream = _SitemapStream(self.max_bytes)
+        cached = await self.cache.aget(sitemap_url) if self.cache else None
+
+        if self.scheduler:
+            await self.scheduler.acquire(sitemap_url)
+        async with self.client.stream(
+            "GET", sitemap_url, headers=HttpCache.conditional_headers(cached)
+        ) as resp:
+            if resp.status_code == 304 and cached and cached["body"] is not None:
+                for item in stream.feed(cached["body"]):
+                    yield item
+                return
+            if resp.status_code != 200:
+                return
+
+            raw_chunks: Optional[List[bytes]] = [] if self.cache else None
+            raw_size = 0
+            # Content-Encoding is undone by httpx; .xml.gz payloads are inflated by the stream
+            async for chunk in resp.aiter_bytes():
+                if raw_chunks is not None:
+                    raw_size += len(chunk)
+                    if raw_size > MAX_CACHED_SITEMAP_BYTES:
+                        raw_chunks = None
+                    else:
+                        raw_chunks.append(chunk)
+                for item in stream.feed(chunk):
+                    yield item
+                if stream.truncated:
+                    print(f"[WARN] Sitemap {sitemap_url} exceeded {self.max_bytes} bytes or is malformed, truncating")
+                    return
+
+            # Only complete, reasonably small bodies are worth revalidating later
+            if raw_chunks is not None:
+                await self.cache.astore(sitemap_url, body=b"".join(raw_chunks), **HttpCache.validators(resp.headers))
@@ -0,0 +1,148 @@
+"""Benchmark: single-pass lxml page analyzer vs the previous BeautifulSoup extraction.
+
+Usage:
+    python scripts/bench_page_analyzer.py [--repeat 50]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from urllib.parse import urlparse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from bs4 import BeautifulSoup
+
+from trust_wedo.parsers.page_analyzer import analyze_html, ABOUT_AUTHOR_KEYWORDS, SOCIAL_DOMAINS, get_root_domain
+
+BASE_URL = "https://example.com"
+SAMPLE = os.path.join(os.path.dirname(__file__), '../samples/sample_page.html')
+
+
+def legacy_analyze(content, url, base_url):
+    """The BeautifulSoup extraction SiteParser used before page_analyzer (reference only)."""
+    soup = BeautifulSoup(content, "html.parser")
+
+    schemas = []
+    for script in soup.find_all("script", type="application/ld+json"):
+        if not script.string:
+            continue
+        try:
+            data = json.loads(script.string)
+            if isinstance(data, list):
+                schemas.extend([item for item in data if isinstance(item, dict)])
+            elif isinstance(data, dict):
+                if "@graph" in data and isinstance(data["@graph"], list):
+                    schemas.extend([item for item in data["@graph"] if isinstance(item, dict)])
+                else:
+                    schemas.append(data)
+        except (json.JSONDecodeError, TypeError, KeyError):
+            continue
+
+    types_set = set()
+    for s in schemas:
+        t = s.get('@type')
+        if isinstance(t, list):
+            types_set.update(t)
+        elif t:
+            types_set.add(t)
+
+    title_tag = soup.find("title")
+    has_title = bool(title_tag and title_tag.string and title_tag.string.strip())
+    meta_desc = soup.find("meta", attrs={"name": "description"})
+    if not meta_desc:
+        meta_desc = soup.find("meta", attrs={"property": "og:description"})
+    has_meta_desc = bool(meta_desc and meta_desc.get("content", "").strip())
+
+    base_root = get_root_domain(base_url)
+    external_links = []
+    for link in soup.find_all("a", href=True):
+        href = link.get("href")
+        if href and href.startswith("http"):
+            link_root = get_root_domain(href)
+            if link_root and link_root != base_root:
+                external_links.append(href)
+
+    social_links = []
+    social_platforms = []
+    for link in external_links:
+        for domain, platform in SOCIAL_DOMAINS.items():
+            if domain in link:
+                social_links.append(link)
+                if platform not in social_platforms:
+                    social_platforms.append(platform)
+                break
+
+    return {
+        "has_title": has_title,
+        "has_jsonld": len(types_set) > 0 or bool(soup.find("script", type="application/ld+json")),
+        "schema_types": sorted(types_set),
+        "schemas": schemas,
+        "has_meta": has_meta_desc,
+        "has_favicon": bool(
+            soup.find("link", rel="icon") or
+            soup.find("link", rel="shortcut icon") or
+            soup.find("link", rel="apple-touch-icon")
+        ),
+        "has_viewport": bool(soup.find("meta", attrs={"name": "viewport"})),
+        "title_missing": not has_title,
+        "meta_missing": not has_meta_desc,
+        "is_about_author": any(kw in urlparse(url).path.lower() for kw in ABOUT_AUTHOR_KEYWORDS),
+        "external_links_count": len(external_links),
+        "social_links_count": len(social_links),
+        "social_platforms": social_platforms
+    }
+
+
+def large_page(sections=400):
+    """Synthetic heavy page: deep markup, many links and a few JSON-LD blocks."""
+    body = []
+    for i in range(sections):
+        body.append(
+            f'<section><h2>Section {i}</h2><div><p>' + "Lorem ipsum dolor sit amet. " * 10 +
+            f'</p><a href="/internal/{i}">more</a> <a href="https://partner{i % 7}.org/">partner</a></div></section>'
+        )
+        if i % 100 == 0:
+            body.append(f'<script type="application/ld+json">{{"@type": "Article", "headline": "A{i}"}}</script>')
+    return (
+        '<html><head><title>Large</title><meta name="description" content="Big page">'
+        '<link rel="icon" href="/favicon.ico"></head><body>'
+        + "".join(body)
+        + '<a href="https://github.com/acme">gh</a><a href="https://x.com/acme">x</a></body></html>'
+    ).encode("utf-8")
+
+
+def timed(fn, content, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(content, f"{BASE_URL}/about", BASE_URL)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark page signal extraction")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with open(SAMPLE, "rb") as f:
+        samples = {"sample_page.html": f.read(), "synthetic_large": large_page()}
+
+    for name, content in samples.items():
+        new = analyze_html(content, f"{BASE_URL}/about", BASE_URL)
+        old = legacy_analyze(content, f"{BASE_URL}/about", BASE_URL)
+        new["schema_types"] = sorted(new["schema_types"])
+        new.pop("internal_links")
+        assert new == old, f"Output mismatch on {name}"
+
+        legacy_ms = timed(legacy_analyze, content, args.repeat)
+        single_ms = timed(analyze_html, content, args.repeat)
+        print(
+            f"{name:<20} {len(content) / 1024:8.1f} KB  "
+            f"bs4={legacy_ms:8.2f} ms  lxml={single_ms:8.2f} ms  speedup={legacy_ms / single_ms:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
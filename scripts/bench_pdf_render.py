@@ -0,0 +1,99 @@
+"""Benchmark: server-side PDF report rendering (HTML template + page.set_content).
+
+Runs fully offline: builds a report bundle from a synthetic scan, times the
+HTML template, then (if Chromium is installed) times printing it to PDF on one
+reused page. The frontend path it replaces costs an SPA load + networkidle +
+a fixed 1.5s sleep per PDF.
+
+Usage:
+    python scripts/bench_pdf_render.py [--repeat 20] [--out report.pdf]
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../apps/backend'))
+
+from app.services.report_cache import build_report_bundle
+from app.services.report_html import render_report_html
+from app.services.report_pdf import PDF_OPTIONS
+
+ARTIFACTS = [{
+    "job_id": "bench-0000-0000",
+    "stage": "scan",
+    "jsonb_payload": {
+        "site": "https://example.com",
+        "pages": [{
+            "url": "https://example.com",
+            "title_missing": False,
+            "meta_missing": True,
+            "has_favicon": False,
+            "has_viewport": True,
+            "schemas": [{"@type": "Organization", "name": "Example"}],
+            "social_links": ["https://www.facebook.com/example"]
+        }]
+    }
+}]
+
+
+def bench_html(bundle, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        html = render_report_html(bundle["report"], bundle["pdf"])
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"HTML template:        {elapsed * 1000:8.2f} ms/report ({len(html)} bytes)")
+    return html
+
+
+async def bench_pdf(html, repeat, out):
+    try:
+        from playwright.async_api import async_playwright
+        from pypdf import PdfReader
+    except ImportError:
+        print("[WARN] playwright/pypdf not installed, skipping PDF timing")
+        return
+
+    async with async_playwright() as p:
+        try:
+            browser = await p.chromium.launch(headless=True, args=['--no-sandbox'])
+        except Exception as e:
+            print(f"[WARN] Chromium unavailable ({e.__class__.__name__}), skipping PDF timing")
+            return
+        try:
+            page = await browser.new_page()
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                await page.set_content(html, wait_until='load')
+                pdf_bytes = await page.pdf(**PDF_OPTIONS)
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            pages = len(PdfReader(io.BytesIO(pdf_bytes)).pages)
+            print(f"set_content + pdf:    {timings[len(timings) // 2] * 1000:8.2f} ms/report median "
+                  f"({len(pdf_bytes)} bytes, {pages} page(s))")
+            if out:
+                with open(out, 'wb') as f:
+                    f.write(pdf_bytes)
+                print(f"Wrote {out}")
+        finally:
+            await browser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--out', help='Write the last rendered PDF here')
+    args = parser.parse_args()
+
+    bundle = build_report_bundle({"id": "bench-0000-0000", "url": "https://example.com", "status": "completed"}, ARTIFACTS)
+    html = bench_html(bundle, args.repeat)
+    asyncio.run(bench_pdf(html, args.repeat, args.out))
+    print("Frontend path (previous): SPA load + networkidle + 1500 ms fixed sleep per report")
+
+
+if __name__ == '__main__':
+    main()
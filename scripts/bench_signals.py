@@ -0,0 +1,91 @@
+"""Benchmark: slotted SignalRecord vs the pydantic SiteSignals model.
+
+Measures the three things the report path does with signals: build one and
+assign the extracted fields, serialise it for the report, and score it. Also
+reports per-instance memory with tracemalloc.
+
+Usage:
+    python scripts/bench_signals.py [--count 20000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../apps/backend'))
+
+from app.models.signals import SignalRecord, SiteSignals
+from app.services.batch_scoring import score_batch
+from app.services.scoring import calculate_score_v2
+
+# Roughly what ReportEngine.extract_signals assigns for one page
+FIELDS = {
+    "url": "https://example.com",
+    "has_https": True,
+    "has_title": True,
+    "has_description": False,
+    "has_favicon": True,
+    "page_load_time": 1.4,
+    "is_mobile_friendly": True,
+    "has_jsonld": True,
+    "schema_types": ["Organization", "WebSite"],
+    "schema_count": 2,
+    "has_organization": True,
+    "has_website": True,
+    "schema_analysis": {"score": 18, "details": ["Organization 完整"]},
+    "has_author": True,
+    "social_links_count": 3,
+    "has_social_proof": True,
+    "outbound_links_count": 12,
+    "has_about_page": True,
+}
+
+
+def build(cls, count):
+    items = []
+    for _ in range(count):
+        signals = cls()
+        for name, value in FIELDS.items():
+            setattr(signals, name, value)
+        items.append(signals)
+    return items
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"  {label:<22}{(time.perf_counter() - start) * 1000:9.1f} ms")
+    return result
+
+
+def allocation(cls, count):
+    tracemalloc.start()
+    items = build(cls, count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return current / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark signal representations")
+    parser.add_argument('--count', type=int, default=20000)
+    args = parser.parse_args()
+
+    for cls, serialise in ((SiteSignals, lambda s: s.model_dump()), (SignalRecord, lambda s: s.to_dict())):
+        print(f"{cls.__name__} x {args.count}")
+        items = timed("build + assign", lambda: build(cls, args.count))
+        timed("serialise", lambda: [serialise(s) for s in items])
+        timed("calculate_score_v2", lambda: [calculate_score_v2(s) for s in items])
+        timed("score_batch", lambda: score_batch(items))
+        print(f"  {'bytes / instance':<22}{allocation(cls, args.count):9.0f}")
+
+    record = SignalRecord(**FIELDS)
+    assert record.to_dict() == SiteSignals(**FIELDS).model_dump()
+    print("to_dict() == model_dump(): OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -35,7 +35,7 @@ def test_scoring_v3():
     engine = ReportEngine()
     signals = engine.extract_signals(mock_artifacts)
     
-    print(f"Signals extracted: {signals.model_dump(exclude={'schema_analysis'})}")
+    print(f"Signals extracted: {signals.to_model().model_dump(exclude={'schema_analysis'})}")
     # print(f"Schema Analysis: {signals.schema_analysis}")
     
     # 3. Calculate Score
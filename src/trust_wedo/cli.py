@@ -6,6 +6,8 @@ import asyncio
 from pathlib import Path
 from trust_wedo import __version__
 from trust_wedo.parsers.site_parser import SiteParser
+from trust_wedo.parsers.http_cache import HttpCache
+from trust_wedo.parsers.batch_scanner import BatchScanner, read_urls
 from trust_wedo.core.entity_scorer import EntityScorer
 from trust_wedo.core.afb_builder import AFBBuilder
 from trust_wedo.core.citation_evaluator import CitationEvaluator
@@ -32,19 +34,62 @@ def main(ctx: click.Context, verbose: bool, quiet: bool) -> None:
 
 
 @main.command()
-@click.argument("url")
+@click.argument("url", required=False)
 @click.option("--output", "-o", default="output", help="輸出目錄")
 @click.option("--max-pages", default=10, help="最大掃描頁面數")
+@click.option("--concurrency", default=1, type=click.IntRange(min=1), help="同時抓取的頁面數")
+@click.option("--fetch-mode", type=click.Choice(list(SiteParser.FETCH_MODES)), default="playwright",
+              help="抓取模式：static / playwright / hybrid（先靜態抓取，必要時才用瀏覽器渲染）")
+@click.option("--cache", "cache_path", default=None, type=click.Path(dir_okay=False),
+              help="HTTP 快取檔案 (SQLite)；重複掃描時以 ETag/Last-Modified 跳過未變更頁面")
+@click.option("--crawl-depth", default=2, type=click.IntRange(min=0),
+              help="無 sitemap 時沿站內連結爬取的最大深度（0 表示只掃描首頁）")
+@click.option("--urls-file", default=None, type=click.File("r", encoding="utf-8"),
+              help="批次掃描：每行一個網址（# 開頭為註解），結果逐筆寫入 output/batch.jsonl")
+@click.option("--site-concurrency", default=8, type=click.IntRange(min=1), help="批次掃描時同時掃描的網站數")
+@click.option("--per-host", default=1, type=click.IntRange(min=1), help="批次掃描時同一主機同時掃描的網站數")
+@click.option("--resume/--no-resume", default=True, help="批次掃描時略過 batch.jsonl 中已成功的網址")
+@click.option("--incremental", is_flag=True,
+              help="增量掃描：沿用輸出目錄中上一次的 site.json，只重新抓取 lastmod/ETag/內容有變動的頁面")
 @click.pass_context
-def scan(ctx: click.Context, url: str, output: str, max_pages: int) -> None:
+def scan(ctx: click.Context, url: str, output: str, max_pages: int, concurrency: int, fetch_mode: str,
+         cache_path: str, crawl_depth: int, urls_file, site_concurrency: int, per_host: int, resume: bool,
+         incremental: bool) -> None:
     """掃描網站內容並抽取基礎結構。
     
-    輸出：output/site.json
+    輸出：output/site.json（批次模式：output/batch.jsonl）
     """
+    if urls_file:
+        if url:
+            raise click.UsageError("URL 與 --urls-file 只能擇一")
+        _scan_batch(urls_file, output, max_pages, concurrency, fetch_mode, cache_path, crawl_depth,
+                    site_concurrency, per_host, resume)
+        return
+    if not url:
+        raise click.UsageError("請提供 URL 或 --urls-file")
+    
     click.echo(f"🔍 掃描網站: {url}")
     
-    parser = SiteParser(url, max_pages=max_pages)
-    result = asyncio.run(parser.scan())
+    previous = None
+    previous_path = Path(output) / "site.json"
+    if incremental:
+        if previous_path.exists():
+            with open(previous_path) as f:
+                previous = json.load(f)
+            if previous.get("site", "").rstrip("/") != url.rstrip("/"):
+                click.echo(f"⚠️  {previous_path} 屬於其他網站，改為完整掃描")
+                previous = None
+        else:
+            click.echo(f"⚠️  找不到 {previous_path}，改為完整掃描")
+    
+    cache = HttpCache(cache_path) if cache_path else None
+    parser = SiteParser(url, max_pages=max_pages, concurrency=concurrency, fetch_mode=fetch_mode, cache=cache,
+                        crawl_depth=crawl_depth, previous=previous)
+    try:
+        result = asyncio.run(parser.scan())
+    finally:
+        if cache:
+            cache.close()
     
     output_path = Path(output)
     output_path.mkdir(parents=True, exist_ok=True)
@@ -54,6 +99,16 @@ def scan(ctx: click.Context, url: str, output: str, max_pages: int) -> None:
         json.dump(result, f, indent=2, ensure_ascii=False)
     
     click.echo(f"📁 已儲存至: {site_json_path}")
+    if cache:
+        click.echo(f"♻️  快取命中頁面: {result['fetch_stats']['cached_pages']}")
+    if "incremental" in result:
+        summary = result["incremental"]
+        diff = summary["diff"]
+        click.echo(f"♻️  沿用未變更頁面: {summary['reused_pages']}，重新抓取: {summary['refetched_pages']}")
+        click.echo(f"📊 訊號變動頁面: {len(diff['changed_pages'])}，新增: {len(diff['added_pages'])}，移除: {len(diff['removed_pages'])}")
+    if fetch_mode == "hybrid":
+        stats = result["fetch_stats"]
+        click.echo(f"⚡ 靜態頁面: {stats['static_pages']}，瀏覽器渲染: {stats['rendered_pages']}")
     
     validator = SchemaValidator()
     is_valid, error = validator.validate_file(site_json_path, "site")
@@ -64,6 +119,34 @@ def scan(ctx: click.Context, url: str, output: str, max_pages: int) -> None:
         ctx.exit(1)
 
 
+def _scan_batch(urls_file, output: str, max_pages: int, concurrency: int, fetch_mode: str, cache_path: str,
+                crawl_depth: int, site_concurrency: int, per_host: int, resume: bool) -> None:
+    """批次掃描：共用 HTTP client、瀏覽器與主機排程，逐筆寫入 JSONL。"""
+    jsonl_path = Path(output) / "batch.jsonl"
+    click.echo(f"🔍 批次掃描（{site_concurrency} 個網站並行，每主機 {per_host} 個）→ {jsonl_path}")
+    
+    cache = HttpCache(cache_path) if cache_path else None
+    scanner = BatchScanner(
+        site_concurrency=site_concurrency,
+        page_concurrency=concurrency,
+        per_host=per_host,
+        max_pages=max_pages,
+        fetch_mode=fetch_mode,
+        crawl_depth=crawl_depth,
+        cache=cache
+    )
+    try:
+        stats = asyncio.run(scanner.scan_to_jsonl(read_urls(urls_file), jsonl_path, resume=resume))
+    finally:
+        if cache:
+            cache.close()
+    
+    if stats["skipped"]:
+        click.echo(f"⏭️  已略過先前完成的網址: {stats['skipped']}")
+    click.echo(f"✅ 成功 {stats['ok']}，❌ 失敗 {stats['failed']}，耗時 {stats['elapsed']:.1f} 秒")
+    click.echo(f"⚡ 吞吐量: {stats['sites_per_min']} 個網站/分鐘")
+
+
 @main.group()
 @click.pass_context
 def entity(ctx: click.Context) -> None:
@@ -0,0 +1,191 @@
+"""Per-host politeness scheduler for Trust WEDO crawlers.
+
+Coordinates every request a scan makes to the same host: a token bucket caps
+the request rate, ``Crawl-delay`` from robots.txt lowers it further, and
+429/5xx responses push the whole host back (``Retry-After`` or exponential
+backoff with jitter) instead of each page retrying on its own.
+"""
+
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def parse_crawl_delay(robots_txt: str, user_agent: str = "*") -> Optional[float]:
+    """Return the Crawl-delay for ``user_agent`` (falling back to ``*``) from robots.txt."""
+    delays: Dict[str, float] = {}
+    agents: List[str] = []
+    in_rules = False
+
+    for raw_line in robots_txt.splitlines():
+        line = raw_line.split("#", 1)[0].strip()
+        if not line or ":" not in line:
+            continue
+        field, value = (part.strip() for part in line.split(":", 1))
+        field = field.lower()
+
+        if field == "user-agent":
+            # A user-agent line after rules starts a new group
+            if in_rules:
+                agents = []
+                in_rules = False
+            agents.append(value.lower())
+        elif field == "crawl-delay":
+            in_rules = True
+            try:
+                delay = float(value)
+            except ValueError:
+                continue
+            for agent in agents:
+                delays.setdefault(agent, delay)
+        else:
+            in_rules = True
+
+    agent_key = user_agent.lower()
+    if agent_key in delays:
+        return delays[agent_key]
+    return delays.get("*")
+
+
+class _HostState:
+    """Token bucket state for a single host."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def refill(self, now: float) -> None:
+        elapsed = now - self.updated_at
+        self.tokens = min(float(self.burst), self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+
+class HostScheduler:
+    """Token-bucket rate limiter keyed by host with shared backoff."""
+
+    def __init__(
+        self,
+        rate: float = 4.0,
+        burst: int = 4,
+        base_backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        max_retry_after: float = 120.0,
+        max_crawl_delay: float = 10.0,
+    ):
+        """
+        Args:
+            rate: Default requests per second allowed for each host
+            burst: Requests a host may receive back-to-back before throttling
+            base_backoff: Backoff delay (seconds) for the first retry
+            max_backoff: Upper bound for the computed exponential backoff
+            max_retry_after: Longest server ``Retry-After`` worth waiting for; a
+                longer one makes :meth:`retry_delay` give up on the URL
+            max_crawl_delay: Upper bound for a robots.txt ``Crawl-delay`` (a scan
+                of a few pages must finish within its timeout)
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.max_crawl_delay = max_crawl_delay
+        self._hosts: Dict[str, _HostState] = {}
+
+    @staticmethod
+    def host_for(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = _HostState(self.rate, self.burst)
+            self._hosts[host] = state
+        return state
+
+    def set_rate(self, host: str, rate: float, burst: Optional[int] = None) -> None:
+        """Override the request rate for a host."""
+        state = self._state(host)
+        state.rate = rate
+        if burst is not None:
+            state.burst = max(1, burst)
+            state.tokens = min(state.tokens, float(state.burst))
+
+    def set_crawl_delay(self, host: str, delay: float) -> float:
+        """Apply a robots.txt Crawl-delay: at most one request every ``delay`` seconds.
+
+        The delay is clamped to ``max_crawl_delay``; returns the delay applied (0 for none).
+        """
+        if delay <= 0:
+            return 0.0
+        delay = min(delay, self.max_crawl_delay)
+        state = self._state(host)
+        self.set_rate(host, min(state.rate, 1.0 / delay), burst=1)
+        return delay
+
+    async def acquire(self, url: str) -> None:
+        """Wait until a request to ``url``'s host is allowed."""
+        state = self._state(self.host_for(url))
+        # Holding the lock while sleeping keeps waiters for a host in FIFO order
+        async with state.lock:
+            while True:
+                now = time.monotonic()
+                if now < state.blocked_until:
+                    await asyncio.sleep(state.blocked_until - now)
+                    continue
+                state.refill(now)
+                if state.tokens >= 1:
+                    state.tokens -= 1
+                    return
+                await asyncio.sleep((1 - state.tokens) / state.rate)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter for the given (zero-based) attempt."""
+        delay = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def defer(self, url: str, delay: float) -> None:
+        """Block all requests to ``url``'s host for ``delay`` seconds."""
+        state = self._state(self.host_for(url))
+        state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+
+    def retry_delay(self, url: str, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """Push the host back after a failed attempt and return the delay applied.
+
+        ``Retry-After`` is honoured in full when present; otherwise capped
+        exponential backoff is used. The next :meth:`acquire` for the host waits
+        out the delay. Returns None (host not deferred) when ``Retry-After``
+        exceeds ``max_retry_after``: the caller should give up on the URL.
+        """
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = self.backoff_delay(attempt)
+        elif delay > self.max_retry_after:
+            return None
+        self.defer(url, delay)
+        return delay
@@ -0,0 +1,189 @@
+"""Persistent HTTP cache for repeat scans.
+
+Stores, per URL, the response validators (ETag / Last-Modified), the raw body
+for small resources such as robots.txt and sitemaps, and the page dict that
+SiteParser extracted from it (with the ``fetch_mode`` it was extracted under).
+Repeat scans revalidate with conditional GETs and reuse the stored result on
+``304 Not Modified``. Entries older than ``max_age`` or beyond the newest
+``max_entries`` are pruned when the cache is opened.
+
+The cache is best-effort: scans use ``aget`` / ``astore``, which run the SQLite
+I/O in a thread and log (instead of raising) errors such as ``database is
+locked`` when several scans share one file.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Union
+
+
+class HttpCache:
+    """SQLite-backed HTTP cache keyed by URL.
+
+    Args:
+        path: SQLite file (``:memory:`` for tests)
+        max_age: Drop entries stored more than ``max_age`` seconds ago
+        max_entries: Keep at most this many entries (most recently stored first)
+        timeout: Seconds to wait for another process's write lock
+    """
+
+    def __init__(self, path: Union[str, Path] = "output/http_cache.sqlite", max_age: Optional[float] = None, max_entries: Optional[int] = None, timeout: float = 5.0):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=timeout)
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Readers do not block the writer of a concurrent scan
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB,
+                page TEXT,
+                fetch_mode TEXT,
+                stored_at REAL NOT NULL
+            )
+            """
+        )
+        # Cache files created before fetch_mode was recorded
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(http_cache)")}
+        if "fetch_mode" not in columns:
+            self._conn.execute("ALTER TABLE http_cache ADD COLUMN fetch_mode TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS http_cache_stored_at ON http_cache (stored_at)")
+        self._conn.commit()
+        if max_age is not None or max_entries is not None:
+            self.prune(max_age, max_entries)
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for ``url`` or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body, page, fetch_mode, stored_at FROM http_cache WHERE url = ?",
+                (url,)
+            ).fetchone()
+        if not row:
+            return None
+        etag, last_modified, body, page, fetch_mode, stored_at = row
+        return {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body,
+            "page": json.loads(page) if page else None,
+            "fetch_mode": fetch_mode,
+            "stored_at": stored_at
+        }
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from a cached entry."""
+        headers: Dict[str, str] = {}
+        if not entry:
+            return headers
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    @staticmethod
+    def validators(headers: Mapping[str, str]) -> Dict[str, Optional[str]]:
+        """Extract ETag / Last-Modified from response headers."""
+        lowered = {k.lower(): v for k, v in headers.items()}
+        return {
+            "etag": lowered.get("etag"),
+            "last_modified": lowered.get("last-modified")
+        }
+
+    def store(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        body: Optional[bytes] = None,
+        page: Optional[Dict[str, Any]] = None,
+        fetch_mode: Optional[str] = None
+    ) -> bool:
+        """Store validators plus body and/or page dict. Returns False if there is nothing to revalidate with.
+
+        ``fetch_mode`` records how ``page`` was extracted; it is only reused under the same mode.
+        """
+        if not etag and not last_modified:
+            return False
+        # The connection context commits, or rolls back if the write fails
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO http_cache (url, etag, last_modified, body, page, fetch_mode, stored_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    body = excluded.body,
+                    page = excluded.page,
+                    fetch_mode = excluded.fetch_mode,
+                    stored_at = excluded.stored_at
+                """,
+                (
+                    url,
+                    etag,
+                    last_modified,
+                    body,
+                    json.dumps(page, ensure_ascii=False) if page is not None else None,
+                    fetch_mode,
+                    time.time()
+                )
+            )
+        return True
+
+    async def aget(self, url: str) -> Optional[Dict[str, Any]]:
+        """``get`` off the event loop; a cache error is logged and treated as a miss."""
+        try:
+            return await asyncio.to_thread(self.get, url)
+        except sqlite3.Error as e:
+            print(f"[WARN] HTTP cache read failed for {url}: {e}")
+            return None
+
+    async def astore(self, url: str, **fields: Any) -> bool:
+        """``store`` off the event loop; a cache error is logged and the entry skipped."""
+        try:
+            return await asyncio.to_thread(self.store, url, **fields)
+        except sqlite3.Error as e:
+            print(f"[WARN] HTTP cache write failed for {url}: {e}")
+            return False
+
+    def prune(self, max_age: Optional[float] = None, max_entries: Optional[int] = None) -> int:
+        """Delete entries older than ``max_age`` seconds, then all but the newest ``max_entries``.
+
+        Returns the number of entries removed.
+        """
+        removed = 0
+        with self._lock, self._conn:
+            if max_age is not None:
+                removed += self._conn.execute(
+                    "DELETE FROM http_cache WHERE stored_at < ?", (time.time() - max_age,)
+                ).rowcount
+            if max_entries is not None:
+                removed += self._conn.execute(
+                    """
+                    DELETE FROM http_cache WHERE url NOT IN (
+                        SELECT url FROM http_cache ORDER BY stored_at DESC LIMIT ?
+                    )
+                    """,
+                    (max(0, max_entries),)
+                ).rowcount
+        return removed
+
+    def delete(self, url: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM http_cache WHERE url = ?", (url,))
+
+    def close(self) -> None:
+        self._conn.close()
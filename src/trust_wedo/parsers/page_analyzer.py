@@ -0,0 +1,214 @@
+"""Single-pass page analyzer for Trust WEDO.
+
+Extracts every page-level signal SiteParser needs (title, meta description,
+viewport, favicon, JSON-LD, outbound/social links) in one streaming lxml
+pass over the HTML, instead of building a full tree and walking it once per
+signal.
+"""
+
+import io
+import json
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import urljoin, urlparse
+
+from lxml import etree
+
+from trust_wedo.utils.url import is_crawlable, normalize_url, site_host
+
+# Tags the analyzer cares about; everything else is skipped by the parser
+_TAGS = ("title", "meta", "link", "a", "script")
+
+FAVICON_RELS = {"icon", "apple-touch-icon"}
+
+# URL path keywords that mark about/author/contact pages
+ABOUT_AUTHOR_KEYWORDS = ["about", "author", "team", "contact", "關於", "作者"]
+
+SOCIAL_DOMAINS = {
+    "twitter.com": "Twitter",
+    "x.com": "X (Twitter)",
+    "facebook.com": "Facebook",
+    "linkedin.com": "LinkedIn",
+    "github.com": "GitHub",
+    "instagram.com": "Instagram",
+    "youtube.com": "YouTube",
+    "tiktok.com": "TikTok"
+}
+
+
+def get_root_domain(url_str: str) -> str:
+    """Registrable-ish domain used to decide whether a link is external."""
+    try:
+        netloc = urlparse(url_str).netloc.lower().replace('www.', '')
+        parts = netloc.split('.')
+        if len(parts) >= 2:
+            return f"{parts[-2]}.{parts[-1]}"
+        return netloc
+    except Exception:
+        return ""
+
+
+def is_about_author_url(url: str) -> bool:
+    """Whether the URL path looks like an about/author/contact page."""
+    url_path = urlparse(url).path.lower()
+    return any(kw in url_path for kw in ABOUT_AUTHOR_KEYWORDS)
+
+
+def parse_jsonld(text: Optional[str]) -> List[Dict[str, Any]]:
+    """Flatten one JSON-LD script body into schema objects (lists and @graph included)."""
+    if not text:
+        return []
+    try:
+        data = json.loads(text)
+    except (json.JSONDecodeError, TypeError, ValueError):
+        return []
+
+    # Handle list format
+    if isinstance(data, list):
+        return [item for item in data if isinstance(item, dict)]
+
+    # Handle object format
+    if isinstance(data, dict):
+        # Handle @graph format
+        if "@graph" in data and isinstance(data["@graph"], list):
+            return [item for item in data["@graph"] if isinstance(item, dict)]
+        return [data]
+    return []
+
+
+def _schema_types(schemas: List[Dict[str, Any]]) -> List[str]:
+    types_set = set()
+    for s in schemas:
+        t = s.get('@type')
+        if isinstance(t, list):
+            types_set.update(t)
+        elif t:
+            types_set.add(t)
+    return list(types_set)
+
+
+def analyze_html(content: Union[bytes, str, None], url: str, base_url: str) -> Dict[str, Any]:
+    """Extract page signals from HTML in a single pass.
+
+    Args:
+        content: Raw (bytes) or rendered (str) HTML
+        url: URL of the page (used for about/author detection)
+        base_url: Site URL (used to classify external links)
+
+    Returns:
+        Dict with the signal fields of a SiteParser page dict plus ``has_title``
+        and ``internal_links`` (absolute, normalised same-site page links).
+    """
+    title_text: Optional[str] = None
+    title_seen = False
+    meta_desc: Optional[str] = None
+    og_desc: Optional[str] = None
+    has_viewport = False
+    has_favicon = False
+    has_jsonld_script = False
+    schemas: List[Dict[str, Any]] = []
+    hrefs: List[str] = []
+
+    if content:
+        if isinstance(content, str):
+            source = io.BytesIO(content.encode("utf-8"))
+            encoding = "utf-8"
+        else:
+            source = io.BytesIO(content)
+            encoding = None
+
+        try:
+            for _, elem in etree.iterparse(
+                source, events=("end",), tag=_TAGS, html=True,
+                encoding=encoding, huge_tree=True, no_network=True
+            ):
+                tag = elem.tag
+                if tag == "a":
+                    href = elem.get("href")
+                    if href is not None:
+                        hrefs.append(href)
+                elif tag == "meta":
+                    name = elem.get("name")
+                    if name == "description" and meta_desc is None:
+                        meta_desc = elem.get("content", "")
+                    elif name == "viewport":
+                        has_viewport = True
+                    elif elem.get("property") == "og:description" and og_desc is None:
+                        og_desc = elem.get("content", "")
+                elif tag == "link":
+                    rel = (elem.get("rel") or "").lower().split()
+                    if FAVICON_RELS.intersection(rel):
+                        has_favicon = True
+                elif tag == "script":
+                    if elem.get("type") == "application/ld+json":
+                        has_jsonld_script = True
+                        schemas.extend(parse_jsonld(elem.text))
+                elif tag == "title" and not title_seen:
+                    title_seen = True
+                    title_text = elem.text
+                # Free the subtree as we go so large pages stay flat in memory
+                elem.clear(keep_tail=True)
+        except etree.LxmlError:
+            pass
+
+    schema_types = _schema_types(schemas)
+    has_title = bool(title_text and title_text.strip())
+
+    # Same precedence as before: a present name=description wins even if empty
+    description = meta_desc if meta_desc is not None else og_desc
+    has_meta_desc = bool(description and description.strip())
+
+    base_root = get_root_domain(base_url)
+    external_links = []
+    for href in hrefs:
+        if href.startswith("http"):
+            link_root = get_root_domain(href)
+            if link_root and link_root != base_root:
+                external_links.append(href)
+
+    internal_links: List[str] = []
+    seen_hrefs = set()
+    seen_internal = set()
+    base_host = site_host(base_url)
+    for href in hrefs:
+        href = href.strip()
+        if not href or href in seen_hrefs or href.startswith(("#", "mailto:", "tel:", "javascript:")):
+            continue
+        seen_hrefs.add(href)
+        try:
+            absolute = urljoin(url, href)
+            if site_host(absolute) != base_host or not is_crawlable(absolute):
+                continue
+            normalized = normalize_url(absolute)
+        except ValueError:
+            # Malformed href (bad port, unclosed IPv6 literal...): skip it
+            continue
+        if normalized not in seen_internal:
+            seen_internal.add(normalized)
+            internal_links.append(normalized)
+
+    social_links = []
+    social_platforms: List[str] = []
+    for link in external_links:
+        for domain, platform in SOCIAL_DOMAINS.items():
+            if domain in link:
+                social_links.append(link)
+                if platform not in social_platforms:
+                    social_platforms.append(platform)
+                break
+
+    return {
+        "has_title": has_title,
+        "has_jsonld": len(schema_types) > 0 or has_jsonld_script,
+        "schema_types": schema_types,
+        "schemas": schemas,
+        "has_meta": has_meta_desc,
+        "has_favicon": has_favicon,
+        "has_viewport": has_viewport,
+        "title_missing": not has_title,
+        "meta_missing": not has_meta_desc,
+        "is_about_author": is_about_author_url(url),
+        "external_links_count": len(external_links),
+        "social_links_count": len(social_links),
+        "social_platforms": social_platforms,
+        "internal_links": internal_links
+    }
@@ -2,28 +2,62 @@
 Playwright-based parser for dynamic content rendering.
 Handles SPA websites (React/Vue/Angular) and basic anti-scraping.
 """
+import asyncio
 import logging
-import random
-from typing import Optional
+import time
+from typing import Any, Dict, Optional
 from playwright.async_api import async_playwright, Browser, Page, TimeoutError as PlaywrightTimeoutError
+from trust_wedo.parsers.context_pool import BrowserContextPool
 
 logger = logging.getLogger(__name__)
 
-# Common User Agents to rotate
-USER_AGENTS = [
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15"
-]
+# Resolves once the DOM has stopped changing. Pages carrying framework
+# hydration markers must also expose JSON-LD (or stay quiet for a longer
+# window) before they count as ready; maxMs is the hard upper bound.
+READINESS_SCRIPT = """
+({ quietMs, maxMs }) => new Promise((resolve) => {
+    const start = performance.now();
+    let lastMutation = start;
+    const observer = new MutationObserver(() => { lastMutation = performance.now(); });
+    observer.observe(document, { childList: true, subtree: true, attributes: true, characterData: true });
+
+    const hydrationMarkers = '#__next, #__nuxt, #___gatsby, [data-reactroot], [ng-version], [data-v-app], [data-server-rendered], #root, #app';
+    const check = () => {
+        const now = performance.now();
+        const quietFor = now - lastMutation;
+        const hasJsonLd = !!document.querySelector('script[type="application/ld+json"]');
+        const isSpa = !!document.querySelector(hydrationMarkers);
+        const ready = (quietFor >= quietMs && (hasJsonLd || !isSpa)) || quietFor >= quietMs * 4;
+        if (ready || now - start >= maxMs) {
+            observer.disconnect();
+            clearInterval(timer);
+            resolve(Math.round(now - start));
+        }
+    };
+    const timer = setInterval(check, 50);
+    check();
+})
+"""
 
 class PlaywrightParser:
     """Parser that uses headless Chromium to render JS-heavy websites."""
 
-    def __init__(self, browser: Optional[Browser] = None):
+    def __init__(
+        self,
+        browser: Optional[Browser] = None,
+        context_pool: Optional[BrowserContextPool] = None,
+        pool_size: int = 4,
+        hydration_timeout_ms: int = 3000,
+        hydration_quiet_ms: int = 300
+    ):
         self.playwright = None
-        self.browser: Optional[Browser] = browser
-        self._owns_browser = browser is None
+        self.hydration_timeout_ms = hydration_timeout_ms
+        self.hydration_quiet_ms = hydration_quiet_ms
+        self.context_pool = context_pool
+        self.browser: Optional[Browser] = browser or (context_pool.browser if context_pool else None)
+        self.pool_size = pool_size
+        self._owns_browser = self.browser is None
+        self._owns_pool = context_pool is None
 
     async def __aenter__(self):
         """Initialize Playwright and launch browser if not provided."""
@@ -45,10 +79,15 @@ class PlaywrightParser:
                 if self.playwright:
                     await self.playwright.stop()
                 raise
+        if not self.context_pool:
+            self.context_pool = BrowserContextPool(self.browser, size=self.pool_size)
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Cleanup browser and Playwright resources if owned."""
+        if self._owns_pool and self.context_pool:
+            await self.context_pool.close()
+            self.context_pool = None
         if self._owns_browser:
             if self.browser:
                 await self.browser.close()
@@ -66,95 +105,113 @@ class PlaywrightParser:
         Returns:
             Rendered HTML content string, or None if failed.
         """
-        if not self.browser:
+        result = await self.fetch_page(url, timeout)
+        return result["content"] if result else None
+
+    async def fetch_page(self, url: str, timeout: int = 45000) -> Optional[Dict[str, Any]]:
+        """
+        Fetch URL and return the rendered HTML with fetch details.
+
+        Returns:
+            Dict with ``content``, ``status`` (None if unknown), response ``headers``
+            and ``hydration_wait_ms`` (time spent waiting for readiness), or None if failed.
+        """
+        if not self.context_pool:
             raise RuntimeError("Browser not initialized. Use 'async with PlaywrightParser() as parser:' context.")
-            
-        page: Optional[Page] = None
-        context = None
-        
+
         try:
             logger.info(f"[Playwright] Starting fetch for {url}")
-            # Create new context for isolation (cookies, storage, etc.)
-            context = await self.browser.new_context(
-                user_agent=random.choice(USER_AGENTS),
-                viewport={'width': 1280, 'height': 800},
-                locale='en-US',
-                # Basic bot mitigation: Disable webdriver flag (simple approach)
-                # java_script_enabled=True # Default is True
+            # Lease a warm page; the pool resets cookies/storage when it is returned
+            async with self.context_pool.lease() as page:
+                return await self._render(page, url)
+        except Exception as e:
+            logger.error(f"[Playwright] Page error for {url}: {e}")
+            return None
+
+    async def _wait_until_ready(self, page: Page) -> int:
+        """Adaptive hydration wait; returns the milliseconds actually waited."""
+        started = time.monotonic()
+        try:
+            return await asyncio.wait_for(
+                page.evaluate(READINESS_SCRIPT, {
+                    "quietMs": self.hydration_quiet_ms,
+                    "maxMs": self.hydration_timeout_ms
+                }),
+                timeout=self.hydration_timeout_ms / 1000 + 2
             )
+        except Exception as e:
+            logger.warning(f"[Playwright] Readiness check failed: {e}")
+            return int((time.monotonic() - started) * 1000)
+
+    async def _render(self, page: Page, url: str) -> Optional[Dict[str, Any]]:
+        """Navigate a leased page to ``url`` and return the rendered HTML with fetch details."""
+        status = None
+        headers = {}
+        hydration_wait_ms = 0
+        # Navigate
+        # networkidle is important for SPAs to finish initial rendering
+        try:
+            logger.debug(f"[Playwright] Navigating to {url} (networkidle)...")
+            # 1. Navigation with extended timeout (30s)
+            response = await page.goto(url, wait_until='networkidle', timeout=30000)
             
-            page = await context.new_page()
-            
-            # Resource optimization: Block images/fonts/media
-            await page.route("**/*", lambda route: route.abort() 
-                if route.request.resource_type in ["image", "media", "font"] 
-                else route.continue_())
+            if not response:
+                logger.error(f"[Playwright] No response for {url}")
+                return None
+            status = response.status
+            headers = response.headers
+                
+            # Handle error status codes
+            if response.status >= 400:
+                logger.warning(f"[Playwright] Status {response.status} for {url}")
+                # For 403/401, it's likely blocking. We log it.
+                if response.status in [403, 401]:
+                     logger.warning(f"[Playwright] Access denied (Anti-scraping?) for {url}")
+                     
+            # 2. Explicitly wait for DOM to be present (Hydration check)
+            try:
+                logger.debug(f"[Playwright] Waiting for 'body' selector...")
+                # Wait for body to be attached to DOM
+                await page.wait_for_selector('body', timeout=10000)
+            except Exception as e:
+                logger.warning(f"[Playwright] Timeout waiting for body selector on {url}: {e}")
+
+            # 3. Adaptive wait for React/Vue hydration (Critical for Scoring 2.0)
+            # Some SPAs render 'body' but content comes later via JS
+            hydration_wait_ms = await self._wait_until_ready(page)
+            logger.debug(f"[Playwright] Hydration wait: {hydration_wait_ms}ms")
             
-            # Navigate
-            # networkidle is important for SPAs to finish initial rendering
+        except PlaywrightTimeoutError:
+            logger.warning(f"[Playwright] Navigation timeout for {url} (networkidle). Retrying with domcontentloaded.")
             try:
-                logger.debug(f"[Playwright] Navigating to {url} (networkidle)...")
-                # 1. Navigation with extended timeout (30s)
-                response = await page.goto(url, wait_until='networkidle', timeout=30000)
-                
-                if not response:
-                    logger.error(f"[Playwright] No response for {url}")
-                    return None
-                    
-                # Handle error status codes
-                if response.status >= 400:
-                    logger.warning(f"[Playwright] Status {response.status} for {url}")
-                    # For 403/401, it's likely blocking. We log it.
-                    if response.status in [403, 401]:
-                         logger.warning(f"[Playwright] Access denied (Anti-scraping?) for {url}")
-                         
-                # 2. Explicitly wait for DOM to be present (Hydration check)
-                try:
-                    logger.debug(f"[Playwright] Waiting for 'body' selector...")
-                    # Wait for body to be attached to DOM
-                    await page.wait_for_selector('body', timeout=10000)
-                except Exception as e:
-                    logger.warning(f"[Playwright] Timeout waiting for body selector on {url}: {e}")
+                 response = await page.goto(url, wait_until='domcontentloaded', timeout=15000)
+                 status = response.status if response else None
+                 headers = response.headers if response else {}
+                 hydration_wait_ms = await self._wait_until_ready(page) # Wait for hydration
+                 logger.debug(f"[Playwright] Hydration wait after retry: {hydration_wait_ms}ms")
+            except Exception as e:
+                 logger.error(f"[Playwright] Fallback navigation failed: {e}")
 
-                # 3. Fixed delay for React/Vue hydration (Critical for Scoring 2.0)
-                # Some SPAs render 'body' but content comes later via JS
-                logger.debug(f"[Playwright] Hydration buffer (3s)...")
-                await page.wait_for_timeout(3000)
+        # Get full rendered HTML (whether fully idle or timed out)
+        try:
+            content = await page.content()
+            if content:
+                size_kb = len(content) / 1024
+                has_schema = 'application/ld+json' in content
+                logger.info(f"[Playwright] Successfully fetched {url}. Size: {size_kb:.1f}KB, Has Schema: {has_schema}, Hydration: {hydration_wait_ms}ms")
                 
-            except PlaywrightTimeoutError:
-                logger.warning(f"[Playwright] Navigation timeout for {url} (networkidle). Retrying with domcontentloaded.")
-                try:
-                     response = await page.goto(url, wait_until='domcontentloaded', timeout=15000)
-                     logger.debug(f"[Playwright] Hydration buffer after retry (3s)...")
-                     await page.wait_for_timeout(3000) # Wait for hydration
-                except Exception as e:
-                     logger.error(f"[Playwright] Fallback navigation failed: {e}")
-
-            # Get full rendered HTML (whether fully idle or timed out)
-            try:
-                content = await page.content()
-                if content:
-                    size_kb = len(content) / 1024
-                    has_schema = 'application/ld+json' in content
-                    logger.info(f"[Playwright] Successfully fetched {url}. Size: {size_kb:.1f}KB, Has Schema: {has_schema}")
-                    
-                    if len(content) < 1000:
-                        logger.warning(f"[Playwright] Warning: Content size very small ({len(content)} bytes). Might be blocked or empty.")
-                    
-                    if not has_schema and "wedopr" in url:
-                        logger.warning(f"[Playwright] Warning: No Schema.org detected for wedopr. Check hydration.")
+                if len(content) < 1000:
+                    logger.warning(f"[Playwright] Warning: Content size very small ({len(content)} bytes). Might be blocked or empty.")
                 
-                return content
-            except Exception as e:
-                logger.error(f"[Playwright] Failed to get page content: {e}")
-                return None
+                if not has_schema and "wedopr" in url:
+                    logger.warning(f"[Playwright] Warning: No Schema.org detected for wedopr. Check hydration.")
             
+            return {
+                "content": content,
+                "status": status,
+                "headers": headers,
+                "hydration_wait_ms": hydration_wait_ms
+            }
         except Exception as e:
-            logger.error(f"[Playwright] Page error for {url}: {e}")
+            logger.error(f"[Playwright] Failed to get page content: {e}")
             return None
-            
-        finally:
-            if page:
-                await page.close()
-            if context:
-                await context.close()
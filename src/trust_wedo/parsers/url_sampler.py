@@ -0,0 +1,107 @@
+"""Page sampling for Trust WEDO scans.
+
+Chooses which sitemap URLs to spend the ``max_pages`` budget on: the homepage
+first (reports read site-level signals from ``pages[0]``), then identity pages
+(about / contact / author), then one URL per path template in round-robin so
+ten near-identical product pages do not crowd out the rest of the site.
+"""
+
+import re
+from collections import OrderedDict
+from typing import Dict, List
+from urllib.parse import unquote, urlparse
+
+from trust_wedo.parsers.page_analyzer import ABOUT_AUTHOR_KEYWORDS
+
+_NUMERIC_RE = re.compile(r"^\d+$")
+_ID_RE = re.compile(r"^(?=.*\d)[0-9a-f-]{8,}$", re.I)
+
+
+def path_template(url: str) -> str:
+    """Collapse a URL path into a template used to cluster similar pages.
+
+    Numeric and id-like segments become ``{n}`` / ``{id}``; for paths two or
+    more segments deep the leaf becomes ``*`` (``/products/blue-shirt`` and
+    ``/products/red-hat`` share ``/products/*``). Top-level pages such as
+    ``/pricing`` keep their own template.
+    """
+    segments = [s for s in urlparse(url).path.lower().split("/") if s]
+    if not segments:
+        return "/"
+    template = []
+    for segment in segments:
+        if _NUMERIC_RE.match(segment):
+            template.append("{n}")
+        elif _ID_RE.match(segment):
+            template.append("{id}")
+        else:
+            template.append(segment)
+    if len(template) >= 2 and template[-1] not in ("{n}", "{id}"):
+        template[-1] = "*"
+    return "/" + "/".join(template)
+
+
+def identity_keyword(url: str) -> str:
+    """Return the about/author/contact keyword the URL path matches, or ''."""
+    path = unquote(urlparse(url).path).lower()
+    for keyword in ABOUT_AUTHOR_KEYWORDS:
+        if keyword in path:
+            return keyword
+    return ""
+
+
+def _is_homepage(url: str, base_url: str) -> bool:
+    parsed = urlparse(url)
+    base = urlparse(base_url)
+    return (
+        parsed.netloc.lower().replace("www.", "") == base.netloc.lower().replace("www.", "")
+        and parsed.path.strip("/") == base.path.strip("/")
+        and not parsed.query
+    )
+
+
+def sample_urls(urls: List[str], base_url: str, max_pages: int) -> List[str]:
+    """Pick a diverse set of at most ``max_pages`` URLs to scan.
+
+    Order: homepage (added if the sitemap omits it), identity pages (one per
+    keyword, shallowest first, up to a third of the budget), then a round-robin
+    over path-template clusters in the order they first appear in ``urls``.
+    """
+    if max_pages <= 0:
+        return []
+
+    selected: List[str] = []
+    chosen = set()
+
+    def take(url: str) -> None:
+        if url not in chosen and len(selected) < max_pages:
+            chosen.add(url)
+            selected.append(url)
+
+    homepage = next((u for u in urls if _is_homepage(u, base_url)), base_url)
+    take(homepage)
+
+    identity_budget = max(1, max_pages // 3)
+    identity: Dict[str, str] = {}
+    for url in sorted(urls, key=lambda u: urlparse(u).path.count("/")):
+        keyword = identity_keyword(url)
+        if keyword and keyword not in identity and url not in chosen:
+            identity[keyword] = url
+    for url in list(identity.values())[:identity_budget]:
+        take(url)
+
+    clusters: "OrderedDict[str, List[str]]" = OrderedDict()
+    for url in urls:
+        if url not in chosen:
+            clusters.setdefault(path_template(url), []).append(url)
+
+    while len(selected) < max_pages and clusters:
+        for template in list(clusters):
+            members = clusters[template]
+            take(members.pop(0))
+            if not members:
+                del clusters[template]
+            if len(selected) >= max_pages:
+                break
+
+    return selected
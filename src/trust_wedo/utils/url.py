@@ -0,0 +1,59 @@
+"""URL normalisation helpers for Trust WEDO."""
+
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+# Query parameters that only carry campaign/click tracking
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "yclid", "dclid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "igshid", "ref_src"
+}
+
+# Links to these are not HTML pages worth scanning
+NON_HTML_EXTENSIONS = (
+    ".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".ico",
+    ".css", ".js", ".json", ".xml", ".zip", ".gz", ".mp3", ".mp4", ".mov", ".avi",
+    ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx"
+)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used to deduplicate URLs.
+
+    Lower-cases scheme and host, drops default ports, fragments, tracking
+    parameters (``utm_*``, ``gclid``, ...) and trailing slashes, and sorts the
+    remaining query parameters.
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    netloc = host
+    if parsed.port and parsed.port != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parsed.port}"
+
+    path = parsed.path.rstrip("/")
+    query = ""
+    if parsed.query:
+        query = urlencode(sorted(
+            (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+            if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+        ))
+    return urlunparse((scheme, netloc, path, "", query, ""))
+
+
+def site_host(url: str) -> str:
+    """Lower-cased host with any leading ``www.`` removed."""
+    return (urlparse(url).hostname or "").lower().removeprefix("www.")
+
+
+def same_site(url: str, base_url: str) -> bool:
+    """Whether ``url`` is on the same host as ``base_url`` (``www.`` ignored)."""
+    host = site_host(url)
+    return bool(host) and host == site_host(base_url)
+
+
+def is_crawlable(url: str) -> bool:
+    """HTTP(S) URL that plausibly points at an HTML page."""
+    parsed = urlparse(url)
+    return parsed.scheme in ("http", "https") and not parsed.path.lower().endswith(NON_HTML_EXTENSIONS)
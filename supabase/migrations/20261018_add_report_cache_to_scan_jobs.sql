@@ -0,0 +1,3 @@
+-- Materialised report bundle (report, dimensions, PDF inputs) keyed by its "version" field
+-- (ReportEngine.VERSION); written by the worker when a scan completes.
+ALTER TABLE scan_jobs ADD COLUMN IF NOT EXISTS report_cache JSONB;
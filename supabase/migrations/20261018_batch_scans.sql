@@ -0,0 +1,6 @@
+-- Batch (portfolio) scans: one scan_jobs row per URL, grouped by batch_id.
+ALTER TABLE scan_jobs ADD COLUMN IF NOT EXISTS batch_id UUID;
+
+CREATE INDEX IF NOT EXISTS scan_jobs_batch_idx
+    ON scan_jobs (batch_id, created_at)
+    WHERE batch_id IS NOT NULL;
@@ -0,0 +1,19 @@
+-- Fetch a scan job and all of its artifacts in a single round trip (org-scoped).
+CREATE OR REPLACE FUNCTION get_scan_with_artifacts(p_job_id TEXT, p_org_id TEXT)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'job', to_jsonb(j),
+        'artifacts', COALESCE(
+            (SELECT jsonb_agg(to_jsonb(a)) FROM artifacts a WHERE a.job_id = j.id),
+            '[]'::jsonb
+        )
+    )
+    FROM scan_jobs j
+    WHERE j.id::text = p_job_id
+      AND j.org_id::text = p_org_id;
+$$;
+
+CREATE INDEX IF NOT EXISTS artifacts_job_id_idx ON artifacts (job_id);
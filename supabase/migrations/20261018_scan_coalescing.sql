@@ -0,0 +1,8 @@
+-- Identical scans (same normalised URL + parser options) share one crawl: new jobs
+-- reuse a recently completed scan with the same scan_key instead of re-scanning.
+ALTER TABLE scan_jobs ADD COLUMN IF NOT EXISTS scan_key TEXT;
+ALTER TABLE scan_jobs ADD COLUMN IF NOT EXISTS completed_at TIMESTAMPTZ;
+
+CREATE INDEX IF NOT EXISTS scan_jobs_scan_key_completed_idx
+    ON scan_jobs (scan_key, completed_at DESC)
+    WHERE status = 'completed';
@@ -0,0 +1,47 @@
+-- Turn scan_jobs into a work queue: workers claim jobs with a lease, renew it with
+-- heartbeats, and expired leases are re-claimed (up to max_attempts).
+ALTER TABLE scan_jobs ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE scan_jobs ADD COLUMN IF NOT EXISTS max_attempts INTEGER NOT NULL DEFAULT 3;
+ALTER TABLE scan_jobs ADD COLUMN IF NOT EXISTS lease_owner TEXT;
+ALTER TABLE scan_jobs ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ;
+ALTER TABLE scan_jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMPTZ;
+
+CREATE INDEX IF NOT EXISTS scan_jobs_claimable_idx
+    ON scan_jobs (created_at)
+    WHERE status IN ('pending', 'processing');
+
+-- Atomically lease the oldest claimable job. SKIP LOCKED lets many workers poll concurrently.
+CREATE OR REPLACE FUNCTION claim_scan_job(p_worker_id TEXT, p_lease_seconds INTEGER)
+RETURNS SETOF scan_jobs
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Jobs whose worker died on their last attempt will never be claimed again
+    UPDATE scan_jobs
+    SET status = 'failed',
+        progress_stage = '分析失敗',
+        error_message = COALESCE(error_message, 'Worker lease expired'),
+        lease_owner = NULL
+    WHERE status = 'processing'
+      AND lease_expires_at < now()
+      AND attempts >= max_attempts;
+
+    RETURN QUERY
+    UPDATE scan_jobs
+    SET status = 'processing',
+        attempts = scan_jobs.attempts + 1,
+        lease_owner = p_worker_id,
+        lease_expires_at = now() + make_interval(secs => p_lease_seconds),
+        heartbeat_at = now(),
+        started_at = COALESCE(scan_jobs.started_at, now())
+    WHERE id = (
+        SELECT id FROM scan_jobs
+        WHERE attempts < max_attempts
+          AND (status = 'pending' OR (status = 'processing' AND lease_expires_at < now()))
+        ORDER BY created_at
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING scan_jobs.*;
+END;
+$$;
@@ -0,0 +1,22 @@
+-- Live scan progress across processes: out-of-process workers write progress_stage /
+-- status to scan_jobs; this trigger forwards each change on the scan_progress channel,
+-- and every API process LISTENs once and fans the events out to its SSE viewers.
+CREATE OR REPLACE FUNCTION notify_scan_progress() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pg_notify('scan_progress', json_build_object(
+        'id', NEW.id,
+        'status', NEW.status,
+        'progress_stage', NEW.progress_stage,
+        'error_message', left(NEW.error_message, 1000)  -- NOTIFY payloads are capped at 8000 bytes
+    )::text);
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS scan_jobs_progress_notify ON scan_jobs;
+CREATE TRIGGER scan_jobs_progress_notify
+    AFTER UPDATE OF progress_stage, status ON scan_jobs
+    FOR EACH ROW
+    WHEN (OLD.progress_stage IS DISTINCT FROM NEW.progress_stage OR OLD.status IS DISTINCT FROM NEW.status)
+    EXECUTE FUNCTION notify_scan_progress();
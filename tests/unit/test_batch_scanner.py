@@ -0,0 +1,85 @@
+import asyncio
+import json
+from trust_wedo.parsers.batch_scanner import BatchScanner, completed_urls, read_urls
+
+
+def fake_scanner(delays, **kwargs):
+    scanner = BatchScanner(**kwargs)
+    active = {"sites": 0, "peak": 0, "hosts": {}, "host_peak": 0, "scanned": []}
+
+    async def fake_scan(self):
+        host = self.base_url.split("/")[2]
+        active["sites"] += 1
+        active["hosts"][host] = active["hosts"].get(host, 0) + 1
+        active["peak"] = max(active["peak"], active["sites"])
+        active["host_peak"] = max(active["host_peak"], active["hosts"][host])
+        await asyncio.sleep(delays.get(self.base_url, 0.01))
+        active["sites"] -= 1
+        active["hosts"][host] -= 1
+        active["scanned"].append(self.base_url)
+        if "broken" in self.base_url:
+            raise RuntimeError("connection refused")
+        return {"site": self.base_url, "pages": [{"url": self.base_url, "fetched": "unreachable" not in self.base_url}]}
+
+    return scanner, active, fake_scan
+
+
+def test_read_urls_skips_comments_and_duplicates():
+    lines = ["# clients\n", "example.com\n", "https://example.com/\n", "\n", "http://other.org  # legacy\n"]
+
+    assert list(read_urls(lines)) == ["https://example.com", "http://other.org"]
+
+
+def test_read_urls_skips_invalid_urls(capsys):
+    lines = ["example.com:abc\n", "http://[::1/x\n", "good.com\n"]
+
+    assert list(read_urls(lines)) == ["https://good.com"]
+    assert "invalid URL" in capsys.readouterr().out
+
+
+def test_invalid_url_is_recorded_without_aborting_batch(tmp_path, monkeypatch):
+    scanner, active, fake_scan = fake_scanner({})
+    monkeypatch.setattr("trust_wedo.parsers.site_parser.SiteParser.scan", fake_scan)
+
+    urls = ["https://a.com", "http://[::1/x", "https://b.com"]
+    stats = asyncio.run(scanner.scan_to_jsonl(urls, tmp_path / "batch.jsonl"))
+
+    assert sorted(active["scanned"]) == ["https://a.com", "https://b.com"]
+    assert stats == {**stats, "ok": 2, "failed": 1}
+    records = {r["url"]: r for r in map(json.loads, (tmp_path / "batch.jsonl").read_text().splitlines())}
+    assert records["http://[::1/x"] == {**records["http://[::1/x"], "status": "error", "error": "invalid URL"}
+
+
+def test_batch_respects_global_and_per_host_limits(tmp_path, monkeypatch):
+    urls = [f"https://site{i}.example.com" for i in range(6)] + ["https://shared.com/a", "https://shared.com/b"]
+    scanner, active, fake_scan = fake_scanner({}, site_concurrency=3, per_host=1)
+    monkeypatch.setattr("trust_wedo.parsers.site_parser.SiteParser.scan", fake_scan)
+
+    stats = asyncio.run(scanner.scan_to_jsonl(urls, tmp_path / "batch.jsonl"))
+
+    assert active["peak"] == 3
+    assert active["host_peak"] == 1
+    assert stats["ok"] == 8 and stats["failed"] == 0
+    assert stats["sites_per_min"] > 0
+    records = [json.loads(line) for line in (tmp_path / "batch.jsonl").read_text().splitlines()]
+    assert sorted(r["url"] for r in records) == sorted(urls)
+
+
+def test_resume_skips_completed_sites_and_retries_failures(tmp_path, monkeypatch):
+    jsonl = tmp_path / "batch.jsonl"
+    jsonl.write_text(
+        json.dumps({"url": "https://a.com", "status": "ok", "result": {}}) + "\n"
+        + json.dumps({"url": "https://broken.com", "status": "error", "error": "boom"}) + "\n"
+        + '{"url": "https://c.com", "sta'
+    )
+    scanner, active, fake_scan = fake_scanner({})
+    monkeypatch.setattr("trust_wedo.parsers.site_parser.SiteParser.scan", fake_scan)
+
+    urls = ["https://a.com/", "https://broken.com", "https://c.com", "https://unreachable.com"]
+    stats = asyncio.run(scanner.scan_to_jsonl(urls, jsonl))
+
+    assert sorted(active["scanned"]) == ["https://broken.com", "https://c.com", "https://unreachable.com"]
+    assert stats == {**stats, "ok": 1, "failed": 2, "skipped": 1}
+    assert completed_urls(jsonl) == {"https://a.com", "https://c.com"}
+    # The interrupted line stays isolated and every new record is valid JSON
+    assert json.loads(jsonl.read_text().splitlines()[-1])["status"] in ("ok", "error")
@@ -0,0 +1,111 @@
+import asyncio
+import pytest
+
+pytest.importorskip("playwright")
+
+from trust_wedo.parsers.context_pool import BrowserContextPool
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+        self.url = "about:blank"
+        self.evaluated = []
+
+    def is_closed(self):
+        return self.closed
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def evaluate(self, script):
+        self.evaluated.append(script)
+
+    async def goto(self, url, **kwargs):
+        self.url = url
+
+
+class FakeContext:
+    def __init__(self):
+        self.page = FakePage()
+        self.closed = False
+        self.cookies_cleared = 0
+
+    async def new_page(self):
+        return self.page
+
+    async def clear_cookies(self):
+        self.cookies_cleared += 1
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    def is_connected(self):
+        return True
+
+    async def new_context(self, **kwargs):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+
+def test_lease_reuses_context_and_resets_state():
+    browser = FakeBrowser()
+    pool = BrowserContextPool(browser, size=2)
+
+    async def run():
+        async with pool.lease() as page:
+            await page.goto("https://a.example.com")
+        async with pool.lease() as page:
+            assert page.url == "about:blank"
+
+    asyncio.run(run())
+    assert len(browser.contexts) == 1
+    assert browser.contexts[0].cookies_cleared == 2
+
+
+def test_pool_bounds_concurrent_leases():
+    browser = FakeBrowser()
+    pool = BrowserContextPool(browser, size=2)
+    active = 0
+    peak = 0
+
+    async def use():
+        nonlocal active, peak
+        async with pool.lease():
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    async def run():
+        await asyncio.gather(*(use() for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+    assert len(browser.contexts) == 2
+
+
+def test_recycles_after_max_navigations_and_unhealthy_pages():
+    browser = FakeBrowser()
+    pool = BrowserContextPool(browser, size=1, max_navigations=2)
+
+    async def run():
+        for _ in range(3):
+            async with pool.lease():
+                pass
+        async with pool.lease() as page:
+            page.closed = True
+        async with pool.lease():
+            pass
+        await pool.close()
+
+    asyncio.run(run())
+    assert browser.contexts[0].closed
+    assert len(browser.contexts) == 3
+    assert all(context.closed for context in browser.contexts)
@@ -0,0 +1,81 @@
+import asyncio
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from trust_wedo.parsers.host_scheduler import HostScheduler, parse_crawl_delay, parse_retry_after
+
+
+def test_parse_retry_after_seconds_and_date():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("not-a-date") is None
+
+    future = datetime.now(timezone.utc) + timedelta(seconds=30)
+    delay = parse_retry_after(format_datetime(future, usegmt=True))
+    assert 25 <= delay <= 31
+
+
+def test_parse_crawl_delay_prefers_specific_agent():
+    robots = """
+User-agent: googlebot
+Crawl-delay: 1
+
+User-agent: *
+Disallow: /private
+Crawl-delay: 5
+"""
+    assert parse_crawl_delay(robots) == 5.0
+    assert parse_crawl_delay(robots, user_agent="Googlebot") == 1.0
+    assert parse_crawl_delay("User-agent: *\nDisallow:") is None
+
+
+def test_token_bucket_limits_rate_per_host():
+    scheduler = HostScheduler(rate=20.0, burst=1)
+
+    async def run():
+        start = time.monotonic()
+        for _ in range(3):
+            await scheduler.acquire("https://example.com/a")
+        # A different host has its own bucket
+        await scheduler.acquire("https://other.com/")
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(run())
+    assert 0.09 <= elapsed < 0.5
+
+
+def test_retry_delay_blocks_host_and_caps_backoff():
+    scheduler = HostScheduler(base_backoff=1.0, max_backoff=4.0, max_retry_after=120.0)
+
+    assert scheduler.retry_delay("https://example.com/", 0, retry_after="2") == 2.0
+    # Retry-After is honoured beyond max_backoff, and past max_retry_after the URL is given up
+    assert scheduler.retry_delay("https://example.com/", 0, retry_after="120") == 120.0
+    assert scheduler.retry_delay("https://other.com/", 0, retry_after="3600") is None
+    assert scheduler._state("other.com").blocked_until == 0.0
+    for attempt in range(6):
+        assert 0 < scheduler.backoff_delay(attempt) <= 4.0
+
+    scheduler.defer("https://slow.com/", 0.1)
+
+    async def run():
+        start = time.monotonic()
+        await scheduler.acquire("https://slow.com/page")
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.09
+
+
+def test_crawl_delay_lowers_rate():
+    scheduler = HostScheduler(rate=10.0, burst=5)
+    scheduler.set_crawl_delay("example.com", 2)
+    state = scheduler._state("example.com")
+    assert state.rate == 0.5
+    assert state.burst == 1
+
+
+def test_crawl_delay_is_clamped():
+    scheduler = HostScheduler(rate=10.0, burst=5, max_crawl_delay=10.0)
+
+    assert scheduler.set_crawl_delay("example.com", 60) == 10.0
+    assert scheduler._state("example.com").rate == 0.1
+    assert scheduler.set_crawl_delay("other.com", 0) == 0.0
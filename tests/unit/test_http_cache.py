@@ -0,0 +1,82 @@
+import asyncio
+import time
+from trust_wedo.parsers.http_cache import HttpCache
+
+
+def test_store_and_get_round_trip(tmp_path):
+    cache = HttpCache(tmp_path / "cache.sqlite")
+    page = {"url": "https://example.com/", "has_jsonld": True}
+
+    assert cache.store("https://example.com/", etag='"abc"', page=page)
+    entry = cache.get("https://example.com/")
+    assert entry["etag"] == '"abc"'
+    assert entry["page"] == page
+    assert HttpCache.conditional_headers(entry) == {"If-None-Match": '"abc"'}
+    cache.close()
+
+    # Persisted across instances
+    reopened = HttpCache(tmp_path / "cache.sqlite")
+    assert reopened.get("https://example.com/")["page"] == page
+    reopened.close()
+
+
+def test_store_requires_validators():
+    cache = HttpCache(":memory:")
+    assert cache.store("https://example.com/", body=b"data") is False
+    assert cache.get("https://example.com/") is None
+
+
+def test_validators_are_case_insensitive():
+    headers = {"ETag": '"v1"', "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}
+    assert HttpCache.validators(headers) == {
+        "etag": '"v1"',
+        "last_modified": "Wed, 21 Oct 2015 07:28:00 GMT"
+    }
+    assert HttpCache.conditional_headers(None) == {}
+
+
+def test_pages_are_only_reused_under_the_same_fetch_mode():
+    cache = HttpCache(":memory:")
+    cache.store("https://example.com/", etag='"v1"', page={"url": "https://example.com/"}, fetch_mode="static")
+
+    assert cache.get("https://example.com/")["fetch_mode"] == "static"
+
+
+def test_prune_drops_old_entries_and_caps_size(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    cache = HttpCache(path)
+    now = time.time()
+    for i in range(5):
+        cache.store(f"https://example.com/{i}", etag=f'"{i}"')
+        # Entry 0 is an hour old, the others one second apart
+        cache._conn.execute("UPDATE http_cache SET stored_at = ? WHERE url = ?", (now - (3600 if i == 0 else 5 - i), f"https://example.com/{i}"))
+    cache._conn.commit()
+
+    assert cache.prune(max_age=60) == 1
+    assert cache.prune(max_entries=2) == 2
+    assert cache.get("https://example.com/4") is not None
+    assert cache.get("https://example.com/1") is None
+    cache.close()
+
+    # Opening with limits prunes too
+    reopened = HttpCache(path, max_entries=1)
+    assert reopened._conn.execute("SELECT COUNT(*) FROM http_cache").fetchone()[0] == 1
+    reopened.close()
+
+
+
+def test_locked_database_is_a_logged_miss(tmp_path, capsys):
+    path = tmp_path / "cache.sqlite"
+    holder = HttpCache(path)
+    cache = HttpCache(path, timeout=0.1)
+    # Another scan holds the write lock
+    holder._conn.execute("BEGIN EXCLUSIVE")
+
+    assert asyncio.run(cache.astore("https://example.com/", etag='"v1"', body=b"x")) is False
+    assert asyncio.run(cache.aget("https://example.com/")) is None
+    assert "HTTP cache write failed" in capsys.readouterr().out
+
+    holder._conn.rollback()
+    assert asyncio.run(cache.astore("https://example.com/", etag='"v1"', body=b"x")) is True
+    holder.close()
+    cache.close()
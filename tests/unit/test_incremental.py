@@ -0,0 +1,124 @@
+import asyncio
+
+import httpx
+
+from trust_wedo.parsers.incremental import diff_scans, unchanged_since
+from trust_wedo.parsers.site_parser import SiteParser
+
+BASE = "https://example.com"
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def html(title, schema=False):
+    jsonld = '<script type="application/ld+json">{"@type": "Organization"}</script>' if schema else ""
+    return f"<html><head><title>{title}</title>{jsonld}</head><body></body></html>".encode("utf-8")
+
+
+def make_site(lastmod_pricing="2026-01-01", lastmod_blog="2026-02-01", etag_blog='"v1"', home=None):
+    sitemap = (
+        f'<?xml version="1.0"?><urlset {NS}>'
+        f"<url><loc>{BASE}/pricing</loc><lastmod>{lastmod_pricing}</lastmod></url>"
+        f"<url><loc>{BASE}/blog/post</loc><lastmod>{lastmod_blog}</lastmod></url>"
+        "</urlset>"
+    ).encode("utf-8")
+    return {
+        f"{BASE}/sitemap.xml": (sitemap, {}),
+        BASE: (home or html("Home"), {}),
+        f"{BASE}/pricing": (html("Pricing"), {}),
+        f"{BASE}/blog/post": (html("Post"), {"ETag": etag_blog}),
+    }
+
+
+def scan(site, previous=None):
+    requests = []
+
+    def handler(request):
+        url = str(request.url).rstrip("/")
+        requests.append(url)
+        if url not in site:
+            return httpx.Response(404)
+        body, headers = site[url]
+        if headers.get("ETag") and request.headers.get("if-none-match") == headers["ETag"]:
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, content=body, headers=headers)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            parser = SiteParser(BASE, use_playwright=False, client=client, previous=previous)
+            return await parser.scan()
+
+    return asyncio.run(run()), requests
+
+
+def test_unchanged_pages_are_reused_without_parsing():
+    first, _ = scan(make_site())
+    # Blog post: newer lastmod but the server says 304
+    second, requests = scan(make_site(lastmod_blog="2026-02-10"), previous=first)
+
+    pages = {page["url"]: page for page in second["pages"]}
+    assert pages[f"{BASE}/pricing"]["reuse_reason"] == "lastmod"
+    assert pages[f"{BASE}/blog/post"]["reuse_reason"] == "not_modified"
+    assert pages[BASE]["reuse_reason"] == "content_hash"
+    # Unchanged lastmod: not even a conditional request
+    assert f"{BASE}/pricing" not in requests
+    assert second["incremental"]["reused_pages"] == 3
+    assert second["fetch_stats"]["reused_pages"] == 3
+    assert second["incremental"]["diff"]["changed_pages"] == []
+
+
+def test_changed_pages_are_refetched_and_diffed():
+    first, _ = scan(make_site())
+    site = make_site(lastmod_pricing="2026-03-01", lastmod_blog="2026-03-01", home=html("Home", schema=True))
+    site[f"{BASE}/blog/post"] = (html("Post, edited"), {"ETag": '"v2"'})
+    second, _ = scan(site, previous=first)
+
+    pages = {page["url"]: page for page in second["pages"]}
+    assert not pages[BASE].get("from_previous")
+    assert not pages[f"{BASE}/blog/post"].get("from_previous")
+    # New lastmod, same body: caught by the content hash
+    assert pages[f"{BASE}/pricing"]["reuse_reason"] == "content_hash"
+    changed = {entry["url"]: entry["changes"] for entry in second["incremental"]["diff"]["changed_pages"]}
+    assert changed[BASE]["has_jsonld"] == [False, True]
+    assert second["incremental"]["refetched_pages"] == 2
+
+
+def test_diff_reports_added_and_removed_pages():
+    previous = {"pages": [{"url": f"{BASE}/old", "fetched": True}], "checks": {"robots_ok": True, "sitemap_ok": True}}
+    current = {"pages": [{"url": f"{BASE}/new", "fetched": True}], "checks": {"robots_ok": True, "sitemap_ok": False}}
+
+    diff = diff_scans(previous, current)
+
+    assert diff["added_pages"] == [f"{BASE}/new"]
+    assert diff["removed_pages"] == [f"{BASE}/old"]
+    assert diff["checks"] == {"sitemap_ok": [True, False]}
+
+
+def test_unchanged_since():
+    assert unchanged_since("2026-02-01", "2026-01-15T00:00:00Z")
+    assert not unchanged_since("2026-02-01", "2026-02-02")
+    assert not unchanged_since(None, "2026-02-02")
+
+
+def test_crawl_follows_links_of_reused_pages():
+    def page(title, *links):
+        anchors = "".join(f'<a href="{link}">{link}</a>' for link in links)
+        return f"<html><head><title>{title}</title></head><body>{anchors}</body></html>".encode("utf-8")
+
+    # No sitemap: pages are found by crawling from the homepage
+    site = {
+        BASE: (page("Home", "/blog"), {"ETag": '"home"'}),
+        f"{BASE}/blog": (page("Blog"), {"ETag": '"blog-1"'}),
+    }
+    first, _ = scan(site)
+    assert first["pages"][0]["internal_links"] == [f"{BASE}/blog"]
+
+    # Homepage unchanged (304); the blog now links to a new post
+    site[f"{BASE}/blog"] = (page("Blog", "/blog/new-post"), {"ETag": '"blog-2"'})
+    site[f"{BASE}/blog/new-post"] = (page("New post"), {})
+    second, _ = scan(site, previous=first)
+
+    pages = {page["url"]: page for page in second["pages"]}
+    assert pages[BASE]["reuse_reason"] == "not_modified"
+    assert pages[f"{BASE}/blog"]["depth"] == 1
+    assert f"{BASE}/blog/new-post" in pages
+    assert second["incremental"]["diff"]["added_pages"] == [f"{BASE}/blog/new-post"]
@@ -0,0 +1,68 @@
+from trust_wedo.parsers.page_analyzer import analyze_html
+
+
+PAGE = """<html><head>
+<title> Acme Docs </title>
+<meta name="viewport" content="width=device-width">
+<meta property="og:description" content="Open graph description">
+<link rel="shortcut icon" href="/favicon.ico">
+<script type="application/ld+json">{"@graph": [{"@type": "Organization"}, {"@type": ["WebSite", "Thing"]}]}</script>
+<script type="application/ld+json">not json</script>
+</head><body>
+<a href="/local">Local</a>
+<a href="https://www.example.com/same">Same site</a>
+<a href="https://github.com/acme">GitHub</a>
+<a href="https://twitter.com/acme">Twitter</a>
+<a href="https://partner.org/">Partner</a>
+</body></html>"""
+
+
+def test_analyze_html_extracts_signals_in_one_pass():
+    signals = analyze_html(PAGE, "https://example.com/about-us", "https://example.com")
+
+    assert signals["has_title"] is True
+    assert signals["has_meta"] is True
+    assert signals["has_viewport"] is True
+    assert signals["has_favicon"] is True
+    assert signals["has_jsonld"] is True
+    assert sorted(signals["schema_types"]) == ["Organization", "Thing", "WebSite"]
+    assert len(signals["schemas"]) == 2
+    assert signals["is_about_author"] is True
+    assert signals["external_links_count"] == 3
+    assert signals["social_links_count"] == 2
+    assert signals["social_platforms"] == ["GitHub", "Twitter"]
+
+
+def test_empty_description_meta_wins_over_og_description():
+    html = b"""<html><head><meta name="description" content="  ">
+<meta property="og:description" content="fallback"></head><body></body></html>"""
+    signals = analyze_html(html, "https://example.com/", "https://example.com")
+
+    assert signals["has_meta"] is False
+    assert signals["title_missing"] is True
+
+
+def test_empty_document_returns_defaults():
+    signals = analyze_html(b"", "https://example.com/", "https://example.com")
+
+    assert signals["has_jsonld"] is False
+    assert signals["schemas"] == []
+    assert signals["external_links_count"] == 0
+
+
+def test_internal_links_are_resolved_and_normalised():
+    signals = analyze_html(PAGE, "https://example.com/about-us", "https://example.com")
+
+    assert signals["internal_links"] == ["https://example.com/local", "https://www.example.com/same"]
+
+
+def test_malformed_hrefs_are_skipped():
+    html = """<html><body>
+<a href="https://example.com:abc/x">Bad port</a>
+<a href="http://example.com:99999/">Port out of range</a>
+<a href="http://[::1/x">Unclosed IPv6</a>
+<a href="/ok">OK</a>
+</body></html>"""
+    signals = analyze_html(html, "https://example.com/", "https://example.com")
+
+    assert signals["internal_links"] == ["https://example.com/ok"]
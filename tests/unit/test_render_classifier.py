@@ -0,0 +1,21 @@
+import pytest
+from trust_wedo.parsers.render_classifier import needs_rendering
+
+
+BODY_TEXT = "<p>" + "Real server-rendered content for readers. " * 10 + "</p>"
+JSONLD = '<script type="application/ld+json">{"@type": "WebSite"}</script>'
+
+
+@pytest.mark.parametrize("html, expected", [
+    (None, (True, "empty_document")),
+    ("<html><body><div id=\"app\"></div></body></html>", (True, "spa_root")),
+    ("<html><body><div id='__next'>  </div></body></html>", (True, "spa_root")),
+    (f"<html><body><noscript>Please enable JavaScript to continue.</noscript>{BODY_TEXT}</body></html>",
+     (True, "noscript_required")),
+    ("<html><body><p>Loading...</p><script>var x = '" + "y" * 500 + "';</script></body></html>",
+     (True, "empty_body")),
+    (f"<html><body>{BODY_TEXT}</body></html>", (True, "missing_jsonld")),
+    (f"<html><head>{JSONLD}</head><body>{BODY_TEXT}</body></html>", (False, "static_complete")),
+])
+def test_needs_rendering(html, expected):
+    assert needs_rendering(html) == expected
@@ -0,0 +1,236 @@
+import asyncio
+import pytest
+from trust_wedo.parsers.site_parser import SiteParser
+
+
+def test_scan_urls_concurrent_keeps_order_and_monotonic_progress():
+    progress = []
+
+    async def on_progress(percent, message):
+        progress.append(percent)
+
+    parser = SiteParser("https://example.com", concurrency=3, use_playwright=False, progress_callback=on_progress)
+    urls = [f"https://example.com/p{i}" for i in range(6)]
+    delays = [0.05, 0.01, 0.03, 0.0, 0.02, 0.01]
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_scan_page(client, url, playwright_parser=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(delays[urls.index(url)])
+        in_flight -= 1
+        return {"url": url, "fetched": True}
+
+    parser._scan_page = fake_scan_page
+    asyncio.run(parser._scan_urls(None, urls))
+
+    assert [p["url"] for p in parser.pages] == urls
+    assert max_in_flight == 3
+    assert progress == sorted(progress)
+    assert progress[-1] == 90
+
+
+def test_progress_callback_receives_page_url_when_accepted():
+    events = []
+
+    async def on_progress(percent, message, page_url=None):
+        events.append((percent, page_url))
+
+    parser = SiteParser("https://example.com", concurrency=1, use_playwright=False, progress_callback=on_progress)
+    urls = ["https://example.com/a", "https://example.com/b"]
+
+    async def fake_scan_page(client, url, playwright_parser=None):
+        return {"url": url, "fetched": True}
+
+    parser._scan_page = fake_scan_page
+    asyncio.run(parser._scan_urls(None, urls))
+
+    assert events == [(50, "https://example.com/a"), (90, "https://example.com/b")]
+
+
+def test_scan_urls_skips_failed_pages():
+    parser = SiteParser("https://example.com", concurrency=2, use_playwright=False)
+    urls = ["https://example.com/ok", "https://example.com/boom"]
+
+    async def fake_scan_page(client, url, playwright_parser=None):
+        if url.endswith("boom"):
+            raise RuntimeError("boom")
+        return {"url": url, "fetched": True}
+
+    parser._scan_page = fake_scan_page
+    asyncio.run(parser._scan_urls(None, urls))
+
+    assert [p["url"] for p in parser.pages] == ["https://example.com/ok"]
+
+
+class FakePlaywrightParser:
+    def __init__(self, html, hydration_wait_ms=120):
+        self.html = html
+        self.hydration_wait_ms = hydration_wait_ms
+
+    async def fetch_page(self, url, timeout=45000):
+        return {"content": self.html, "status": 200, "hydration_wait_ms": self.hydration_wait_ms}
+
+
+def test_scan_page_records_hydration_wait():
+    html = "<html><head><title>Hi</title></head><body></body></html>"
+    parser = SiteParser("https://example.com", use_playwright=False)
+    page = asyncio.run(parser._scan_page(None, "https://example.com/", FakePlaywrightParser(html)))
+
+    assert page["fetched"] is True
+    assert page["title_missing"] is False
+    assert page["hydration_wait_ms"] == 120
+
+
+class FakeResponse:
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+        self.headers = {}
+
+
+class FakeClient:
+    def __init__(self, html):
+        self.html = html
+
+    async def get(self, url, **kwargs):
+        return FakeResponse(self.html.encode("utf-8"))
+
+
+STATIC_COMPLETE_HTML = """<html><head><title>Static</title>
+<meta name="description" content="A static page">
+<script type="application/ld+json">{"@type": "Organization", "name": "Acme"}</script>
+</head><body><p>""" + "Plenty of server rendered text. " * 20 + """</p></body></html>"""
+
+SPA_HTML = """<html><head><title>App</title></head><body><div id="root"></div>
+<script src="/bundle.js"></script></body></html>"""
+
+
+def test_hybrid_mode_keeps_complete_static_pages():
+    parser = SiteParser("https://example.com", fetch_mode="hybrid", browser=object())
+    renderer = FakePlaywrightParser("<html></html>")
+    page = asyncio.run(parser._scan_page(FakeClient(STATIC_COMPLETE_HTML), "https://example.com/", renderer))
+
+    assert page["fetch_path"] == "static"
+    assert page["render_reason"] == "static_complete"
+    assert page["schema_types"] == ["Organization"]
+    assert page["hydration_wait_ms"] is None
+
+
+def test_hybrid_mode_escalates_spa_pages():
+    rendered = SPA_HTML.replace(
+        '<div id="root"></div>',
+        '<div id="root"><script type="application/ld+json">{"@type": "WebSite"}</script></div>'
+    )
+    parser = SiteParser("https://example.com", fetch_mode="hybrid", browser=object())
+    page = asyncio.run(parser._scan_page(FakeClient(SPA_HTML), "https://example.com/", FakePlaywrightParser(rendered)))
+
+    assert page["fetch_path"] == "playwright"
+    assert page["render_reason"] == "spa_root"
+    assert page["schema_types"] == ["WebSite"]
+
+    parser.pages = [page]
+    stats = parser._fetch_stats()
+    assert stats["rendered_pages"] == 1
+    assert stats["static_pages"] == 0
+
+
+def test_unknown_fetch_mode_rejected():
+    with pytest.raises(ValueError):
+        SiteParser("https://example.com", fetch_mode="turbo")
+
+
+class ConditionalClient:
+    """Serves one page with an ETag and answers 304 when revalidated."""
+
+    def __init__(self, html):
+        self.html = html
+        self.requests = []
+
+    async def get(self, url, headers=None, **kwargs):
+        self.requests.append(headers or {})
+        if headers and headers.get("If-None-Match") == '"v1"':
+            response = FakeResponse(b"", status_code=304)
+        else:
+            response = FakeResponse(self.html.encode("utf-8"))
+        response.headers = {"ETag": '"v1"'}
+        return response
+
+
+def test_cached_page_reused_when_not_modified():
+    from trust_wedo.parsers.http_cache import HttpCache
+
+    cache = HttpCache(":memory:")
+    client = ConditionalClient(STATIC_COMPLETE_HTML)
+
+    first = SiteParser("https://example.com", use_playwright=False, cache=cache)
+    page = asyncio.run(first._scan_page(client, "https://example.com/"))
+    assert page["from_cache"] is False
+
+    second = SiteParser("https://example.com", use_playwright=False, cache=cache)
+    cached = asyncio.run(second._scan_page(client, "https://example.com/"))
+    assert cached["from_cache"] is True
+    assert cached["schema_types"] == page["schema_types"]
+    assert client.requests[-1] == {"If-None-Match": '"v1"'}
+
+    # A page extracted under another fetch mode is not reused
+    hybrid = SiteParser("https://example.com", use_playwright=False, fetch_mode="hybrid", cache=cache)
+    assert asyncio.run(hybrid._scan_page(client, "https://example.com/"))["from_cache"] is False
+
+
+def test_cache_write_failure_keeps_the_page():
+    import sqlite3
+    from trust_wedo.parsers.http_cache import HttpCache
+
+    cache = HttpCache(":memory:")
+
+    def locked(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    cache.store = locked
+    parser = SiteParser("https://example.com", use_playwright=False, cache=cache)
+    page = asyncio.run(parser._scan_page(ConditionalClient(STATIC_COMPLETE_HTML), "https://example.com/"))
+
+    assert page["fetched"] is True
+
+
+def test_crawl_follows_links_without_refetching_and_prefers_identity_pages():
+    links = {
+        "https://example.com": ["https://example.com/blog", "https://example.com/contact", "https://example.com/blog/"],
+        "https://example.com/blog": ["https://example.com", "https://example.com/blog/post?utm_source=x"],
+        "https://example.com/contact": ["https://example.com/blog#top"],
+        "https://example.com/blog/post": ["https://example.com/deep"],
+    }
+    parser = SiteParser("https://example.com", max_pages=10, concurrency=2, use_playwright=False, crawl_depth=2)
+    fetched = []
+
+    async def fake_scan_page(client, url, playwright_parser=None):
+        fetched.append(url)
+        parser.page_links[url] = links.get(url, [])
+        return {"url": url, "fetched": True}
+
+    parser._scan_page = fake_scan_page
+    asyncio.run(parser._crawl(None))
+
+    assert fetched[0] == "https://example.com"
+    assert fetched[1] == "https://example.com/contact"
+    assert sorted(fetched) == sorted(set(fetched))
+    assert "https://example.com/blog/post?utm_source=x" in fetched
+    # depth limit: /deep sits at depth 3
+    assert "https://example.com/deep" not in fetched
+    assert len(parser.pages) == 4
+
+
+def test_crawl_respects_max_pages():
+    parser = SiteParser("https://example.com", max_pages=3, use_playwright=False)
+
+    async def fake_scan_page(client, url, playwright_parser=None):
+        parser.page_links[url] = [f"https://example.com/p{i}" for i in range(10)]
+        return {"url": url, "fetched": True}
+
+    parser._scan_page = fake_scan_page
+    asyncio.run(parser._crawl(None))
+
+    assert len(parser.pages) == 3
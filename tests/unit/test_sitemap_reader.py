@@ -0,0 +1,74 @@
+import asyncio
+import gzip
+from contextlib import asynccontextmanager
+
+from trust_wedo.parsers.sitemap_reader import SitemapReader, parse_sitemap_directives
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def urlset(*entries):
+    body = "".join(
+        f"<url><loc>{loc}</loc>" + (f"<lastmod>{lastmod}</lastmod>" if lastmod else "") + "</url>"
+        for loc, lastmod in entries
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset {NS}>{body}</urlset>'.encode("utf-8")
+
+
+class FakeStreamResponse:
+    def __init__(self, body, status_code=200, chunk_size=64):
+        self.body = body
+        self.status_code = status_code
+        self.headers = {}
+        self.chunk_size = chunk_size
+        self.chunks_sent = 0
+
+    async def aiter_bytes(self):
+        for i in range(0, len(self.body), self.chunk_size):
+            self.chunks_sent += 1
+            yield self.body[i:i + self.chunk_size]
+
+
+class FakeStreamClient:
+    def __init__(self, documents):
+        self.documents = documents
+        self.responses = {}
+
+    @asynccontextmanager
+    async def stream(self, method, url, headers=None):
+        body = self.documents.get(url)
+        response = FakeStreamResponse(body or b"", 200 if body is not None else 404)
+        self.responses[url] = response
+        yield response
+
+
+def test_parse_sitemap_directives():
+    robots = "User-agent: *\nDisallow: /private\nSitemap: https://example.com/a.xml\nsitemap: https://example.com/b.xml.gz # news\n"
+    assert parse_sitemap_directives(robots) == ["https://example.com/a.xml", "https://example.com/b.xml.gz"]
+
+
+def test_follows_gzip_sitemap_index_newest_child_first():
+    index = f"""<sitemapindex {NS}>
+<sitemap><loc>https://example.com/old.xml</loc><lastmod>2020-01-01</lastmod></sitemap>
+<sitemap><loc>https://example.com/new.xml.gz</loc><lastmod>2024-06-01T00:00:00Z</lastmod></sitemap>
+</sitemapindex>""".encode("utf-8")
+    client = FakeStreamClient({
+        "https://example.com/sitemap_index.xml": index,
+        "https://example.com/new.xml.gz": gzip.compress(urlset(("https://example.com/fresh", "2024-06-01"))),
+        "https://example.com/old.xml": urlset(("https://example.com/stale", "2019-01-01")),
+    })
+    entries = asyncio.run(SitemapReader(client).read(["https://example.com/sitemap_index.xml"]))
+
+    assert [e["loc"] for e in entries] == ["https://example.com/fresh", "https://example.com/stale"]
+    assert entries[0]["lastmod"] == "2024-06-01"
+
+
+def test_stops_streaming_once_enough_urls_collected():
+    big = urlset(*((f"https://example.com/p{i}", None) for i in range(5000)))
+    client = FakeStreamClient({"https://example.com/sitemap.xml": big})
+    reader = SitemapReader(client, max_urls=10, prioritize=False)
+    entries = asyncio.run(reader.read(["https://example.com/sitemap.xml"]))
+
+    assert [e["loc"] for e in entries] == [f"https://example.com/p{i}" for i in range(10)]
+    response = client.responses["https://example.com/sitemap.xml"]
+    assert response.chunks_sent < len(big) // response.chunk_size
@@ -0,0 +1,34 @@
+from trust_wedo.parsers.url_sampler import path_template, sample_urls
+
+
+def test_path_template_clusters_similar_pages():
+    assert path_template("https://example.com/") == "/"
+    assert path_template("https://example.com/pricing") == "/pricing"
+    assert path_template("https://example.com/products/blue-shirt") == "/products/*"
+    assert path_template("https://example.com/blog/2024/05/hello") == "/blog/{n}/{n}/*"
+    assert path_template("https://example.com/item/12345") == "/item/{n}"
+
+
+def test_sample_prefers_homepage_identity_and_diverse_templates():
+    base = "https://example.com"
+    urls = [f"{base}/products/item-{i}" for i in range(10)] + [
+        f"{base}/blog/first-post",
+        f"{base}/blog/second-post",
+        f"{base}/team/jane",
+        f"{base}/contact",
+        f"{base}/pricing",
+    ]
+    sampled = sample_urls(urls, base, 6)
+
+    assert sampled[0] == base
+    assert f"{base}/contact" in sampled
+    assert f"{base}/team/jane" in sampled
+    assert sum(1 for u in sampled if "/products/" in u) == 1
+    assert f"{base}/pricing" in sampled
+    assert len(sampled) == 6
+
+
+def test_sample_uses_sitemap_homepage_variant_and_respects_budget():
+    urls = ["https://www.example.com/", "https://www.example.com/a", "https://www.example.com/b"]
+    assert sample_urls(urls, "https://example.com", 2) == ["https://www.example.com/", "https://www.example.com/a"]
+    assert sample_urls(urls, "https://example.com", 0) == []
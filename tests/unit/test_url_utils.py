@@ -0,0 +1,16 @@
+from trust_wedo.utils.url import is_crawlable, normalize_url, same_site
+
+
+def test_normalize_url_dedupes_common_variants():
+    expected = "https://example.com/blog?a=1&b=2"
+    assert normalize_url("HTTPS://Example.com:443/blog/?b=2&utm_source=news&a=1#comments") == expected
+    assert normalize_url("https://example.com/blog?a=1&fbclid=xyz&b=2") == expected
+    assert normalize_url("https://example.com/") == "https://example.com"
+
+
+def test_same_site_and_crawlable():
+    assert same_site("https://www.example.com/a", "https://example.com")
+    assert not same_site("https://blog.example.com/a", "https://example.com")
+    assert is_crawlable("https://example.com/about")
+    assert not is_crawlable("https://example.com/brochure.pdf")
+    assert not is_crawlable("mailto:hi@example.com")